@@ -3,6 +3,8 @@ from fastapi.responses import StreamingResponse
 import asyncio
 import json
 
+from src.data.cache import get_cache
+
 router = APIRouter()
 
 
@@ -25,3 +27,9 @@ async def ping():
             await asyncio.sleep(1)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+@router.get("/metrics/cache")
+async def cache_metrics():
+    """Per-namespace hits, misses, resident bytes, evictions and upstream latency of the data cache."""
+    return get_cache().get_stats()
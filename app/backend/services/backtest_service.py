@@ -5,15 +5,12 @@ import numpy as np
 from typing import Callable, Dict, List, Optional, Any
 import asyncio
 
-from src.tools.api import (
-    get_company_news,
-    get_price_data,
-    get_prices,
-    get_financial_metrics,
-    get_insider_trades,
-)
+from src.data.signal_store import get_signal_store, model_key
+from src.eval.metrics import StreamingMetrics
+from src.portfolio import PortfolioLedger
+from src.tools.price_panel import PricePanel
+from src.tools.async_api import prefetch_async
 from app.backend.services.graph import run_graph_async, parse_hedge_fund_response
-from app.backend.services.portfolio import create_portfolio
 
 class BacktestService:
     """
@@ -47,7 +44,7 @@ class BacktestService:
         :param request: Request object containing API keys and other metadata.
         """
         self.graph = graph
-        self.portfolio = portfolio
+        self.ledger = PortfolioLedger.from_portfolio(portfolio, tickers)
         self.tickers = tickers
         self.start_date = start_date
         self.end_date = end_date
@@ -56,228 +53,26 @@ class BacktestService:
         self.model_provider = model_provider
         self.request = request
         self.portfolio_values = []
+        self.metrics = StreamingMetrics()
 
-    def execute_trade(self, ticker: str, action: str, quantity: float, current_price: float) -> int:
-        """
-        Execute trades with support for both long and short positions.
-        Returns the actual quantity traded.
-        """
-        if quantity <= 0:
-            return 0
-
-        quantity = int(quantity)  # force integer shares
-        position = self.portfolio["positions"][ticker]
-
-        if action == "buy":
-            cost = quantity * current_price
-            if cost <= self.portfolio["cash"]:
-                # Weighted average cost basis for the new total
-                old_shares = position["long"]
-                old_cost_basis = position["long_cost_basis"]
-                new_shares = quantity
-                total_shares = old_shares + new_shares
-
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_shares
-                    total_new_cost = cost
-                    position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                position["long"] += quantity
-                self.portfolio["cash"] -= cost
-                return quantity
-            else:
-                # Calculate maximum affordable quantity
-                max_quantity = int(self.portfolio["cash"] / current_price)
-                if max_quantity > 0:
-                    cost = max_quantity * current_price
-                    old_shares = position["long"]
-                    old_cost_basis = position["long_cost_basis"]
-                    total_shares = old_shares + max_quantity
-
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_shares
-                        total_new_cost = cost
-                        position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                    position["long"] += max_quantity
-                    self.portfolio["cash"] -= cost
-                    return max_quantity
-                return 0
-
-        elif action == "sell":
-            quantity = min(quantity, position["long"])
-            if quantity > 0:
-                avg_cost_per_share = position["long_cost_basis"] if position["long"] > 0 else 0
-                realized_gain = (current_price - avg_cost_per_share) * quantity
-                self.portfolio["realized_gains"][ticker]["long"] += realized_gain
-
-                position["long"] -= quantity
-                self.portfolio["cash"] += quantity * current_price
-
-                if position["long"] == 0:
-                    position["long_cost_basis"] = 0.0
-
-                return quantity
-
-        elif action == "short":
-            proceeds = current_price * quantity
-            margin_required = proceeds * self.portfolio["margin_requirement"]
-            if margin_required <= self.portfolio["cash"]:
-                # Weighted average short cost basis
-                old_short_shares = position["short"]
-                old_cost_basis = position["short_cost_basis"]
-                new_shares = quantity
-                total_shares = old_short_shares + new_shares
-
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_short_shares
-                    total_new_cost = current_price * new_shares
-                    position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                position["short"] += quantity
-                position["short_margin_used"] += margin_required
-                self.portfolio["margin_used"] += margin_required
-
-                self.portfolio["cash"] += proceeds
-                self.portfolio["cash"] -= margin_required
-                return quantity
-            else:
-                margin_ratio = self.portfolio["margin_requirement"]
-                if margin_ratio > 0:
-                    max_quantity = int(self.portfolio["cash"] / (current_price * margin_ratio))
-                else:
-                    max_quantity = 0
-
-                if max_quantity > 0:
-                    proceeds = current_price * max_quantity
-                    margin_required = proceeds * margin_ratio
-
-                    old_short_shares = position["short"]
-                    old_cost_basis = position["short_cost_basis"]
-                    total_shares = old_short_shares + max_quantity
-
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_short_shares
-                        total_new_cost = current_price * max_quantity
-                        position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                    position["short"] += max_quantity
-                    position["short_margin_used"] += margin_required
-                    self.portfolio["margin_used"] += margin_required
-
-                    self.portfolio["cash"] += proceeds
-                    self.portfolio["cash"] -= margin_required
-                    return max_quantity
-                return 0
-
-        elif action == "cover":
-            quantity = min(quantity, position["short"])
-            if quantity > 0:
-                cover_cost = quantity * current_price
-                avg_short_price = position["short_cost_basis"] if position["short"] > 0 else 0
-                realized_gain = (avg_short_price - current_price) * quantity
-
-                if position["short"] > 0:
-                    portion = quantity / position["short"]
-                else:
-                    portion = 1.0
-
-                margin_to_release = portion * position["short_margin_used"]
-
-                position["short"] -= quantity
-                position["short_margin_used"] -= margin_to_release
-                self.portfolio["margin_used"] -= margin_to_release
-
-                self.portfolio["cash"] += margin_to_release
-                self.portfolio["cash"] -= cover_cost
-
-                self.portfolio["realized_gains"][ticker]["short"] += realized_gain
-
-                if position["short"] == 0:
-                    position["short_cost_basis"] = 0.0
-                    position["short_margin_used"] = 0.0
-
-                return quantity
-
-        return 0
-
-    def calculate_portfolio_value(self, current_prices: Dict[str, float]) -> float:
-        """Calculate total portfolio value."""
-        total_value = self.portfolio["cash"]
-
-        for ticker in self.tickers:
-            position = self.portfolio["positions"][ticker]
-            price = current_prices[ticker]
-
-            # Long position value
-            long_value = position["long"] * price
-            total_value += long_value
-
-            # Short position unrealized PnL
-            if position["short"] > 0:
-                total_value -= position["short"] * price
-
-        return total_value
-
-    def prefetch_data(self):
-        """Pre-fetch all data needed for the backtest period."""
+    async def prefetch_data(self):
+        """Pre-fetch all data needed for the backtest period, all tickers concurrently."""
         end_date_dt = datetime.strptime(self.end_date, "%Y-%m-%d")
         start_date_dt = end_date_dt - relativedelta(years=1)
         start_date_str = start_date_dt.strftime("%Y-%m-%d")
         api_key = self.request.api_keys.get("FINANCIAL_DATASETS_API_KEY")
 
-        for ticker in self.tickers:
-            get_prices(ticker, start_date_str, self.end_date, api_key=api_key)
-            get_financial_metrics(ticker, self.end_date, limit=10, api_key=api_key)
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000, api_key=api_key)
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000, api_key=api_key)
+        errors = await prefetch_async(self.tickers, start_date_str, self.end_date, start_date=self.start_date, api_key=api_key)
+        for ticker, error in errors.items():
+            print(f"Warning: pre-fetch failed for {ticker}: {error}")
 
     def _update_performance_metrics(self, performance_metrics: Dict[str, Any]):
-        """Update performance metrics using daily returns."""
-        values_df = pd.DataFrame(self.portfolio_values).set_index("Date")
-        values_df["Daily Return"] = values_df["Portfolio Value"].pct_change()
-        clean_returns = values_df["Daily Return"].dropna()
-
-        if len(clean_returns) < 2:
-            return
-
-        daily_risk_free_rate = 0.0434 / 252
-        excess_returns = clean_returns - daily_risk_free_rate
-        mean_excess_return = excess_returns.mean()
-        std_excess_return = excess_returns.std()
-
-        # Sharpe ratio
-        if std_excess_return > 1e-12:
-            performance_metrics["sharpe_ratio"] = np.sqrt(252) * (mean_excess_return / std_excess_return)
-        else:
-            performance_metrics["sharpe_ratio"] = 0.0
-
-        # Sortino ratio
-        negative_returns = excess_returns[excess_returns < 0]
-        if len(negative_returns) > 0:
-            downside_std = negative_returns.std()
-            if downside_std > 1e-12:
-                performance_metrics["sortino_ratio"] = np.sqrt(252) * (mean_excess_return / downside_std)
-            else:
-                performance_metrics["sortino_ratio"] = None if mean_excess_return > 0 else 0
-        else:
-            performance_metrics["sortino_ratio"] = None if mean_excess_return > 0 else 0
-
-        # Maximum drawdown
-        rolling_max = values_df["Portfolio Value"].cummax()
-        drawdown = (values_df["Portfolio Value"] - rolling_max) / rolling_max
-
-        if len(drawdown) > 0:
-            min_drawdown = drawdown.min()
-            performance_metrics["max_drawdown"] = min_drawdown * 100
-
-            if min_drawdown < 0:
-                performance_metrics["max_drawdown_date"] = drawdown.idxmin().strftime("%Y-%m-%d")
-            else:
-                performance_metrics["max_drawdown_date"] = None
-        else:
-            performance_metrics["max_drawdown"] = 0.0
-            performance_metrics["max_drawdown_date"] = None
+        """Update performance metrics from the running daily-return statistics."""
+        metrics = self.metrics.snapshot()
+        # The API reports an unbounded Sortino ratio (no downside days yet) as null
+        if metrics.get("sortino_ratio") == float("inf"):
+            metrics["sortino_ratio"] = None
+        performance_metrics.update(metrics)
 
     async def run_backtest_async(self, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """
@@ -285,7 +80,7 @@ class BacktestService:
         Uses the pre-compiled graph for trading decisions.
         """
         # Pre-fetch all data at the start
-        self.prefetch_data()
+        await self.prefetch_data()
 
         dates = pd.date_range(self.start_date, self.end_date, freq="B")
         performance_metrics = {
@@ -298,12 +93,20 @@ class BacktestService:
         }
 
         # Initialize portfolio values
+        self.metrics = StreamingMetrics()
         if len(dates) > 0:
             self.portfolio_values = [{"Date": dates[0], "Portfolio Value": self.initial_capital}]
+            self.metrics.update(dates[0], self.initial_capital)
         else:
             self.portfolio_values = []
 
         backtest_results = []
+        signal_store = get_signal_store()
+
+        # Closing prices for every day × ticker, read once from the prefetched cache
+        api_key = self.request.api_keys.get("FINANCIAL_DATASETS_API_KEY")
+        loop = asyncio.get_running_loop()
+        price_panel = await loop.run_in_executor(None, lambda: PricePanel.load(self.tickers, dates, api_key=api_key))
 
         for i, current_date in enumerate(dates):
             # Allow other async operations to run
@@ -311,7 +114,6 @@ class BacktestService:
 
             lookback_start = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
             current_date_str = current_date.strftime("%Y-%m-%d")
-            previous_date_str = (current_date - timedelta(days=1)).strftime("%Y-%m-%d")
 
             if lookback_start == current_date_str:
                 continue
@@ -326,38 +128,13 @@ class BacktestService:
                     "current_step": i + 1,
                 })
 
-            # Get current prices
-            try:
-                current_prices = {}
-                missing_data = False
-
-                for ticker in self.tickers:
-                    try:
-                        price_data = get_price_data(ticker, previous_date_str, current_date_str)
-                        if price_data.empty:
-                            missing_data = True
-                            break
-                        current_prices[ticker] = price_data.iloc[-1]["close"]
-                    except Exception as e:
-                        missing_data = True
-                        break
-
-                if missing_data:
-                    continue
-
-            except Exception:
+            # Get current prices from the preloaded panel
+            current_prices = price_panel.prices_on(i)
+            if current_prices is None:
                 continue
 
-            # Create portfolio for this iteration
-            portfolio_for_graph = create_portfolio(
-                initial_cash=self.portfolio["cash"],
-                margin_requirement=self.portfolio["margin_requirement"],
-                tickers=self.tickers,
-                portfolio_positions=[]  # We'll handle positions manually
-            )
-            
-            # Copy current portfolio state to the graph portfolio
-            portfolio_for_graph.update(self.portfolio)
+            # Snapshot the ledger as the portfolio dict the graph expects
+            portfolio_for_graph = self.ledger.to_portfolio()
 
             # Execute graph-based agent decisions
             try:
@@ -385,20 +162,20 @@ class BacktestService:
                 decisions = {}
                 analyst_signals = {}
 
-            # Execute trades based on decisions
-            executed_trades = {}
-            for ticker in self.tickers:
-                decision = decisions.get(ticker, {"action": "hold", "quantity": 0})
-                action, quantity = decision.get("action", "hold"), decision.get("quantity", 0)
-                executed_quantity = self.execute_trade(ticker, action, quantity, current_prices[ticker])
-                executed_trades[ticker] = executed_quantity
+            # Keep the day's analyst outputs so later runs can replay them without the LLMs
+            if signal_store is not None and analyst_signals:
+                signal_store.put(model_key(self.model_name, self.model_provider), current_date_str, analyst_signals)
+
+            # Execute the day's trades as one batch against the ledger
+            prices = price_panel.close[i]
+            executed_trades = self.ledger.execute(decisions, prices)
 
             # Calculate portfolio value
-            total_value = self.calculate_portfolio_value(current_prices)
+            total_value = self.ledger.value(prices)
 
             # Calculate exposures
-            long_exposure = sum(self.portfolio["positions"][t]["long"] * current_prices[t] for t in self.tickers)
-            short_exposure = sum(self.portfolio["positions"][t]["short"] * current_prices[t] for t in self.tickers)
+            long_exposure = self.ledger.long_exposure(prices)
+            short_exposure = self.ledger.short_exposure(prices)
             gross_exposure = long_exposure + short_exposure
             net_exposure = long_exposure - short_exposure
             long_short_ratio = long_exposure / short_exposure if short_exposure > 1e-9 else None
@@ -413,6 +190,7 @@ class BacktestService:
                 "Net Exposure": net_exposure,
                 "Long/Short Ratio": long_short_ratio,
             })
+            self.metrics.update(current_date, total_value)
 
             # Calculate performance metrics for this day
             portfolio_return = (total_value / self.initial_capital - 1) * 100
@@ -425,7 +203,7 @@ class BacktestService:
             date_result = {
                 "date": current_date_str,
                 "portfolio_value": total_value,
-                "cash": self.portfolio["cash"],
+                "cash": self.ledger.cash,
                 "decisions": decisions,
                 "executed_trades": executed_trades,
                 "analyst_signals": analyst_signals,
@@ -442,7 +220,8 @@ class BacktestService:
             }
 
             # Build ticker details (similar to CLI format_backtest_row)
-            for ticker in self.tickers:
+            position_values = self.ledger.position_values(prices)
+            for j, ticker in enumerate(self.tickers):
                 ticker_signals = {}
                 for agent_name, signals in analyst_signals.items():
                     if ticker in signals:
@@ -452,12 +231,6 @@ class BacktestService:
                 bearish_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "bearish"])
                 neutral_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "neutral"])
 
-                # Calculate net position value
-                pos = self.portfolio["positions"][ticker]
-                long_val = pos["long"] * current_prices[ticker]
-                short_val = pos["short"] * current_prices[ticker]
-                net_position_value = long_val - short_val
-
                 # Get the action and quantity from the decisions
                 action = decisions.get(ticker, {}).get("action", "hold")
                 quantity = executed_trades.get(ticker, 0)
@@ -467,10 +240,10 @@ class BacktestService:
                     "action": action,
                     "quantity": quantity,
                     "price": current_prices[ticker],
-                    "shares_owned": pos["long"] - pos["short"],  # net shares
-                    "long_shares": pos["long"],
-                    "short_shares": pos["short"],
-                    "position_value": net_position_value,
+                    "shares_owned": int(self.ledger.long[j] - self.ledger.short[j]),  # net shares
+                    "long_shares": int(self.ledger.long[j]),
+                    "short_shares": int(self.ledger.short[j]),
+                    "position_value": float(position_values[j]),
                     "bullish_count": bullish_count,
                     "bearish_count": bearish_count,
                     "neutral_count": neutral_count,
@@ -505,7 +278,7 @@ class BacktestService:
             "results": backtest_results,
             "performance_metrics": performance_metrics,
             "portfolio_values": self.portfolio_values,
-            "final_portfolio": self.portfolio,
+            "final_portfolio": self.ledger.to_portfolio(),
         }
 
     def run_backtest_sync(self) -> Dict[str, Any]:
@@ -9,6 +9,7 @@ from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.main import start
 from src.utils.analysts import ANALYST_CONFIG
+from src.tools.request_planner import prefetch_line_items, prefetch_market_caps
 from src.graph.state import AgentState
 
 
@@ -153,6 +154,12 @@ def run_graph(
     start date, end date, show reasoning, model name,
     and model provider.
     """
+    # Fetch every analyst's line items in one union request per period before the agents fan out
+    analyst_keys = {extract_base_agent_key(node_id) for node_id in graph.nodes}
+    api_keys = getattr(request, "api_keys", None) or {}
+    prefetch_line_items(tickers, end_date, sorted(analyst_keys), api_key=api_keys.get("FINANCIAL_DATASETS_API_KEY"))
+    prefetch_market_caps(tickers, end_date, api_key=api_keys.get("FINANCIAL_DATASETS_API_KEY"))
+
     return graph.invoke(
         {
             "messages": [
@@ -13,11 +13,28 @@ from src.tools.api import (
     get_market_cap,
     search_line_items,
 )
+from src.data.models import LineItemRequest
 from src.utils.api_key import get_api_key_from_state
 from src.utils.llm import call_llm
 from src.utils.progress import progress
 
 
+LINE_ITEM_REQUEST = LineItemRequest(
+    line_items=[
+        "free_cash_flow",
+        "ebit",
+        "interest_expense",
+        "capital_expenditure",
+        "depreciation_and_amortization",
+        "outstanding_shares",
+        "net_income",
+        "total_debt",
+    ],
+    period="ttm",
+    limit=10,
+)
+
+
 class AswathDamodaranSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float          # 0‒100
@@ -49,17 +66,10 @@ def aswath_damodaran_agent(state: AgentState, agent_id: str = "aswath_damodaran_
         progress.update_status(agent_id, ticker, "Fetching financial line items")
         line_items = search_line_items(
             ticker,
-            [
-                "free_cash_flow",
-                "ebit",
-                "interest_expense",
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "outstanding_shares",
-                "net_income",
-                "total_debt",
-            ],
+            LINE_ITEM_REQUEST.line_items,
             end_date,
+            period=LINE_ITEM_REQUEST.period,
+            limit=LINE_ITEM_REQUEST.limit,
             api_key=api_key,
         )
 
@@ -16,11 +16,28 @@ from src.tools.api import (
     get_market_cap,
     search_line_items,
 )
+from src.data.models import LineItemRequest
 from src.utils.llm import call_llm
 from src.utils.progress import progress
 from src.utils.api_key import get_api_key_from_state
 
 
+LINE_ITEM_REQUEST = LineItemRequest(
+    line_items=[
+        "free_cash_flow",
+        "net_income",
+        "total_debt",
+        "cash_and_equivalents",
+        "total_assets",
+        "total_liabilities",
+        "outstanding_shares",
+        "issuance_or_purchase_of_equity_shares",
+    ],
+    period="ttm",
+    limit=10,
+)
+
+
 class MichaelBurrySignal(BaseModel):
     """Schema returned by the LLM."""
 
@@ -52,17 +69,10 @@ def michael_burry_agent(state: AgentState, agent_id: str = "michael_burry_agent"
         progress.update_status(agent_id, ticker, "Fetching line items")
         line_items = search_line_items(
             ticker,
-            [
-                "free_cash_flow",
-                "net_income",
-                "total_debt",
-                "cash_and_equivalents",
-                "total_assets",
-                "total_liabilities",
-                "outstanding_shares",
-                "issuance_or_purchase_of_equity_shares",
-            ],
+            LINE_ITEM_REQUEST.line_items,
             end_date,
+            period=LINE_ITEM_REQUEST.period,
+            limit=LINE_ITEM_REQUEST.limit,
             api_key=api_key,
         )
 
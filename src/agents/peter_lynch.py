@@ -5,6 +5,7 @@ from src.tools.api import (
     get_insider_trades,
     get_company_news,
 )
+from src.data.models import LineItemRequest
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -15,6 +16,26 @@ from src.utils.llm import call_llm
 from src.utils.api_key import get_api_key_from_state
 
 
+LINE_ITEM_REQUEST = LineItemRequest(
+    line_items=[
+        "revenue",
+        "earnings_per_share",
+        "net_income",
+        "operating_income",
+        "gross_margin",
+        "operating_margin",
+        "free_cash_flow",
+        "capital_expenditure",
+        "cash_and_equivalents",
+        "total_debt",
+        "shareholders_equity",
+        "outstanding_shares",
+    ],
+    period="annual",
+    limit=5,
+)
+
+
 class PeterLynchSignal(BaseModel):
     """
     Container for the Peter Lynch-style output signal.
@@ -51,23 +72,10 @@ def peter_lynch_agent(state: AgentState, agent_id: str = "peter_lynch_agent"):
         # Relevant line items for Peter Lynch's approach
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-            ],
+            LINE_ITEM_REQUEST.line_items,
             end_date,
-            period="annual",
-            limit=5,
+            period=LINE_ITEM_REQUEST.period,
+            limit=LINE_ITEM_REQUEST.limit,
             api_key=api_key,
         )
 
@@ -5,6 +5,7 @@ from src.tools.api import (
     get_insider_trades,
     get_company_news,
 )
+from src.data.models import LineItemRequest
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -15,6 +16,27 @@ from src.utils.llm import call_llm
 import statistics
 from src.utils.api_key import get_api_key_from_state
 
+LINE_ITEM_REQUEST = LineItemRequest(
+    line_items=[
+        "revenue",
+        "net_income",
+        "earnings_per_share",
+        "free_cash_flow",
+        "research_and_development",
+        "operating_income",
+        "operating_margin",
+        "gross_margin",
+        "total_debt",
+        "shareholders_equity",
+        "cash_and_equivalents",
+        "ebit",
+        "ebitda",
+    ],
+    period="annual",
+    limit=5,
+)
+
+
 class PhilFisherSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -49,24 +71,10 @@ def phil_fisher_agent(state: AgentState, agent_id: str = "phil_fisher_agent"):
         #   - Valuation: net_income, free_cash_flow (for P/E, P/FCF), ebit, ebitda
         financial_line_items = search_line_items(
             ticker,
-            [
-                "revenue",
-                "net_income",
-                "earnings_per_share",
-                "free_cash_flow",
-                "research_and_development",
-                "operating_income",
-                "operating_margin",
-                "gross_margin",
-                "total_debt",
-                "shareholders_equity",
-                "cash_and_equivalents",
-                "ebit",
-                "ebitda",
-            ],
+            LINE_ITEM_REQUEST.line_items,
             end_date,
-            period="annual",
-            limit=5,
+            period=LINE_ITEM_REQUEST.period,
+            limit=LINE_ITEM_REQUEST.limit,
             api_key=api_key,
         )
 
@@ -5,10 +5,32 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.data.models import LineItemRequest
 from src.utils.llm import call_llm
 from src.utils.progress import progress
 from src.utils.api_key import get_api_key_from_state
 
+LINE_ITEM_REQUEST = LineItemRequest(
+    line_items=[
+        "net_income",
+        "earnings_per_share",
+        "ebit",
+        "operating_income",
+        "revenue",
+        "operating_margin",
+        "total_assets",
+        "total_liabilities",
+        "current_assets",
+        "current_liabilities",
+        "free_cash_flow",
+        "dividends_and_other_cash_distributions",
+        "issuance_or_purchase_of_equity_shares",
+    ],
+    period="ttm",
+    limit=10,
+)
+
+
 class RakeshJhunjhunwalaSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -33,22 +55,10 @@ def rakesh_jhunjhunwala_agent(state: AgentState, agent_id: str = "rakesh_jhunjhu
         progress.update_status(agent_id, ticker, "Fetching financial line items")
         financial_line_items = search_line_items(
             ticker,
-            [
-                "net_income",
-                "earnings_per_share",
-                "ebit",
-                "operating_income",
-                "revenue",
-                "operating_margin",
-                "total_assets",
-                "total_liabilities",
-                "current_assets",
-                "current_liabilities",
-                "free_cash_flow",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares"
-            ],
+            LINE_ITEM_REQUEST.line_items,
             end_date,
+            period=LINE_ITEM_REQUEST.period,
+            limit=LINE_ITEM_REQUEST.limit,
             api_key=api_key,
         )
 
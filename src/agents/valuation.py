@@ -17,6 +17,20 @@ from src.tools.api import (
     get_market_cap,
     search_line_items,
 )
+from src.data.models import LineItemRequest
+
+LINE_ITEM_REQUEST = LineItemRequest(
+    line_items=[
+        "free_cash_flow",
+        "net_income",
+        "depreciation_and_amortization",
+        "capital_expenditure",
+        "working_capital",
+    ],
+    period="ttm",
+    limit=2,
+)
+
 
 def valuation_analyst_agent(state: AgentState, agent_id: str = "valuation_analyst_agent"):
     """Run valuation across tickers and write signals back to `state`."""
@@ -47,16 +61,10 @@ def valuation_analyst_agent(state: AgentState, agent_id: str = "valuation_analys
         progress.update_status(agent_id, ticker, "Gathering line items")
         line_items = search_line_items(
             ticker=ticker,
-            line_items=[
-                "free_cash_flow",
-                "net_income",
-                "depreciation_and_amortization",
-                "capital_expenditure",
-                "working_capital",
-            ],
+            line_items=LINE_ITEM_REQUEST.line_items,
             end_date=end_date,
-            period="ttm",
-            limit=2,
+            period=LINE_ITEM_REQUEST.period,
+            limit=LINE_ITEM_REQUEST.limit,
             api_key=api_key,
         )
         if len(line_items) < 2:
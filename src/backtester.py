@@ -23,21 +23,25 @@ import pandas as pd
 from colorama import Fore, Style, init
 import numpy as np
 import itertools
+from concurrent.futures import ThreadPoolExecutor
 from typing_extensions import Callable
 
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
-from src.utils.analysts import ANALYST_ORDER
+from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
 # >>> changed import to avoid circulars
-from src.engine.runner import run_hedge_fund
-from src.tools.api import (
-    get_company_news,
-    get_price_data,
-    get_prices,
-    get_financial_metrics,
-    get_insider_trades,
-)
-from src.utils.display import print_backtest_results, format_backtest_row
+from src.data.signal_store import SignalStore, get_signal_store, model_key
+from src.engine.replay import ConsensusRule, SignalReplay
+from src.engine.runner import resolve_analysts, run_analysts, run_decisions, run_hedge_fund
+from src.eval.metrics import StreamingMetrics
+from src.portfolio import PortfolioLedger
+from src.tools.price_panel import PricePanel
+from src.tools.request_planner import prefetch_line_items, prefetch_market_caps
+from src.tools.async_api import prefetch
+from src.tools.http_archive import get_http_archive
+from src.data.cache import get_cache
+from src.utils.display import print_backtest_results, format_backtest_row, print_cache_stats
 from src.utils.ollama import ensure_ollama_and_model
+from src.utils.progress import progress
 from src.utils.config import load_config
 
 init(autoreset=True)
@@ -74,6 +78,9 @@ def _parse_args():
     )
     p.add_argument("--ollama", action="store_true", help="Use Ollama for local LLM inference")
     p.add_argument("--no-interactive", action="store_true", help="Disable interactive prompts (CI/headless)")
+    p.add_argument("--two-phase", action="store_true", help="Precompute all analyst signals in parallel, then replay risk/portfolio decisions day by day")
+    p.add_argument("--replay", action="store_true", help="Replay stored analyst signals for the selected model with a deterministic sizing rule (no LLM calls)")
+    p.add_argument("--signal-workers", type=int, default=None, help="Threads for two-phase signal precomputation (overrides config)")
     return p.parse_args()
 
 
@@ -90,6 +97,10 @@ class Backtester:
         selected_analysts: list[str] = [],
         initial_margin_requirement: float = 0.0,
         headless: bool = False,
+        two_phase: bool = False,
+        signal_workers: int = 8,
+        signal_store: SignalStore | None = None,
+        replay: SignalReplay | None = None,
     ):
         self.agent = agent
         self.tickers = tickers
@@ -100,149 +111,89 @@ class Backtester:
         self.model_provider = model_provider
         self.selected_analysts = selected_analysts
         self.headless = headless
+        self.two_phase = two_phase
+        self.signal_workers = signal_workers
+        self.signal_store = signal_store
+        self.replay = replay
 
         self.portfolio_values = []
-        self.portfolio = {
-            "cash": initial_capital,
-            "margin_used": 0.0,
-            "margin_requirement": initial_margin_requirement,
-            "positions": {ticker: {"long": 0, "short": 0, "long_cost_basis": 0.0, "short_cost_basis": 0.0, "short_margin_used": 0.0} for ticker in tickers},
-            "realized_gains": {ticker: {"long": 0.0, "short": 0.0} for ticker in tickers},
-        }
+        self.metrics = StreamingMetrics()
+        self.ledger = PortfolioLedger(tickers, initial_capital, initial_margin_requirement)
 
-    def execute_trade(self, ticker: str, action: str, quantity: float, current_price: float):
-        if quantity <= 0:
-            return 0
-        quantity = int(quantity)
-        position = self.portfolio["positions"][ticker]
-
-        if action == "buy":
-            cost = quantity * current_price
-            if cost <= self.portfolio["cash"]:
-                old_shares = position["long"]
-                old_cost_basis = position["long_cost_basis"]
-                total_shares = old_shares + quantity
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_shares
-                    total_new_cost = cost
-                    position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-                position["long"] += quantity
-                self.portfolio["cash"] -= cost
-                return quantity
-            else:
-                max_quantity = int(self.portfolio["cash"] / current_price)
-                if max_quantity > 0:
-                    cost = max_quantity * current_price
-                    old_shares = position["long"]
-                    old_cost_basis = position["long_cost_basis"]
-                    total_shares = old_shares + max_quantity
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_shares
-                        total_new_cost = cost
-                        position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-                    position["long"] += max_quantity
-                    self.portfolio["cash"] -= cost
-                    return max_quantity
-                return 0
-
-        elif action == "sell":
-            quantity = min(quantity, position["long"])
-            if quantity > 0:
-                avg_cost_per_share = position["long_cost_basis"] if position["long"] > 0 else 0
-                realized_gain = (current_price - avg_cost_per_share) * quantity
-                self.portfolio["realized_gains"][ticker]["long"] += realized_gain
-                position["long"] -= quantity
-                self.portfolio["cash"] += quantity * current_price
-                if position["long"] == 0:
-                    position["long_cost_basis"] = 0.0
-                return quantity
-
-        elif action == "short":
-            proceeds = current_price * quantity
-            margin_required = proceeds * self.portfolio["margin_requirement"]
-            if margin_required <= self.portfolio["cash"]:
-                old_short_shares = position["short"]
-                old_cost_basis = position["short_cost_basis"]
-                total_shares = old_short_shares + quantity
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_short_shares
-                    total_new_cost = current_price * quantity
-                    position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-                position["short"] += quantity
-                position["short_margin_used"] += margin_required
-                self.portfolio["margin_used"] += margin_required
-                self.portfolio["cash"] += proceeds
-                self.portfolio["cash"] -= margin_required
-                return quantity
-            else:
-                margin_ratio = self.portfolio["margin_requirement"]
-                max_quantity = int(self.portfolio["cash"] / (current_price * margin_ratio)) if margin_ratio > 0 else 0
-                if max_quantity > 0:
-                    proceeds = current_price * max_quantity
-                    margin_required = proceeds * margin_ratio
-                    old_short_shares = position["short"]
-                    old_cost_basis = position["short_cost_basis"]
-                    total_shares = old_short_shares + max_quantity
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_short_shares
-                        total_new_cost = current_price * max_quantity
-                        position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-                    position["short"] += max_quantity
-                    position["short_margin_used"] += margin_required
-                    self.portfolio["margin_used"] += margin_required
-                    self.portfolio["cash"] += proceeds
-                    self.portfolio["cash"] -= margin_required
-                    return max_quantity
-                return 0
-
-        elif action == "cover":
-            quantity = min(quantity, position["short"])
-            if quantity > 0:
-                cover_cost = quantity * current_price
-                avg_short_price = position["short_cost_basis"] if position["short"] > 0 else 0
-                realized_gain = (avg_short_price - current_price) * quantity
-                portion = (quantity / position["short"]) if position["short"] > 0 else 1.0
-                margin_to_release = portion * position["short_margin_used"]
-                position["short"] -= quantity
-                position["short_margin_used"] -= margin_to_release
-                self.portfolio["margin_used"] -= margin_to_release
-                self.portfolio["cash"] += margin_to_release
-                self.portfolio["cash"] -= cover_cost
-                self.portfolio["realized_gains"][ticker]["short"] += realized_gain
-                if position["short"] == 0:
-                    position["short_cost_basis"] = 0.0
-                    position["short_margin_used"] = 0.0
-                return quantity
-
-        return 0
-
-    def calculate_portfolio_value(self, current_prices):
-        total_value = self.portfolio["cash"]
-        for ticker in self.tickers:
-            position = self.portfolio["positions"][ticker]
-            price = current_prices[ticker]
-            total_value += position["long"] * price
-            if position["short"] > 0:
-                total_value -= position["short"] * price
-        return total_value
+    def _synthetic_data(self) -> bool:
+        """Headless/CI runs fake prices unless an HTTP archive is recording or replaying real responses."""
+        return (self.headless or os.getenv("OFFLINE") == "1") and get_http_archive() is None
 
     def prefetch_data(self):
-        if self.headless or os.getenv("OFFLINE") == "1":
+        if self._synthetic_data():
             print("Headless/CI mode: skipping data pre-fetch.")
             return
         print("\nPre-fetching data for the entire backtest period...")
         end_date_dt = datetime.strptime(self.end_date, "%Y-%m-%d")
         start_date_dt = end_date_dt - relativedelta(years=1)
         start_date_str = start_date_dt.strftime("%Y-%m-%d")
-        for ticker in self.tickers:
-            get_prices(ticker, start_date_str, self.end_date)
-            get_financial_metrics(ticker, self.end_date, limit=10)
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000)
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000)
+        # All tickers and endpoints are fetched concurrently, bounded by api.max_concurrency
+        errors = prefetch(self.tickers, start_date_str, self.end_date, start_date=self.start_date)
+        for ticker, error in errors.items():
+            print(f"Warning: pre-fetch failed for {ticker}: {error}")
         print("Data pre-fetch complete.")
 
+    def precompute_signals(self, days: list[tuple[str, str]]) -> dict[str, dict[str, dict]]:
+        """
+        Phase one of a two-phase run: every analyst signal for every (day, ticker).
+
+        Analysts don't depend on the portfolio, so each (lookback_start, day) x
+        ticker pair runs on a thread pool; the result is {day: {agent_id: {ticker: signal}}}.
+        """
+        analyst_keys = resolve_analysts(self.selected_analysts)
+        agents = [get_analyst_nodes()[key][0] for key in analyst_keys]
+        model = model_key(self.model_name, self.model_provider)
+
+        # Days whose every (agent, ticker) signal is already stored are not recomputed
+        signals = {}
+        if self.signal_store is not None:
+            for _, end in days:
+                stored = self.signal_store.get_day(model, end, self.tickers, agents)
+                if all(ticker in stored.get(agent, {}) for agent in agents for ticker in self.tickers):
+                    signals[end] = stored
+        pending = [day for day in days if day[1] not in signals]
+
+        def prefetch_day(day: tuple[str, str]):
+            # One bulk line-item request per day before the analysts fan out per ticker
+            prefetch_line_items(self.tickers, day[1], analyst_keys)
+            prefetch_market_caps(self.tickers, day[1])
+
+        signals.update({end: {} for _, end in pending})
+        print(f"\nComputing analyst signals for {len(pending)} days x {len(self.tickers)} tickers ({len(days) - len(pending)} days stored, {self.signal_workers} workers)...")
+        progress.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.signal_workers) as pool:
+                list(pool.map(prefetch_day, pending))
+                futures = {
+                    pool.submit(run_analysts, [ticker], start, end, self.selected_analysts, self.model_name, self.model_provider): (end, ticker)
+                    for start, end in pending
+                    for ticker in self.tickers
+                }
+                # Merge in submission order so every day's signals are laid out the same way
+                for future, (end, ticker) in futures.items():
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Warning: analysts failed for {ticker} on {end}: {e}")
+                        continue
+                    for agent_id, by_ticker in result.items():
+                        signals[end].setdefault(agent_id, {}).update(by_ticker)
+        finally:
+            progress.stop()
+        if self.signal_store is not None:
+            for _, end in pending:
+                self.signal_store.put(model, end, signals[end])
+        return signals
+
     def run_backtest(self):
-        self.prefetch_data()
+        # A replay needs nothing but prices, which the price panel loads itself
+        if self.replay is None:
+            self.prefetch_data()
         dates = pd.date_range(self.start_date, self.end_date, freq="B")
         # Speed-up for CI
         if self.headless:
@@ -256,82 +207,78 @@ class Backtester:
 
         print("\nStarting backtest...")
 
+        self.metrics = StreamingMetrics()
         if len(dates) > 0:
             self.portfolio_values = [{"Date": dates[0], "Portfolio Value": self.initial_capital}]
+            self.metrics.update(dates[0], self.initial_capital)
         else:
             self.portfolio_values = []
 
-        for current_date in dates:
+        synthetic = self._synthetic_data()
+        if synthetic:
+            price_panel = PricePanel.synthetic(self.tickers, dates, self.start_date, self.end_date)
+        else:
+            price_panel = PricePanel.load(self.tickers, dates)
+
+        if self.two_phase:
+            trading_days = [
+                ((day - timedelta(days=30)).strftime("%Y-%m-%d"), day.strftime("%Y-%m-%d"))
+                for i, day in enumerate(dates)
+                if price_panel.prices_on(i) is not None
+            ]
+            signals_by_day = self.precompute_signals(trading_days)
+
+        for i, current_date in enumerate(dates):
             lookback_start = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
             current_date_str = current_date.strftime("%Y-%m-%d")
-            previous_date_str = (current_date - timedelta(days=1)).strftime("%Y-%m-%d")
 
             if lookback_start == current_date_str:
                 continue
 
-            # Prices — fast path for headless/CI with synthetic panel
-            try:
-                current_prices = {}
-                if self.headless or os.getenv("OFFLINE") == "1":
-                    rng = np.random.default_rng(42)
-                    if not hasattr(self, "_price_panel"):
-                        base = {t: 100.0 + 5.0 * i for i, t in enumerate(self.tickers)}
-                        idx = pd.date_range(self.start_date, self.end_date, freq="B")
-                        panel = {}
-                        for t in self.tickers:
-                            steps = rng.normal(0, 0.01, size=len(idx))
-                            prices = pd.Series(base[t], index=idx) * (1 + steps).cumprod()
-                            panel[t] = prices
-                        self._price_panel = pd.DataFrame(panel)
-                    prev_dt = pd.to_datetime(previous_date_str)
-                    if prev_dt not in self._price_panel.index:
-                        continue
-                    for t in self.tickers:
-                        current_prices[t] = float(self._price_panel.loc[prev_dt, t])
-                else:
-                    missing_data = False
-                    for ticker in self.tickers:
-                        try:
-                            price_data = get_price_data(ticker, previous_date_str, current_date_str)
-                            if price_data.empty:
-                                print(f"Warning: No price data for {ticker} on {current_date_str}")
-                                missing_data = True
-                                break
-                            current_prices[ticker] = price_data.iloc[-1]["close"]
-                        except Exception as e:
-                            print(f"Error fetching price for {ticker} between {previous_date_str} and {current_date_str}: {e}")
-                            missing_data = True
-                            break
-                    if missing_data:
-                        print(f"Skipping trading day {current_date_str} due to missing price data")
-                        continue
-            except Exception as e:
-                print(f"Error fetching prices for {current_date_str}: {e}")
+            # Prices are one row of the preloaded panel
+            current_prices = price_panel.prices_on(i)
+            if current_prices is None:
+                if not synthetic:
+                    print(f"Warning: No price data for {', '.join(price_panel.missing_tickers(i))} on {current_date_str}")
+                    print(f"Skipping trading day {current_date_str} due to missing price data")
                 continue
 
             # Agent trade decisions
-            output = self.agent(
-                tickers=self.tickers,
-                start_date=lookback_start,
-                end_date=current_date_str,
-                portfolio=self.portfolio,
-                model_name=self.model_name,
-                model_provider=self.model_provider,
-                selected_analysts=self.selected_analysts,
-            )
+            if self.replay is not None:
+                # Stored analyst signals and a deterministic rule: no LLM calls at all
+                output = self.replay.decide(self.tickers, current_date_str, self.ledger.to_portfolio(), current_prices)
+            elif self.two_phase:
+                # Phase two: only risk and portfolio management run, over the stored signals
+                output = run_decisions(
+                    tickers=self.tickers,
+                    start_date=lookback_start,
+                    end_date=current_date_str,
+                    portfolio=self.ledger.to_portfolio(),
+                    analyst_signals=signals_by_day[current_date_str],
+                    model_name=self.model_name,
+                    model_provider=self.model_provider,
+                )
+            else:
+                output = self.agent(
+                    tickers=self.tickers,
+                    start_date=lookback_start,
+                    end_date=current_date_str,
+                    portfolio=self.ledger.to_portfolio(),
+                    model_name=self.model_name,
+                    model_provider=self.model_provider,
+                    selected_analysts=self.selected_analysts,
+                )
             decisions = output["decisions"]
             analyst_signals = output["analyst_signals"]
+            if self.signal_store is not None and self.replay is None and not self.two_phase:
+                self.signal_store.put(model_key(self.model_name, self.model_provider), current_date_str, analyst_signals)
 
-            executed_trades = {}
-            for ticker in self.tickers:
-                decision = decisions.get(ticker, {"action": "hold", "quantity": 0})
-                action, quantity = decision.get("action", "hold"), decision.get("quantity", 0)
-                executed_quantity = self.execute_trade(ticker, action, quantity, current_prices[ticker])
-                executed_trades[ticker] = executed_quantity
+            prices = price_panel.close[i]
+            executed_trades = self.ledger.execute(decisions, prices)
 
-            total_value = self.calculate_portfolio_value(current_prices)
-            long_exposure = sum(self.portfolio["positions"][t]["long"] * current_prices[t] for t in self.tickers)
-            short_exposure = sum(self.portfolio["positions"][t]["short"] * current_prices[t] for t in self.tickers)
+            total_value = self.ledger.value(prices)
+            long_exposure = self.ledger.long_exposure(prices)
+            short_exposure = self.ledger.short_exposure(prices)
             gross_exposure = long_exposure + short_exposure
             net_exposure = long_exposure - short_exposure
             long_short_ratio = long_exposure / short_exposure if short_exposure > 1e-9 else float("inf")
@@ -345,24 +292,21 @@ class Backtester:
                 "Net Exposure": net_exposure,
                 "Long/Short Ratio": long_short_ratio
             })
+            self.metrics.update(current_date, total_value)
 
             # Build rows
             date_rows = []
-            for ticker in self.tickers:
+            position_values = self.ledger.position_values(prices)
+            for j, ticker in enumerate(self.tickers):
                 ticker_signals = {}
-                for agent_name, signals in analyst_signals.items():
-                    if ticker in signals:
-                        ticker_signals[agent_name] = signals[ticker]
+                for agent_name, agent_signals in analyst_signals.items():
+                    if ticker in agent_signals:
+                        ticker_signals[agent_name] = agent_signals[ticker]
 
                 bullish_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "bullish"])
                 bearish_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "bearish"])
                 neutral_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "neutral"])
 
-                pos = self.portfolio["positions"][ticker]
-                long_val = pos["long"] * current_prices[ticker]
-                short_val = pos["short"] * current_prices[ticker]
-                net_position_value = long_val - short_val
-
                 action = decisions.get(ticker, {}).get("action", "hold")
                 quantity = executed_trades.get(ticker, 0)
 
@@ -373,8 +317,8 @@ class Backtester:
                         action=action,
                         quantity=quantity,
                         price=current_prices[ticker],
-                        shares_owned=pos["long"] - pos["short"],
-                        position_value=net_position_value,
+                        shares_owned=int(self.ledger.long[j] - self.ledger.short[j]),
+                        position_value=float(position_values[j]),
                         bullish_count=bullish_count,
                         bearish_count=bearish_count,
                         neutral_count=neutral_count,
@@ -393,8 +337,8 @@ class Backtester:
                     is_summary=True,
                     total_value=total_value,
                     return_pct=portfolio_return,
-                    cash_balance=self.portfolio["cash"],
-                    total_position_value=total_value - self.portfolio["cash"],
+                    cash_balance=self.ledger.cash,
+                    total_position_value=total_value - self.ledger.cash,
                     sharpe_ratio=performance_metrics["sharpe_ratio"],
                     sortino_ratio=performance_metrics["sortino_ratio"],
                     max_drawdown=performance_metrics["max_drawdown"],
@@ -408,34 +352,13 @@ class Backtester:
                 self._update_performance_metrics(performance_metrics)
 
         self.performance_metrics = performance_metrics
+        if self.replay is not None and self.replay.days_missing:
+            print(f"Warning: no stored signals for {self.replay.days_missing} of {self.replay.days_replayed} replayed days (positions held)")
+        print_cache_stats(get_cache().get_stats())
         return performance_metrics
 
     def _update_performance_metrics(self, performance_metrics):
-        values_df = pd.DataFrame(self.portfolio_values).set_index("Date")
-        values_df["Daily Return"] = values_df["Portfolio Value"].pct_change()
-        clean_returns = values_df["Daily Return"].dropna()
-        if len(clean_returns) < 2:
-            return
-        daily_risk_free_rate = 0.0434 / 252
-        excess_returns = clean_returns - daily_risk_free_rate
-        mean_excess_return = excess_returns.mean()
-        std_excess_return = excess_returns.std()
-        performance_metrics["sharpe_ratio"] = (np.sqrt(252) * (mean_excess_return / std_excess_return)) if std_excess_return > 1e-12 else 0.0
-        negative_returns = excess_returns[excess_returns < 0]
-        if len(negative_returns) > 0:
-            downside_std = negative_returns.std()
-            performance_metrics["sortino_ratio"] = (np.sqrt(252) * (mean_excess_return / downside_std)) if downside_std > 1e-12 else (float("inf") if mean_excess_return > 0 else 0)
-        else:
-            performance_metrics["sortino_ratio"] = float("inf") if mean_excess_return > 0 else 0
-        rolling_max = values_df["Portfolio Value"].cummax()
-        drawdown = (values_df["Portfolio Value"] - rolling_max) / rolling_max
-        if len(drawdown) > 0:
-            min_drawdown = drawdown.min()
-            performance_metrics["max_drawdown"] = min_drawdown * 100
-            performance_metrics["max_drawdown_date"] = drawdown.idxmin().strftime("%Y-%m-%d") if min_drawdown < 0 else None
-        else:
-            performance_metrics["max_drawdown"] = 0.0
-            performance_metrics["max_drawdown_date"] = None
+        performance_metrics.update(self.metrics.snapshot())
 
     def analyze_performance(self):
         if not self.portfolio_values:
@@ -452,7 +375,7 @@ class Backtester:
         print(f"\n{Fore.WHITE}{Style.BRIGHT}PORTFOLIO PERFORMANCE SUMMARY:{Style.RESET_ALL}")
         print(f"Total Return: {Fore.GREEN if total_return >= 0 else Fore.RED}{total_return:.2f}%{Style.RESET_ALL}")
 
-        total_realized_gains = sum(self.portfolio["realized_gains"][ticker]["long"] + self.portfolio["realized_gains"][ticker]["short"] for ticker in self.tickers)
+        total_realized_gains = self.ledger.realized_gains()
         print(f"Total Realized Gains/Losses: {Fore.GREEN if total_realized_gains >= 0 else Fore.RED}${total_realized_gains:,.2f}{Style.RESET_ALL}")
 
         plt.figure(figsize=(12, 6))
@@ -591,6 +514,15 @@ def main():
                     print("\n\nInterrupt received. Exiting...")
                     sys.exit(0)
 
+    signal_store = get_signal_store()
+    replay = None
+    if args.replay:
+        if signal_store is None:
+            raise SystemExit("--replay needs the signal store (data.signal_store in config).")
+        rule = ConsensusRule(max_position_pct=cfg.get("backtest.replay.max_position_pct", 0.2), min_score=cfg.get("backtest.replay.min_score", 0.1))
+        agents = [get_analyst_nodes()[key][0] for key in resolve_analysts(selected_analysts)]
+        replay = SignalReplay(signal_store, model_key(model_name, model_provider), rule, agents)
+
     backtester = Backtester(
         agent=run_hedge_fund,
         tickers=tickers,
@@ -602,6 +534,10 @@ def main():
         selected_analysts=selected_analysts,
         initial_margin_requirement=margin_requirement,
         headless=headless,
+        two_phase=args.two_phase or cfg.get("backtest.two_phase", False),
+        signal_workers=args.signal_workers or cfg.get("backtest.signal_workers", 8),
+        signal_store=signal_store,
+        replay=replay,
     )
 
     performance_metrics = backtester.run_backtest()
@@ -1,12 +1,197 @@
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.data.cache_metrics import CacheMetrics
+from src.data.event_store import TickerEventStore
+from src.data.fundamentals_store import FundamentalsStore
+from src.data.line_item_store import LineItemStore
+from src.data.memory_budget import MemoryBudget, estimate_nbytes
+from src.data.persistent_cache import SQLiteCacheStore
+from src.data.price_series import PriceSeries
+from src.data.price_store import TickerPriceStore
+from src.data.serialization import PayloadCodec
+
+
+DEFAULT_NEGATIVE_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_COMPANY_FACTS_TTL_SECONDS = 15 * 60
+# How often a cache checks the shared disk store for other processes' writes
+DEFAULT_SYNC_INTERVAL_SECONDS = 1.0
+
+# Day field that orders each event namespace
+EVENT_DATE_FIELDS = {"insider_trades": "filing_date", "company_news": "date"}
+
+# Kind of data held in each in-memory namespace; memory TTLs are configured per kind
+MEMORY_NAMESPACE_KINDS = {
+    "prices": "prices",
+    "price_ranges": "prices",
+    "financial_metrics": "financial_metrics",
+    "fundamentals": "financial_metrics",
+    "line_items": "line_items",
+    "insider_trades": "insider_trades",
+    "insider_trades_events": "insider_trades",
+    "company_news": "company_news",
+    "company_news_events": "company_news",
+    "company_facts": "company_facts",
+}
+
+
 class Cache:
-    """In-memory cache for API responses."""
+    """
+    Two-tier cache for API responses: hot in-memory dicts in front of an optional disk store.
+
+    The memory tier is bounded by a MemoryBudget: max_bytes caps its total
+    approximate size (least recently used entries are evicted first) and
+    memory_ttls gives each kind of data a maximum age in memory. Evicted or
+    expired entries are read back from the disk store, or refetched without one.
 
-    def __init__(self):
+    Several processes can share one disk store. Before using its memory tier a
+    cache checks the store's data_version and drops the entries that other
+    processes have rewritten, so the next read picks up their data instead of
+    fetching it again.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteCacheStore | None = None,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        company_facts_ttl: float = DEFAULT_COMPANY_FACTS_TTL_SECONDS,
+        clock=None,
+        max_bytes: int | None = None,
+        memory_ttls: dict[str, float | None] | None = None,
+        today=None,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL_SECONDS,
+    ):
+        self._store = store
+        self.negative_ttl = negative_ttl
+        self.company_facts_ttl = company_facts_ttl
+        self._clock = clock or time.time
+        # Date that still-forming data is judged against (a replay pins it to the recording day)
+        self.today = today or date.today
         self._prices_cache: dict[str, list[dict[str, any]]] = {}
         self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
+        self._line_items_cache: dict[str, LineItemStore] = {}
+        self._fundamentals: dict[str, FundamentalsStore] = {}
+        # ticker -> {"fetched_at": timestamp, "facts": {...}}
+        self._company_facts: dict[str, dict[str, any]] = {}
         self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
         self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+        self._price_ranges: dict[str, TickerPriceStore] = {}
+        self._event_stores: dict[str, dict[str, TickerEventStore]] = {namespace: {} for namespace in EVENT_DATE_FIELDS}
+        # "namespace:key" -> expiry timestamp for queries the API answered with no data
+        self._negative_cache: dict[str, float] = {}
+        self._negative_hits: Counter = Counter()
+        self._memory: dict[str, dict] = {
+            "prices": self._prices_cache,
+            "price_ranges": self._price_ranges,
+            "financial_metrics": self._financial_metrics_cache,
+            "fundamentals": self._fundamentals,
+            "line_items": self._line_items_cache,
+            "insider_trades": self._insider_trades_cache,
+            "company_news": self._company_news_cache,
+            "company_facts": self._company_facts,
+            **{f"{namespace}_events": stores for namespace, stores in self._event_stores.items()},
+        }
+        ttls = {namespace: (memory_ttls or {}).get(kind) for namespace, kind in MEMORY_NAMESPACE_KINDS.items()}
+        self._budget = MemoryBudget(max_bytes=max_bytes, ttls=ttls, clock=self._clock)
+        self.metrics = CacheMetrics()
+        # Last disk-store data_version and change seq this process has caught up with
+        self._data_version: int | None = None
+        self._seen_seq: int | None = None
+        self.sync_interval = sync_interval
+        self._synced_at: float | None = None
+        self._lock = threading.RLock()
+
+    def _sync_with_store(self):
+        """Forget in-memory entries that other processes sharing the disk store have rewritten."""
+        if self._store is None:
+            return
+        # Memory hits would otherwise each pay a SQLite round trip; others' writes show up within sync_interval
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        version = self._store.data_version()
+        if version == self._data_version:
+            return
+        if self._seen_seq is None:
+            self._seen_seq = self._store.last_seq()
+        else:
+            changed, self._seen_seq = self._store.changes_since(self._seen_seq)
+            for namespace, key in changed:
+                self._forget(namespace, key)
+        self._data_version = version
+
+    def _forget(self, namespace: str | None, key: str | None):
+        """Drop one in-memory entry; a None key drops the whole namespace, a None namespace everything."""
+        if namespace is None:
+            for name in ("negative", *self._memory):
+                self._forget(name, None)
+        elif namespace == "negative":
+            if key is None:
+                self._negative_cache.clear()
+            else:
+                self._negative_cache.pop(key, None)
+        elif namespace in self._memory:
+            for entry_key in list(self._memory[namespace]) if key is None else [key]:
+                self._memory[namespace].pop(entry_key, None)
+                self._budget.discard(namespace, entry_key)
+
+    def _resident(self, namespace: str, key: str):
+        """The in-memory value for (namespace, key), unless absent, past its memory TTL or rewritten elsewhere."""
+        self._sync_with_store()
+        value = self._memory[namespace].get(key)
+        if value is not None and not self._budget.touch(namespace, key):
+            del self._memory[namespace][key]
+            return None
+        return value
+
+    def _admit(self, namespace: str, key: str, value):
+        """Store a value in memory (or re-measure it after a merge) and evict to stay within budget."""
+        self._sync_with_store()
+        self._memory[namespace][key] = value
+        for evicted_namespace, evicted_key in self._budget.track(namespace, key, estimate_nbytes(value)):
+            self._memory[evicted_namespace].pop(evicted_key, None)
+
+    def get_memory_stats(self) -> dict[str, any]:
+        """Approximate bytes held per namespace, the budget, and evictions/expirations so far."""
+        with self._lock:
+            return self._budget.stats()
+
+    def get_stats(self) -> dict[str, any]:
+        """
+        Effectiveness of the cache per kind of data (prices, financial_metrics, ...).
+
+        Each kind reports lookups answered locally (hits) or needing the API
+        (misses), negative-cache hits, resident bytes, evictions and
+        expirations from the memory tier, and the upstream request latency
+        histogram recorded by the API clients.
+        """
+        memory = self.get_memory_stats()
+        negative = self.get_negative_cache_stats()["network_calls_saved_by_namespace"]
+        counters = self.metrics.snapshot()
+        namespaces = {}
+        for kind in sorted(set(MEMORY_NAMESPACE_KINDS.values()) | set(counters)):
+            entry = counters.get(kind, {"hits": 0, "misses": 0, "upstream_latency": None})
+            lookups = entry["hits"] + entry["misses"]
+            namespaces[kind] = {
+                "hits": entry["hits"],
+                "misses": entry["misses"],
+                "hit_rate": entry["hits"] / lookups if lookups else None,
+                "negative_hits": negative.get(kind, 0),
+                **{
+                    field: sum(count for namespace, count in memory[f"{field}_by_namespace"].items() if MEMORY_NAMESPACE_KINDS.get(namespace) == kind)
+                    for field in ("bytes", "evictions", "expirations")
+                },
+                "upstream_latency": entry["upstream_latency"],
+            }
+        return {
+            "memory": {"bytes": memory["bytes"], "max_bytes": memory["max_bytes"], "entries": memory["entries"]},
+            "namespaces": namespaces,
+        }
 
     def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
         """Merge existing and new data, avoiding duplicates based on a key field."""
@@ -21,49 +206,277 @@ class Cache:
         merged.extend([item for item in new_data if item[key_field] not in existing_keys])
         return merged
 
+    def _get(self, namespace: str, memory: dict[str, list[dict[str, any]]], key: str) -> list[dict[str, any]] | None:
+        """Read from memory first, then fall back to the disk store and promote the hit."""
+        with self._lock:
+            data = self._resident(namespace, key)
+            if data is None and self._store is not None:
+                data = self._store.get(namespace, key)
+                if data is not None:
+                    self._admit(namespace, key, data)
+            self.metrics.record(namespace, data is not None)
+            return data
+
+    def _set(self, namespace: str, memory: dict[str, list[dict[str, any]]], key: str, data: list[dict[str, any]], key_field: str):
+        """Merge into memory and write the merged result through to the disk store."""
+        with self._lock:
+            existing = self._resident(namespace, key)
+            if existing is None and self._store is not None:
+                existing = self._store.get(namespace, key)
+            merged = self._merge_data(existing, data, key_field=key_field)
+            self._admit(namespace, key, merged)
+            if self._store is not None:
+                self._store.set(namespace, key, merged)
+
+    def is_known_empty(self, namespace: str, key: str) -> bool:
+        """True if the API recently returned no data for this query, so it need not be asked again."""
+        entry_key = f"{namespace}:{key}"
+        with self._lock:
+            self._sync_with_store()
+            expires_at = self._negative_cache.get(entry_key)
+            if expires_at is None and self._store is not None:
+                expires_at = self._store.get("negative", entry_key)
+                if expires_at is not None:
+                    self._negative_cache[entry_key] = expires_at
+            if expires_at is None:
+                return False
+            if expires_at <= self._clock():
+                # Expired: forget it so the next call asks the API again
+                del self._negative_cache[entry_key]
+                return False
+            self._negative_hits[namespace] += 1
+            return True
+
+    def set_empty(self, namespace: str, key: str):
+        """Remember for negative_ttl seconds that the API has no data for this query."""
+        if self.negative_ttl <= 0:
+            return
+        entry_key = f"{namespace}:{key}"
+        expires_at = self._clock() + self.negative_ttl
+        with self._lock:
+            self._negative_cache[entry_key] = expires_at
+            if self._store is not None:
+                self._store.set("negative", entry_key, expires_at)
+
+    def get_negative_cache_stats(self) -> dict[str, any]:
+        """Network calls saved by negative entries, per namespace and in total."""
+        with self._lock:
+            return {
+                "entries": len(self._negative_cache),
+                "network_calls_saved": sum(self._negative_hits.values()),
+                "network_calls_saved_by_namespace": dict(self._negative_hits),
+            }
+
     def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+        return self._get("prices", self._prices_cache, ticker)
 
     def set_prices(self, ticker: str, data: list[dict[str, any]]):
         """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+        self._set("prices", self._prices_cache, ticker, data, key_field="time")
+
+    def _price_range(self, ticker: str) -> TickerPriceStore:
+        """Load the per-ticker date-indexed price store, reading through to disk once."""
+        store = self._resident("price_ranges", ticker)
+        if store is None:
+            payload = self._store.get("price_ranges", ticker) if self._store is not None else None
+            store = TickerPriceStore.from_dict(payload) if payload else TickerPriceStore()
+            self._admit("price_ranges", ticker, store)
+        return store
+
+    def get_missing_price_windows(self, ticker: str, start_date: str, end_date: str, record: bool = True) -> list[tuple[str, str]]:
+        """
+        Return the parts of [start_date, end_date] not yet covered for this ticker.
+
+        record=False leaves the hit/miss counters alone, for re-checks of a
+        lookup that was already counted (like every lookup method below).
+        """
+        with self._lock:
+            missing = self._price_range(ticker).missing(start_date, end_date)
+        if record:
+            self.metrics.record("prices", not missing)
+        return missing
+
+    def get_price_window(self, ticker: str, start_date: str, end_date: str) -> PriceSeries:
+        """Slice cached bars for [start_date, end_date] out of the per-ticker store (zero-copy views)."""
+        with self._lock:
+            return self._price_range(ticker).slice(start_date, end_date)
+
+    def merge_prices(self, ticker: str, data: list[dict[str, any]], start_date: str, end_date: str):
+        """Merge fetched bars for [start_date, end_date] and mark the window covered."""
+        # Today's bar may still be forming, so coverage stops at yesterday
+        yesterday = (self.today() - timedelta(days=1)).isoformat()
+        with self._lock:
+            store = self._price_range(ticker)
+            store.merge(data, start_date, end_date, covered_until=yesterday)
+            self._admit("price_ranges", ticker, store)
+            if self._store is not None:
+                self._store.set("price_ranges", ticker, store.to_dict())
 
     def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
         """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+        return self._get("financial_metrics", self._financial_metrics_cache, ticker)
 
     def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
         """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+        self._set("financial_metrics", self._financial_metrics_cache, ticker, data, key_field="report_period")
+
+    def _fundamentals_store(self, ticker: str, period: str) -> FundamentalsStore:
+        """Load the point-in-time metrics store for (ticker, period), reading through to disk once."""
+        key = f"{ticker}_{period}"
+        store = self._resident("fundamentals", key)
+        if store is None:
+            payload = self._store.get("fundamentals", key) if self._store is not None else None
+            store = FundamentalsStore.from_dict(payload) if payload else FundamentalsStore()
+            self._admit("fundamentals", key, store)
+        return store
+
+    def get_fundamentals(self, ticker: str, period: str, end_date: str, limit: int, record: bool = True) -> list[dict[str, any]] | None:
+        """The latest `limit` financial metrics as of end_date, or None if that isn't known locally."""
+        with self._lock:
+            data = self._fundamentals_store(ticker, period).query(end_date, limit)
+        if record:
+            self.metrics.record("financial_metrics", data is not None)
+        return data
+
+    def merge_fundamentals(self, ticker: str, period: str, end_date: str, limit: int, data: list[dict[str, any]]):
+        """Merge the answer to an as-of financial metrics fetch into the point-in-time store."""
+        with self._lock:
+            store = self._fundamentals_store(ticker, period)
+            store.merge(end_date, limit, data)
+            self._admit("fundamentals", f"{ticker}_{period}", store)
+            if self._store is not None:
+                self._store.set("fundamentals", f"{ticker}_{period}", store.to_dict())
+
+    def _line_item_store(self, ticker: str, period: str) -> LineItemStore:
+        """Load the field-level line-item store for (ticker, period), reading through to disk once."""
+        key = f"{ticker}_{period}"
+        store = self._resident("line_items", key)
+        if store is None:
+            payload = self._store.get("line_items", key) if self._store is not None else None
+            store = LineItemStore.from_dict(payload) if payload else LineItemStore()
+            self._admit("line_items", key, store)
+        return store
 
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+    def get_line_items(self, ticker: str, period: str, end_date: str, limit: int, line_items: list[str], record: bool = True) -> tuple[list[dict[str, any]] | None, list[str]]:
+        """Get cached line items projected onto line_items, plus the fields that still need fetching."""
+        with self._lock:
+            data, missing = self._line_item_store(ticker, period).lookup(end_date, limit, line_items)
+        if record:
+            self.metrics.record("line_items", data is not None and not missing)
+        return data, missing
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+    def set_line_items(self, ticker: str, period: str, end_date: str, limit: int, line_items: list[str], data: list[dict[str, any]]):
+        """Merge fetched line items into cache at field level."""
+        with self._lock:
+            store = self._line_item_store(ticker, period)
+            store.merge(end_date, limit, line_items, data)
+            self._admit("line_items", f"{ticker}_{period}", store)
+            if self._store is not None:
+                self._store.set("line_items", f"{ticker}_{period}", store.to_dict())
 
     def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        return self._get("insider_trades", self._insider_trades_cache, ticker)
 
     def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
         """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+        self._set("insider_trades", self._insider_trades_cache, ticker, data, key_field="filing_date")  # Could also use transaction_date if preferred
+
+    def _event_store(self, namespace: str, ticker: str) -> TickerEventStore:
+        """Load the per-ticker event store for insider trades or news, reading through to disk once."""
+        store = self._resident(f"{namespace}_events", ticker)
+        if store is None:
+            payload = self._store.get(f"{namespace}_events", ticker) if self._store is not None else None
+            store = TickerEventStore.from_dict(payload) if payload else TickerEventStore(EVENT_DATE_FIELDS[namespace])
+            self._admit(f"{namespace}_events", ticker, store)
+        return store
+
+    def get_events(self, namespace: str, ticker: str, start_date: str | None, end_date: str, limit: int, fetched_through: str | None = None, record: bool = True) -> list[dict[str, any]] | None:
+        """Serve an insider-trade or news query from the event store, or None if it isn't covered."""
+        with self._lock:
+            data = self._event_store(namespace, ticker).query(start_date, end_date, limit, fetched_through=fetched_through)
+        if record:
+            self.metrics.record(namespace, data is not None)
+        return data
+
+    def get_event_delta_start(self, namespace: str, ticker: str, start_date: str | None, end_date: str) -> str | None:
+        """High-water mark to fetch from when only events after it are missing."""
+        with self._lock:
+            return self._event_store(namespace, ticker).delta_start(start_date, end_date)
+
+    def merge_events(self, namespace: str, ticker: str, data: list[dict[str, any]], start_date: str | None, end_date: str, limit: int):
+        """Append fetched events and extend the covered window."""
+        # Filings can still arrive later today, so coverage stops at yesterday like prices
+        yesterday = (self.today() - timedelta(days=1)).isoformat()
+        with self._lock:
+            store = self._event_store(namespace, ticker)
+            store.merge(data, start_date, end_date, limit, covered_until=yesterday)
+            self._admit(f"{namespace}_events", ticker, store)
+            if self._store is not None:
+                self._store.set(f"{namespace}_events", ticker, store.to_dict())
+
+    def get_company_facts(self, ticker: str, record: bool = True) -> dict[str, any] | None:
+        """Get cached company facts if they were fetched less than company_facts_ttl seconds ago."""
+        with self._lock:
+            entry = self._resident("company_facts", ticker)
+            if entry is None and self._store is not None:
+                entry = self._store.get("company_facts", ticker)
+                if entry is not None:
+                    self._admit("company_facts", ticker, entry)
+            fresh = entry is not None and entry["fetched_at"] + self.company_facts_ttl > self._clock()
+        if record:
+            self.metrics.record("company_facts", fresh)
+        return entry["facts"] if fresh else None
+
+    def set_company_facts(self, ticker: str, facts: dict[str, any]):
+        """Cache company facts (market cap moves intraday, so they expire after company_facts_ttl)."""
+        entry = {"fetched_at": self._clock(), "facts": facts}
+        with self._lock:
+            self._admit("company_facts", ticker, entry)
+            if self._store is not None:
+                self._store.set("company_facts", ticker, entry)
 
     def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        return self._get("company_news", self._company_news_cache, ticker)
 
     def set_company_news(self, ticker: str, data: list[dict[str, any]]):
         """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+        self._set("company_news", self._company_news_cache, ticker, data, key_field="date")
+
+
+def _default_cache() -> Cache:
+    """Build the global cache from the data.* settings in config.yaml."""
+    from src.tools.http_archive import get_http_archive
+    from src.utils.config import load_config
+
+    archive = get_http_archive()
+    try:
+        cfg = load_config()
+    except FileNotFoundError:
+        return Cache() if archive is None else Cache(today=archive.today)
+    max_bytes = cfg.get("data.memory_cache.max_bytes")
+    options = {
+        "negative_ttl": float(cfg.get("data.negative_cache_ttl", DEFAULT_NEGATIVE_TTL_SECONDS)),
+        "company_facts_ttl": float(cfg.get("data.company_facts_ttl", DEFAULT_COMPANY_FACTS_TTL_SECONDS)),
+        "max_bytes": int(max_bytes) if max_bytes is not None else None,
+        "memory_ttls": cfg.get("data.memory_cache.ttl") or {},
+        "sync_interval": float(cfg.get("data.sync_interval", DEFAULT_SYNC_INTERVAL_SECONDS)),
+    }
+    if archive is not None:
+        # Recording or replaying starts from an empty memory-only cache dated to the
+        # recording, so every request reaches the archive and replays ask for the same URLs
+        return Cache(today=archive.today, **options)
+    if not cfg.get("data.persist_cache", True):
+        return Cache(**options)
+    cache_dir = os.environ.get("CACHE_DIR") or cfg.get("data.cache_dir", "artifacts/cache")
+    codec = PayloadCodec(format=cfg.get("data.cache_format", "auto"), compression=cfg.get("data.cache_compression", "none"))
+    return Cache(store=SQLiteCacheStore(Path(cache_dir) / "api_cache.sqlite3", codec=codec), **options)
 
 
 # Global cache instance
-_cache = Cache()
+_cache = _default_cache()
 
 
 def get_cache() -> Cache:
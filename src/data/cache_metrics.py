@@ -0,0 +1,83 @@
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+# Upper bounds (milliseconds) of the upstream latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of request latencies, cheap enough to update on every call."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (max_ms for the open-ended bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": self.max_ms,
+            "buckets_ms": {f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)} | {"inf": self.counts[-1]},
+        }
+
+
+class CacheMetrics:
+    """Per-namespace hit/miss counters and upstream latency histograms for the API cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.latency: defaultdict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    def record(self, namespace: str, hit: bool):
+        with self._lock:
+            (self.hits if hit else self.misses)[namespace] += 1
+
+    def observe_latency(self, namespace: str, seconds: float):
+        with self._lock:
+            self.latency[namespace].observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+            self.latency.clear()
+
+    def snapshot(self) -> dict[str, dict[str, any]]:
+        """Counters and latency summaries keyed by namespace."""
+        with self._lock:
+            namespaces = set(self.hits) | set(self.misses) | set(self.latency)
+            return {
+                namespace: {
+                    "hits": self.hits[namespace],
+                    "misses": self.misses[namespace],
+                    "upstream_latency": self.latency[namespace].as_dict() if namespace in self.latency else None,
+                }
+                for namespace in sorted(namespaces)
+            }
@@ -0,0 +1,126 @@
+import json
+from bisect import bisect_left, bisect_right
+
+
+def _event_id(event: dict[str, any]) -> str:
+    return json.dumps(event, sort_keys=True, default=str)
+
+
+class TickerEventStore:
+    """
+    Append-only, date-indexed events (insider trades, news) for one ticker.
+
+    Events are kept sorted by their filing/publish day next to a single covered
+    window [low, high]: every event dated inside it has been fetched. high is
+    the high-water mark, so rolling the end date forward only needs the delta
+    after it. low is "" when the whole history up to high is known, and
+    low_partial marks a low day that a `limit` cut may have truncated.
+    high never passes the covered_until day given to merge(), since filings
+    later in a day that is still in progress have not been published yet.
+    """
+
+    def __init__(self, date_field: str, events: list[dict[str, any]] | None = None, coverage: dict[str, any] | None = None):
+        self.date_field = date_field
+        self.days: list[str] = []
+        self.events: list[dict[str, any]] = []
+        self._ids: set[str] = set()
+        self._nbytes = 0
+        self.coverage: dict[str, any] | None = coverage
+        if events:
+            self._insert(events)
+
+    def _day(self, event: dict[str, any]) -> str:
+        return event[self.date_field][:10]
+
+    def _insert(self, events: list[dict[str, any]]):
+        new_events = []
+        for event in events:
+            event_id = _event_id(event)
+            if event_id not in self._ids:
+                self._ids.add(event_id)
+                self._nbytes += len(event_id)
+                new_events.append(event)
+        if not new_events:
+            return
+        pairs = list(zip(self.days, self.events))
+        pairs.extend((self._day(event), event) for event in new_events)
+        pairs.sort(key=lambda pair: pair[0])
+        self.days = [day for day, _ in pairs]
+        self.events = [event for _, event in pairs]
+
+    def _window(self, start: str, end: str) -> list[dict[str, any]]:
+        """Events dated inside [start, end], most recent first like the API returns them."""
+        return self.events[bisect_left(self.days, start):bisect_right(self.days, end)][::-1]
+
+    def _covers_low(self, start: str | None, end: str, limit: int) -> bool:
+        low = self.coverage["low"]
+        if low == "":
+            return True
+        if start is not None:
+            return low < start or (low == start and not self.coverage["low_partial"])
+        # Without a start date the API returns the latest `limit` events
+        return len(self._window(low, end)) >= limit
+
+    def query(self, start: str | None, end: str, limit: int, fetched_through: str | None = None) -> list[dict[str, any]] | None:
+        """
+        Answer a (start, end, limit) request locally, or None if the covered window can't.
+
+        fetched_through lets the caller that just merged a fetch up to that day
+        answer from it, although coverage itself stops short of it.
+        """
+        if self.coverage is None or max(self.coverage["high"], fetched_through or "") < end or not self._covers_low(start, end, limit):
+            return None
+        if start is not None:
+            return self._window(start, end)
+        return self._window(self.coverage["low"], end)[:limit]
+
+    def delta_start(self, start: str | None, end: str) -> str | None:
+        """The high-water mark to fetch from when only events after it are missing, else None."""
+        if self.coverage is None or self.coverage["high"] >= end:
+            return None
+        if start is not None and start > self.coverage["high"]:
+            return None
+        # Start-less queries can still be topped up; query() decides if enough history is left
+        return self.coverage["high"]
+
+    def merge(self, events: list[dict[str, any]], start: str | None, end: str, limit: int, covered_until: str | None = None):
+        """
+        Add fetched events and extend coverage up to min(end, covered_until).
+
+        A fetch with a start date is complete for [start, end]. A start-less
+        fetch that returned fewer than `limit` events is complete back to the
+        beginning; otherwise it is complete down to (part of) its oldest day.
+        """
+        self._insert(events)
+        if covered_until is not None:
+            end = min(end, covered_until)
+        if start is not None:
+            low, low_partial = start, False
+        elif len(events) < limit:
+            low, low_partial = "", False
+        else:
+            low, low_partial = min(self._day(event) for event in events), True
+        if low > end:
+            # Nothing fetched is settled yet (e.g. only today); the events are kept but not covered
+            return
+
+        current = self.coverage
+        if current is not None and low <= current["high"] and current["low"] <= end:
+            if current["low"] < low or (current["low"] == low and not current["low_partial"]):
+                low, low_partial = current["low"], current["low_partial"]
+            end = max(end, current["high"])
+        elif current is not None and current["high"] > end:
+            # A disjoint older window; keep the more recent one
+            return
+        self.coverage = {"low": low, "low_partial": low_partial, "high": end}
+
+    def nbytes(self) -> int:
+        """Approximate size: the JSON length of every event, summed as they are inserted."""
+        return self._nbytes
+
+    def to_dict(self) -> dict[str, any]:
+        return {"date_field": self.date_field, "events": self.events, "coverage": self.coverage}
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, any]) -> "TickerEventStore":
+        return cls(payload["date_field"], events=payload.get("events"), coverage=payload.get("coverage"))
@@ -0,0 +1,72 @@
+import json
+from bisect import bisect_left, bisect_right
+
+
+class FundamentalsStore:
+    """
+    Point-in-time financial metrics for one (ticker, period).
+
+    Reports are kept sorted by report_period. Every answered "as of end_date,
+    last `limit` reports" fetch also records a known window [low, as_of]:
+    every report whose period falls inside it is in the store. low is the
+    oldest period the fetch returned, or "" when it returned fewer than
+    `limit` (i.e. the full history). Any later as-of query inside a known
+    window, for any date and limit it can satisfy, is a bisect slice.
+    """
+
+    def __init__(self, reports: list[dict[str, any]] | None = None, windows: list[list[str]] | None = None):
+        self.periods: list[str] = []
+        self.reports: list[dict[str, any]] = []
+        self.windows: list[list[str]] = []
+        self._report_nbytes = 0
+        if reports:
+            self._insert(reports)
+        for low, as_of in windows or []:
+            self._add_window(low, as_of)
+
+    def _insert(self, reports: list[dict[str, any]]):
+        by_period = dict(zip(self.periods, self.reports))
+        for report in reports:
+            by_period[report["report_period"]] = report
+        self.periods = sorted(by_period)
+        self.reports = [by_period[period] for period in self.periods]
+        if self.reports and not self._report_nbytes:
+            # Reports share the FinancialMetrics schema, so one is a fair sample
+            self._report_nbytes = len(json.dumps(self.reports[0], default=str))
+
+    def _add_window(self, low: str, as_of: str):
+        windows = sorted(self.windows + [[low, as_of]])
+        merged = [windows[0]]
+        for lo, hi in windows[1:]:
+            if lo <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        self.windows = merged
+
+    def query(self, as_of: str, limit: int) -> list[dict[str, any]] | None:
+        """The latest `limit` reports with report_period <= as_of (newest first), or None if not known."""
+        for low, high in self.windows:
+            if low <= as_of <= high:
+                hi = bisect_right(self.periods, as_of)
+                known = self.reports[bisect_left(self.periods, low):hi][::-1]
+                if low == "" or len(known) >= limit:
+                    return known[:limit]
+        return None
+
+    def merge(self, as_of: str, limit: int, reports: list[dict[str, any]]):
+        """Add the answer to an as-of fetch and remember which window it makes known."""
+        self._insert(reports)
+        low = "" if len(reports) < limit else min(report["report_period"] for report in reports)
+        self._add_window(low, as_of)
+
+    def nbytes(self) -> int:
+        """Approximate size from the report count, without walking the reports."""
+        return len(self.reports) * self._report_nbytes
+
+    def to_dict(self) -> dict[str, any]:
+        return {"reports": self.reports, "windows": self.windows}
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, any]) -> "FundamentalsStore":
+        return cls(reports=payload.get("reports"), windows=payload.get("windows"))
@@ -0,0 +1,74 @@
+import json
+
+_BASE_FIELDS = ("ticker", "report_period", "period", "currency")
+
+
+class LineItemStore:
+    """
+    Field-level line-item cache for one (ticker, period).
+
+    Records are merged per report_period, so fields fetched by different
+    requests accumulate on the same record. Each answered query remembers
+    which report periods it returned and which fields have been fetched for
+    it, so a request for a subset of those fields is answered locally and a
+    request for extra fields only needs to fetch the difference.
+    """
+
+    def __init__(self, records: dict[str, dict[str, any]] | None = None, queries: dict[str, list[dict[str, any]]] | None = None):
+        self.records: dict[str, dict[str, any]] = records or {}
+        self.queries: dict[str, list[dict[str, any]]] = queries or {}
+        self._nbytes = len(json.dumps(self.records, default=str)) if self.records else 0
+
+    def _query(self, end_date: str, limit: int) -> dict[str, any] | None:
+        return next((q for q in self.queries.get(end_date, []) if q["limit"] == limit), None)
+
+    def lookup(self, end_date: str, limit: int, line_items: list[str]) -> tuple[list[dict[str, any]] | None, list[str]]:
+        """
+        Return (records, missing_fields).
+
+        records is the cached answer projected onto line_items when every field
+        is available, else None; missing_fields lists what still has to be fetched.
+        """
+        wanted = set(line_items)
+        # Any query with the same end date and at least as many periods can answer
+        for query in self.queries.get(end_date, []):
+            if query["limit"] >= limit and wanted <= set(query["fields"]):
+                return self.project(query["report_periods"][:limit], line_items), []
+
+        query = self._query(end_date, limit)
+        fetched = set(query["fields"]) if query else set()
+        return None, [item for item in line_items if item not in fetched]
+
+    def project(self, report_periods: list[str], line_items: list[str]) -> list[dict[str, any]]:
+        """Build response-shaped records containing only the requested fields."""
+        projected = []
+        for report_period in report_periods:
+            record = self.records.get(report_period, {})
+            projected.append({field: record[field] for field in (*_BASE_FIELDS, *line_items) if field in record})
+        return projected
+
+    def merge(self, end_date: str, limit: int, line_items: list[str], data: list[dict[str, any]]):
+        """Merge fetched records field-by-field and mark line_items as fetched for (end_date, limit)."""
+        for item in data:
+            self.records.setdefault(item["report_period"], {}).update(item)
+            # Grow by the fetched delta (fields are mostly new, since only missing ones are requested)
+            self._nbytes += len(json.dumps(item, default=str))
+
+        query = self._query(end_date, limit)
+        if query is None:
+            query = {"limit": limit, "report_periods": [], "fields": []}
+            self.queries.setdefault(end_date, []).append(query)
+        query["fields"] = sorted(set(query["fields"]) | set(line_items))
+        # Most recent period first, matching the API's ordering
+        query["report_periods"] = sorted(set(query["report_periods"]) | {item["report_period"] for item in data}, reverse=True)
+
+    def nbytes(self) -> int:
+        """Approximate size of the records, grown by each merge's delta."""
+        return self._nbytes
+
+    def to_dict(self) -> dict[str, any]:
+        return {"records": self.records, "queries": self.queries}
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, any]) -> "LineItemStore":
+        return cls(records=payload.get("records"), queries=payload.get("queries"))
@@ -0,0 +1,97 @@
+import json
+import time
+from collections import Counter, OrderedDict
+
+
+def estimate_nbytes(value) -> int:
+    """
+    Approximate in-memory size of a cached value without walking all of it.
+
+    Stores keep their own size up to date as they merge (nbytes()); record
+    lists are sized as their length times their first record's JSON length,
+    since one namespace's records share a schema. Anything else is measured
+    as JSON (e.g. a single company-facts entry).
+    """
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes())
+    if isinstance(value, list):
+        return len(value) * len(json.dumps(value[0], default=str)) if value else 0
+    return len(json.dumps(value, default=str))
+
+
+class MemoryBudget:
+    """
+    LRU bookkeeping for the in-memory cache tier.
+
+    Tracks the approximate size of every resident (namespace, key) entry in
+    recency order. Admitting or resizing an entry past max_bytes evicts the
+    least recently used others; an entry older than its namespace's TTL is
+    reported expired on its next access. The budget only decides what to drop:
+    the owning cache removes the values (the disk tier, if any, keeps them).
+    """
+
+    def __init__(self, max_bytes: int | None = None, ttls: dict[str, float | None] | None = None, clock=None):
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        self._clock = clock or time.time
+        # (namespace, key) -> [nbytes, stored_at], least recently used first
+        self._entries: OrderedDict[tuple[str, any], list[float]] = OrderedDict()
+        self.bytes = 0
+        self.bytes_by_namespace: Counter = Counter()
+        self.evictions: Counter = Counter()
+        self.expirations: Counter = Counter()
+
+    def _drop(self, entry_key: tuple[str, any]):
+        nbytes, _ = self._entries.pop(entry_key)
+        self.bytes -= nbytes
+        self.bytes_by_namespace[entry_key[0]] -= nbytes
+
+    def track(self, namespace: str, key, nbytes: int) -> list[tuple[str, any]]:
+        """Record an entry's current size as most recently used; return the entries evicted to fit."""
+        entry_key = (namespace, key)
+        stored_at = self._clock()
+        if entry_key in self._entries:
+            stored_at = self._entries[entry_key][1]
+            self._drop(entry_key)
+        self._entries[entry_key] = [nbytes, stored_at]
+        self.bytes += nbytes
+        self.bytes_by_namespace[namespace] += nbytes
+
+        evicted = []
+        if self.max_bytes is not None:
+            # The entry just admitted is in use, so it is never its own victim
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                victim = next(iter(self._entries))
+                self._drop(victim)
+                self.evictions[victim[0]] += 1
+                evicted.append(victim)
+        return evicted
+
+    def discard(self, namespace: str, key):
+        """Stop tracking an entry its owner removed."""
+        if (namespace, key) in self._entries:
+            self._drop((namespace, key))
+
+    def touch(self, namespace: str, key) -> bool:
+        """Mark an entry as used; False (and forget it) if it outlived its namespace's TTL."""
+        entry_key = (namespace, key)
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            return True
+        ttl = self.ttls.get(namespace)
+        if ttl is not None and entry[1] + ttl <= self._clock():
+            self._drop(entry_key)
+            self.expirations[namespace] += 1
+            return False
+        self._entries.move_to_end(entry_key)
+        return True
+
+    def stats(self) -> dict[str, any]:
+        return {
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "entries": len(self._entries),
+            "bytes_by_namespace": {namespace: nbytes for namespace, nbytes in self.bytes_by_namespace.items() if nbytes},
+            "evictions_by_namespace": dict(self.evictions),
+            "expirations_by_namespace": dict(self.expirations),
+        }
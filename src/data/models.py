@@ -79,6 +79,12 @@ class LineItemResponse(BaseModel):
     search_results: list[LineItem]
 
 
+class LineItemRequest(BaseModel):
+    line_items: list[str]
+    period: str = "ttm"
+    limit: int = 10
+
+
 class InsiderTrade(BaseModel):
     ticker: str
     issuer: str | None
@@ -0,0 +1,146 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from src.data.serialization import PayloadCodec
+
+
+class SQLiteCacheStore:
+    """
+    Disk-backed key/value store used as the second cache tier behind the in-memory dicts.
+
+    The database runs in WAL mode so several processes on one host (uvicorn
+    workers, the orchestrator, the strategy service) can share one file:
+    readers never block the single writer, and each process sees the others'
+    commits. Every write stamps its row with an increasing seq, so a process
+    can ask which entries other processes changed since it last looked and
+    drop just those from its in-memory tier. The counter lives in cache_meta,
+    so it keeps increasing when rows are deleted; clear() takes a seq too and
+    logs it in cache_clears, since the rows it deletes can't carry one.
+
+    Payloads are stored as compact binary blobs (see PayloadCodec); rows
+    written as JSON text by older versions are still read.
+    """
+
+    def __init__(self, path: str | os.PathLike, codec: PayloadCodec | None = None):
+        self.path = Path(path)
+        self.codec = codec or PayloadCodec()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # seqs of rows this connection wrote itself, so they aren't reported as foreign changes
+        self._own_seqs: set[int] = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Open lazily so importing the cache never touches the filesystem
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL only fsyncs at checkpoints; a power loss can drop the last few cache writes, never corrupt
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")}
+            if "seq" not in columns:
+                # Files written before the store was shared between processes
+                self._conn.execute("ALTER TABLE cache_entries ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_seq ON cache_entries (seq)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # One row per clear(); a NULL namespace means every namespace was cleared
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache_clears (seq INTEGER PRIMARY KEY, namespace TEXT)")
+            # Files from before the counter continue from their highest row
+            self._conn.execute("INSERT OR IGNORE INTO cache_meta (name, value) SELECT 'seq', COALESCE(MAX(seq), 0) FROM cache_entries")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, namespace: str, key: str) -> list[dict[str, any]] | None:
+        """Return the stored payload for (namespace, key), or None if absent."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT payload FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return self.codec.decode(row[0])
+        except ImportError:
+            # Written by a process with an optional codec dependency this one lacks; refetch
+            return None
+
+    def set(self, namespace: str, key: str, data: list[dict[str, any]]):
+        """Insert or replace the payload for (namespace, key)."""
+        payload = self.codec.encode(data)
+        with self._lock:
+            conn = self._connect()
+            seq = self._next_seq(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, payload, updated_at, seq) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, payload, time.time(), seq),
+            )
+            conn.commit()
+            self._own_seqs.add(seq)
+
+    @staticmethod
+    def _next_seq(conn: sqlite3.Connection) -> int:
+        # Bumping the counter takes the writer lock, so the seq is unique across processes
+        (seq,) = conn.execute("UPDATE cache_meta SET value = value + 1 WHERE name = 'seq' RETURNING value").fetchone()
+        return seq
+
+    def data_version(self) -> int:
+        """SQLite's PRAGMA data_version: changes whenever another connection commits to the file."""
+        with self._lock:
+            return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT value FROM cache_meta WHERE name = 'seq'").fetchone()[0]
+
+    def changes_since(self, seq: int) -> tuple[list[tuple[str | None, str | None]], int]:
+        """
+        (namespace, key) pairs other connections wrote or cleared after seq, and the newest seq seen.
+
+        A clear is reported with a None key, or (None, None) when it covered every namespace.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                """
+                SELECT namespace, key, seq FROM cache_entries WHERE seq > ?
+                UNION ALL
+                SELECT namespace, NULL, seq FROM cache_clears WHERE seq > ?
+                ORDER BY seq
+                """,
+                (seq, seq),
+            ).fetchall()
+            changed = [(namespace, key) for namespace, key, row_seq in rows if row_seq not in self._own_seqs]
+            newest = max((row_seq for _, _, row_seq in rows), default=seq)
+            self._own_seqs = {own for own in self._own_seqs if own > newest}
+        return changed, newest
+
+    def clear(self, namespace: str | None = None):
+        """Delete every entry, or only those in one namespace, and log the clear for other processes."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT INTO cache_clears (seq, namespace) VALUES (?, ?)", (self._next_seq(conn), namespace))
+            if namespace is None:
+                conn.execute("DELETE FROM cache_entries")
+            else:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
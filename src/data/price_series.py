@@ -0,0 +1,106 @@
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data.models import Price
+
+PRICE_COLUMNS = ("open", "close", "high", "low", "volume")
+
+
+class PriceSeries(Sequence):
+    """
+    Columnar daily bars: NumPy arrays for OHLCV plus int64 UTC nanosecond timestamps.
+
+    This is what the price cache stores and what get_prices returns. Slices are
+    NumPy views, to_df() wraps the arrays without copying, and the
+    Sequence[Price] interface (indexing, iteration, len) builds Price models
+    lazily, one bar at a time, for code that still expects list[Price].
+    """
+
+    __slots__ = ("time", "open", "close", "high", "low", "volume")
+
+    def __init__(self, time: np.ndarray, open: np.ndarray, close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray):
+        self.time = time
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0, dtype=np.float64) for _ in range(4)), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_records(cls, records: list[dict[str, any]]) -> "PriceSeries":
+        """Build from API-shaped bar dicts (e.g. PriceResponse.prices dumped)."""
+        if not records:
+            return cls.empty()
+        time = pd.to_datetime([record["time"] for record in records], utc=True).asi8.astype(np.int64, copy=False)
+        return cls(
+            time,
+            np.array([record["open"] for record in records], dtype=np.float64),
+            np.array([record["close"] for record in records], dtype=np.float64),
+            np.array([record["high"] for record in records], dtype=np.float64),
+            np.array([record["low"] for record in records], dtype=np.float64),
+            np.array([record["volume"] for record in records], dtype=np.int64),
+        )
+
+    @classmethod
+    def from_prices(cls, prices: list[Price]) -> "PriceSeries":
+        return cls.from_records([price.model_dump() for price in prices])
+
+    @classmethod
+    def concat(cls, parts: list["PriceSeries"]) -> "PriceSeries":
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(part, name) for part in parts]) for name in cls.__slots__))
+
+    def take(self, indices) -> "PriceSeries":
+        """Select bars by position (slices give views, index arrays give copies)."""
+        return PriceSeries(*(getattr(self, name)[indices] for name in self.__slots__))
+
+    def freeze(self) -> "PriceSeries":
+        """Make the arrays read-only so views handed out of the cache can't modify it."""
+        for name in self.__slots__:
+            getattr(self, name).flags.writeable = False
+        return self
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(index)
+        return Price(
+            open=float(self.open[index]),
+            close=float(self.close[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            volume=int(self.volume[index]),
+            time=str(self.time_strings(index)),
+        )
+
+    def time_strings(self, index=slice(None)) -> str | np.ndarray:
+        """ISO-8601 UTC strings ("2024-01-02T05:00:00Z") for one bar or a range."""
+        return np.datetime_as_string(self.time[index].view("datetime64[ns]"), unit="s", timezone="UTC")
+
+    def to_records(self) -> list[dict[str, any]]:
+        """API-shaped bar dicts, e.g. for JSON persistence."""
+        times = self.time_strings()
+        return [
+            {"open": o, "close": c, "high": h, "low": lo, "volume": v, "time": str(t)}
+            for o, c, h, lo, v, t in zip(self.open.tolist(), self.close.tolist(), self.high.tolist(), self.low.tolist(), self.volume.tolist(), times)
+        ]
+
+    def to_df(self) -> pd.DataFrame:
+        """
+        DataFrame indexed by "Date" whose columns share memory with this series.
+
+        The index is tz-naive UTC so it can wrap the int64 timestamps without a copy.
+        This is the internal zero-copy view; prices_to_df is the public, writable frame.
+        """
+        index = pd.DatetimeIndex(self.time.view("datetime64[ns]"), name="Date", copy=False)
+        return pd.DataFrame({name: getattr(self, name) for name in PRICE_COLUMNS}, index=index, copy=False)
@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from src.data.price_series import PriceSeries
+
+
+def _shift(day: str, days: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+class TickerPriceStore:
+    """
+    Date-indexed daily bars for one ticker plus the calendar windows already fetched.
+
+    Bars are held column-wise in a PriceSeries sorted by day, so any window
+    inside the covered range is a binary-search slice returned as array views.
+    Coverage is tracked separately from the bars because weekends and holidays
+    are covered but have no bar.
+    """
+
+    def __init__(self, bars: list[dict[str, any]] | None = None, coverage: list[list[str]] | None = None, series: PriceSeries | None = None, days: list[str] | None = None):
+        self.days = np.array(days if days is not None else [], dtype="datetime64[D]")
+        self.series = series if series is not None else PriceSeries.empty()
+        self.coverage: list[list[str]] = []
+        if bars:
+            self._insert(PriceSeries.from_records(bars), [bar["time"][:10] for bar in bars])
+        for start, end in coverage or []:
+            self._cover(start, end)
+
+    def _insert(self, series: PriceSeries, days: list[str]):
+        new_days = np.array(days, dtype="datetime64[D]")
+        # Fresh bars replace cached bars for the same day
+        keep = ~np.isin(self.days, new_days)
+        all_days = np.concatenate([self.days[keep], new_days])
+        combined = PriceSeries.concat([self.series.take(keep), series])
+        # Later duplicates within the fetched batch win, then sort by day
+        _, last = np.unique(all_days[::-1], return_index=True)
+        order = len(all_days) - 1 - last
+        self.days = all_days[order]
+        self.series = combined.take(order).freeze()
+
+    def _cover(self, start: str, end: str):
+        if start > end:
+            return
+        intervals = sorted(self.coverage + [[start, end]])
+        merged = [intervals[0]]
+        for lo, hi in intervals[1:]:
+            # Adjacent calendar windows collapse into one interval
+            if lo <= _shift(merged[-1][1], 1):
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        self.coverage = merged
+
+    def missing(self, start: str, end: str) -> list[tuple[str, str]]:
+        """Return the sub-windows of [start, end] that have not been fetched yet."""
+        gaps = []
+        cursor = start
+        for lo, hi in self.coverage:
+            if hi < cursor:
+                continue
+            if lo > end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, _shift(lo, -1)))
+            cursor = _shift(hi, 1)
+            if cursor > end:
+                return gaps
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def slice(self, start: str, end: str) -> PriceSeries:
+        """Return the bars whose day falls inside [start, end], as views into the store."""
+        lo = np.searchsorted(self.days, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(self.days, np.datetime64(end, "D"), side="right")
+        return self.series[lo:hi]
+
+    def merge(self, bars: list[dict[str, any]], start: str, end: str, covered_until: str | None = None):
+        """Add freshly fetched bars and mark [start, min(end, covered_until)] as covered."""
+        if bars:
+            self._insert(PriceSeries.from_records(bars), [bar["time"][:10] for bar in bars])
+        if covered_until is not None:
+            end = min(end, covered_until)
+        self._cover(start, end)
+
+    def nbytes(self) -> int:
+        """Bytes held by the bar and day arrays."""
+        return self.days.nbytes + sum(getattr(self.series, name).nbytes for name in PriceSeries.__slots__)
+
+    def to_dict(self) -> dict[str, any]:
+        """Column-wise payload of fixed-width arrays; the cache codec stores them as raw bytes."""
+        return {
+            "columns": {
+                "day": self.days,
+                **{name: getattr(self.series, name) for name in PriceSeries.__slots__},
+            },
+            "coverage": self.coverage,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, any]) -> "TickerPriceStore":
+        columns = payload.get("columns")
+        if columns is None:
+            # Row-wise payloads written before the columnar layout
+            return cls(bars=payload.get("bars"), coverage=payload.get("coverage"))
+        series = PriceSeries(
+            np.array(columns["time"], dtype=np.int64),
+            *(np.array(columns[name], dtype=np.float64) for name in ("open", "close", "high", "low")),
+            np.array(columns["volume"], dtype=np.int64),
+        )
+        return cls(coverage=payload.get("coverage"), series=series.freeze(), days=columns["day"])
@@ -0,0 +1,203 @@
+"""
+Compact binary encoding for disk-cache payloads.
+
+Payloads are the JSON-shaped dicts the per-ticker stores persist. Two things
+make them large as text: every record repeats its field names, and every
+float is spelled out in decimal. The codec therefore
+
+  * turns lists of flat records sharing the same keys (metrics, line items,
+    news, insider trades) into columns, with all-float columns packed as
+    float64 arrays plus a null bitmask;
+  * ships NumPy arrays (the price store's columns) as raw fixed-width bytes;
+  * serializes with msgpack when it is installed (orjson or json otherwise);
+  * optionally compresses with zstd (zlib when zstandard isn't installed).
+
+Every blob starts with a two-byte header naming its format and compression,
+so readers decode whatever a writer with different settings produced.
+"""
+
+import json
+import zlib
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+FORMATS = {"json": b"j", "msgpack": b"m"}
+COMPRESSIONS = {"none": b"-", "zlib": b"z", "zstd": b"s"}
+
+# Marker keys of encoded values; API payloads never use them
+_COLUMNS = "__columns__"
+_ARRAY = "__ndarray__"
+_MSGPACK_NDARRAY = 1
+
+# Below this many records the field names cost less than the column headers
+_MIN_COLUMNAR_RECORDS = 4
+
+
+def _is_float_column(values: list) -> bool:
+    return any(isinstance(v, float) for v in values) and all(v is None or isinstance(v, float) for v in values)
+
+
+def _to_columns(records: list[dict]) -> dict | list:
+    """Columnar form of a list of flat records with identical keys, or the list itself."""
+    if len(records) < _MIN_COLUMNAR_RECORDS or not all(isinstance(r, dict) for r in records):
+        return [_pack(r) for r in records]
+    keys = list(records[0])
+    if any(list(r) != keys or any(isinstance(v, (dict, list)) for v in r.values()) for r in records):
+        return [_pack(r) for r in records]
+    columns = {}
+    for key in keys:
+        values = [r[key] for r in records]
+        if _is_float_column(values):
+            nulls = np.array([v is None for v in values])
+            data = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            columns[key] = {"values": data, "nulls": np.packbits(nulls) if nulls.any() else None}
+        else:
+            columns[key] = {"values": values, "nulls": None}
+    return {_COLUMNS: columns, "n": len(records)}
+
+
+def _from_columns(payload: dict) -> list[dict]:
+    n = payload["n"]
+    columns = {}
+    for key, column in payload[_COLUMNS].items():
+        values = _unpack(column["values"])
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+            if column["nulls"] is not None:
+                nulls = np.unpackbits(_unpack(column["nulls"]), count=n).astype(bool).tolist()
+                values = [None if null else v for v, null in zip(values, nulls)]
+        columns[key] = values
+    return [dict(zip(columns, row)) for row in zip(*columns.values())] if columns else [{} for _ in range(n)]
+
+
+def _pack(value):
+    """Rewrite a JSON-shaped value into the codec's compact object tree."""
+    if isinstance(value, dict):
+        return {k: _pack(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return _to_columns(value)
+    return value
+
+
+def _unpack(value):
+    if isinstance(value, dict):
+        if _COLUMNS in value:
+            return _from_columns(value)
+        if _ARRAY in value:
+            return _array_from_json(value)
+        return {k: _unpack(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_unpack(v) for v in value]
+    return value
+
+
+def _array_header(array: np.ndarray) -> bytes:
+    dtype = array.dtype.str.encode()
+    return bytes([len(dtype)]) + dtype
+
+
+def _msgpack_default(value):
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        return msgpack.ExtType(_MSGPACK_NDARRAY, _array_header(array) + array.tobytes())
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes):
+    if code != _MSGPACK_NDARRAY:
+        return msgpack.ExtType(code, data)
+    dtype = np.dtype(data[1 : 1 + data[0]].decode())
+    # Copy out of the message buffer so the array owns (and can mutate) its memory
+    return np.frombuffer(data, dtype=dtype, offset=1 + data[0]).copy()
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f":
+            # NaN isn't valid JSON; null bitmasks carry the real nulls
+            return {_ARRAY: value.dtype.str, "data": [None if np.isnan(v) else v for v in value.tolist()]}
+        return {_ARRAY: value.dtype.str, "data": value.astype(str).tolist() if value.dtype.kind == "M" else value.tolist()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _array_from_json(value: dict) -> np.ndarray:
+    dtype = np.dtype(value[_ARRAY])
+    if dtype.kind == "f":
+        return np.array([np.nan if v is None else v for v in value["data"]], dtype=dtype)
+    return np.array(value["data"], dtype=dtype)
+
+
+class PayloadCodec:
+    """Encode/decode disk-cache payloads; see the module docstring for the layout."""
+
+    def __init__(self, format: str = "auto", compression: str = "none", level: int = 3):
+        if format == "auto":
+            format = "msgpack" if msgpack is not None else "json"
+        if format not in FORMATS:
+            raise ValueError(f"Unknown cache payload format: {format}")
+        if format == "msgpack" and msgpack is None:
+            raise ImportError("msgpack is not installed; use format 'json' or 'auto'")
+        if compression == "zstd" and zstandard is None:
+            compression = "zlib"
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache payload compression: {compression}")
+        self.format = format
+        self.compression = compression
+        self.level = level
+        self._header = FORMATS[format] + COMPRESSIONS[compression]
+
+    def encode(self, payload) -> bytes:
+        tree = _pack(payload)
+        if self.format == "msgpack":
+            body = msgpack.packb(tree, default=_msgpack_default, use_bin_type=True)
+        else:
+            body = self._dumps_json(tree)
+        if self.compression == "zstd":
+            body = zstandard.ZstdCompressor(level=self.level).compress(body)
+        elif self.compression == "zlib":
+            body = zlib.compress(body, self.level)
+        return self._header + body
+
+    @staticmethod
+    def _dumps_json(tree) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(tree, default=_json_default)
+            except TypeError:
+                pass  # e.g. ints beyond 64 bits, which stdlib json handles
+        return json.dumps(tree, default=_json_default, separators=(",", ":")).encode()
+
+    @staticmethod
+    def decode(blob: bytes | str):
+        """Decode a blob written by any codec configuration (or a legacy JSON text payload)."""
+        if isinstance(blob, str):
+            return json.loads(blob)
+        format_tag, compression_tag, body = blob[:1], blob[1:2], blob[2:]
+        if compression_tag == COMPRESSIONS["zstd"]:
+            if zstandard is None:
+                raise ImportError("zstandard is required to read this cache entry")
+            body = zstandard.ZstdDecompressor().decompress(body)
+        elif compression_tag == COMPRESSIONS["zlib"]:
+            body = zlib.decompress(body)
+        if format_tag == FORMATS["msgpack"]:
+            if msgpack is None:
+                raise ImportError("msgpack is required to read this cache entry")
+            tree = msgpack.unpackb(body, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+        else:
+            tree = orjson.loads(body) if orjson is not None else json.loads(body)
+        return _unpack(tree)
@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.data.serialization import PayloadCodec
+
+
+def model_key(model_name: str, model_provider: str) -> str:
+    """The model component of a signal's key, e.g. "OpenAI/gpt-4.1"."""
+    return f"{model_provider}/{model_name}"
+
+
+def _confidence(signal: dict) -> float | None:
+    try:
+        return float(signal.get("confidence"))
+    except (TypeError, ValueError):
+        return None
+
+
+class SignalStore:
+    """
+    Analyst signals persisted per (agent, ticker, date, model).
+
+    Each signal's direction and confidence are typed columns, so a replay
+    can load a whole date range as a frame without decoding anything; the
+    complete signal (reasoning included) is kept next to them as a
+    PayloadCodec blob for callers that want it back verbatim. Risk-manager
+    outputs depend on the portfolio and are not stored.
+
+    The file uses WAL mode like the API cache, so the CLI and backend
+    processes can write to one store concurrently.
+    """
+
+    def __init__(self, path: str | os.PathLike, codec: PayloadCodec | None = None):
+        self.path = Path(path)
+        self.codec = codec or PayloadCodec()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signals (
+                    model TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    agent TEXT NOT NULL,
+                    signal TEXT,
+                    confidence REAL,
+                    payload BLOB NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (model, date, ticker, agent)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def put(self, model: str, date: str, analyst_signals: dict[str, dict[str, dict]]):
+        """Store one day's {agent_id: {ticker: signal}}, replacing earlier signals for the same keys."""
+        now = time.time()
+        rows = [
+            (model, date, ticker, agent, signal.get("signal"), _confidence(signal), self.codec.encode(signal), now)
+            for agent, by_ticker in analyst_signals.items()
+            if not agent.startswith("risk_management_agent")
+            for ticker, signal in by_ticker.items()
+            if isinstance(signal, dict)
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR REPLACE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+
+    def _select(self, columns: str, model: str, start_date: str, end_date: str, tickers: list[str] | None, agents: list[str] | None) -> list[tuple]:
+        query = f"SELECT {columns} FROM signals WHERE model = ? AND date BETWEEN ? AND ?"
+        params: list = [model, start_date, end_date]
+        for name, values in (("ticker", tickers), ("agent", agents)):
+            if values is not None:
+                query += f" AND {name} IN ({','.join('?' * len(values))})"
+                params.extend(values)
+        with self._lock:
+            return self._connect().execute(query + " ORDER BY date, agent, ticker", params).fetchall()
+
+    def get_day(self, model: str, date: str, tickers: list[str] | None = None, agents: list[str] | None = None) -> dict[str, dict[str, dict]]:
+        """One day's signals as {agent_id: {ticker: signal}}, the shape the agents produce."""
+        signals: dict[str, dict[str, dict]] = {}
+        for agent, ticker, payload in self._select("agent, ticker, payload", model, date, date, tickers, agents):
+            signals.setdefault(agent, {})[ticker] = self.codec.decode(payload)
+        return signals
+
+    def load(self, model: str, start_date: str, end_date: str, tickers: list[str] | None = None, agents: list[str] | None = None) -> pd.DataFrame:
+        """Signals in [start_date, end_date] as a date/agent/ticker/signal/confidence frame (payloads not decoded)."""
+        rows = self._select("date, agent, ticker, signal, confidence", model, start_date, end_date, tickers, agents)
+        return pd.DataFrame(rows, columns=["date", "agent", "ticker", "signal", "confidence"])
+
+    def dates(self, model: str) -> list[str]:
+        """Days with at least one stored signal for the model."""
+        with self._lock:
+            return [row[0] for row in self._connect().execute("SELECT DISTINCT date FROM signals WHERE model = ? ORDER BY date", (model,))]
+
+    def models(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._connect().execute("SELECT DISTINCT model FROM signals ORDER BY model")]
+
+
+_store: SignalStore | None = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+
+def _load_store() -> SignalStore | None:
+    from src.utils.config import load_config
+
+    try:
+        cfg = load_config()
+    except FileNotFoundError:
+        return None
+    if not cfg.get("data.signal_store", True):
+        return None
+    cache_dir = os.environ.get("CACHE_DIR") or cfg.get("data.cache_dir", "artifacts/cache")
+    codec = PayloadCodec(format=cfg.get("data.cache_format", "auto"), compression=cfg.get("data.cache_compression", "none"))
+    return SignalStore(Path(cache_dir) / "signals.sqlite3", codec=codec)
+
+
+def get_signal_store() -> SignalStore | None:
+    """The process-wide signal store under data.cache_dir, or None when data.signal_store is off."""
+    global _store, _store_loaded
+    if not _store_loaded:
+        with _store_lock:
+            if not _store_loaded:
+                _store = _load_store()
+                _store_loaded = True
+    return _store
@@ -0,0 +1,82 @@
+"""
+Signal replay: drive a backtest from stored analyst signals without calling any LLM.
+
+The analysts' outputs for a (model, day) are read back from the SignalStore
+and a deterministic portfolio rule stands in for the risk and portfolio
+managers, so position-sizing, margin and capital variations can be
+backtested in seconds once the signals have been computed once.
+"""
+
+from src.data.signal_store import SignalStore
+
+SIGNAL_DIRECTIONS = {"bullish": 1.0, "bearish": -1.0, "neutral": 0.0}
+
+HOLD = ("hold", 0)
+
+
+class ConsensusRule:
+    """
+    Move each ticker toward a net position sized by its analyst consensus.
+
+    The consensus score is the mean of direction × confidence (as a 0-1
+    fraction) over the ticker's signals. Scores below min_score in absolute
+    value target a flat position; otherwise the target is score ×
+    max_position_pct of portfolio value, long or short. Like the portfolio
+    manager, the rule emits one action per ticker per day, so flipping sides
+    takes a close first and an open the next day.
+    """
+
+    def __init__(self, max_position_pct: float = 0.2, min_score: float = 0.1):
+        self.max_position_pct = max_position_pct
+        self.min_score = min_score
+
+    def score(self, ticker_signals: dict[str, dict]) -> float:
+        votes = [SIGNAL_DIRECTIONS.get(str(s.get("signal", "")).lower(), 0.0) * min(max(float(s.get("confidence") or 0) / 100, 0.0), 1.0) for s in ticker_signals.values()]
+        return sum(votes) / len(votes) if votes else 0.0
+
+    def __call__(self, ticker_signals: dict[str, dict], price: float, long: int, short: int, portfolio_value: float) -> tuple[str, int]:
+        score = self.score(ticker_signals)
+        target = int(score * self.max_position_pct * portfolio_value / price) if abs(score) >= self.min_score and price > 0 else 0
+        # Close the opposite side before building toward the target
+        if target >= 0 and short > 0:
+            return "cover", short
+        if target <= 0 and long > 0:
+            return "sell", long
+        if target > long:
+            return "buy", target - long
+        if 0 < target < long:
+            return "sell", long - target
+        if -target > short:
+            return "short", -target - short
+        if target < 0 and -target < short:
+            return "cover", short + target
+        return HOLD
+
+
+class SignalReplay:
+    """Decides each backtest day from the signals stored for `model`, with `rule` in place of risk/PM."""
+
+    def __init__(self, store: SignalStore, model: str, rule: ConsensusRule | None = None, agents: list[str] | None = None):
+        self.store = store
+        self.model = model
+        self.rule = rule or ConsensusRule()
+        self.agents = agents
+        self.days_replayed = 0
+        self.days_missing = 0
+
+    def decide(self, tickers: list[str], date: str, portfolio: dict, prices: dict[str, float]) -> dict[str, dict]:
+        """Same shape as run_hedge_fund's output: {"decisions": ..., "analyst_signals": ...}."""
+        analyst_signals = self.store.get_day(self.model, date, tickers, self.agents)
+        self.days_replayed += 1
+        if not analyst_signals:
+            self.days_missing += 1
+        positions = portfolio["positions"]
+        portfolio_value = portfolio["cash"] + sum((positions[t]["long"] - positions[t]["short"]) * prices[t] for t in tickers)
+
+        decisions = {}
+        for ticker in tickers:
+            ticker_signals = {agent: by_ticker[ticker] for agent, by_ticker in analyst_signals.items() if ticker in by_ticker}
+            # No stored opinion on this ticker today: leave the position alone
+            action, quantity = self.rule(ticker_signals, prices[ticker], positions[ticker]["long"], positions[ticker]["short"], portfolio_value) if ticker_signals else HOLD
+            decisions[ticker] = {"action": action, "quantity": quantity}
+        return {"decisions": decisions, "analyst_signals": analyst_signals}
@@ -1,4 +1,5 @@
 # src/engine/runner.py
+from functools import lru_cache
 from typing import List, Dict, Any
 
 from langchain_core.messages import HumanMessage
@@ -7,6 +8,7 @@ from langgraph.graph import END, StateGraph
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
+from src.tools.request_planner import prefetch_line_items, prefetch_market_caps
 from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
 from src.utils.progress import progress
 import json
@@ -28,19 +30,13 @@ def start(state: AgentState) -> AgentState:
     return state
 
 
-def create_workflow(selected_analysts: List[str] | None = None) -> StateGraph:
-    """
-    Build the agent workflow DAG. Accepts either internal keys or display names.
-    """
-    workflow = StateGraph(AgentState)
-    workflow.add_node("start_node", start)
-
-    # All available analyst nodes
+def resolve_analysts(selected_analysts: List[str] | None) -> List[str]:
+    """Normalize analyst selections (internal keys or display names) to de-duplicated keys."""
     analyst_nodes = get_analyst_nodes()
 
     # Default to all analysts if none selected
     if selected_analysts is None:
-        selected_analysts = list(analyst_nodes.keys())
+        return list(analyst_nodes.keys())
 
     # Normalize selections: accept keys or display names
     display_to_key = {display: key for display, key in ANALYST_ORDER}
@@ -59,7 +55,19 @@ def create_workflow(selected_analysts: List[str] | None = None) -> StateGraph:
             )
     # De-dup while preserving order
     seen = set()
-    selected_analysts = [x for x in normalized if not (x in seen or seen.add(x))]
+    return [x for x in normalized if not (x in seen or seen.add(x))]
+
+
+def create_workflow(selected_analysts: List[str] | None = None) -> StateGraph:
+    """
+    Build the agent workflow DAG. Accepts either internal keys or display names.
+    """
+    workflow = StateGraph(AgentState)
+    workflow.add_node("start_node", start)
+
+    # All available analyst nodes
+    analyst_nodes = get_analyst_nodes()
+    selected_analysts = resolve_analysts(selected_analysts)
 
     # Add analyst nodes
     for analyst_key in selected_analysts:
@@ -81,6 +89,102 @@ def create_workflow(selected_analysts: List[str] | None = None) -> StateGraph:
     return workflow
 
 
+def create_analyst_workflow(selected_analysts: List[str] | None = None) -> StateGraph:
+    """The analyst half of the DAG: start -> analysts -> END, no portfolio-dependent nodes."""
+    workflow = StateGraph(AgentState)
+    workflow.add_node("start_node", start)
+    analyst_nodes = get_analyst_nodes()
+    for analyst_key in resolve_analysts(selected_analysts):
+        node_name, node_func = analyst_nodes[analyst_key]
+        workflow.add_node(node_name, node_func)
+        workflow.add_edge("start_node", node_name)
+        workflow.add_edge(node_name, END)
+    workflow.set_entry_point("start_node")
+    return workflow
+
+
+def create_decision_workflow() -> StateGraph:
+    """The portfolio half of the DAG: risk management then the portfolio manager."""
+    workflow = StateGraph(AgentState)
+    workflow.add_node("risk_management_agent", risk_management_agent)
+    workflow.add_node("portfolio_manager", portfolio_management_agent)
+    workflow.add_edge("risk_management_agent", "portfolio_manager")
+    workflow.add_edge("portfolio_manager", END)
+    workflow.set_entry_point("risk_management_agent")
+    return workflow
+
+
+@lru_cache(maxsize=None)
+def _compiled_analysts(selected_analysts: tuple[str, ...] | None):
+    return create_analyst_workflow(list(selected_analysts) if selected_analysts is not None else None).compile()
+
+
+@lru_cache(maxsize=None)
+def _compiled_decisions():
+    return create_decision_workflow().compile()
+
+
+def _initial_state(tickers, start_date, end_date, portfolio, analyst_signals, show_reasoning, model_name, model_provider) -> Dict[str, Any]:
+    return {
+        "messages": [HumanMessage(content="Make trading decisions based on the provided data.")],
+        "data": {
+            "tickers": tickers,
+            "portfolio": portfolio,
+            "start_date": start_date,
+            "end_date": end_date,
+            "analyst_signals": analyst_signals,
+        },
+        "metadata": {
+            "show_reasoning": show_reasoning,
+            "model_name": model_name,
+            "model_provider": model_provider,
+        },
+    }
+
+
+def run_analysts(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    selected_analysts: List[str] | None = None,
+    model_name: str = "gpt-4.1",
+    model_provider: str = "OpenAI",
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run only the analyst agents and return their signals ({agent_id: {ticker: signal}}).
+
+    Analysts never read the portfolio, so this is safe to call for many
+    (day, ticker) pairs concurrently; thread-safe, no progress display.
+    """
+    agent = _compiled_analysts(tuple(selected_analysts) if selected_analysts is not None else None)
+    final_state = agent.invoke(_initial_state(tickers, start_date, end_date, {}, {}, False, model_name, model_provider))
+    return final_state["data"]["analyst_signals"]
+
+
+def run_decisions(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    portfolio: Dict[str, Any],
+    analyst_signals: Dict[str, Dict[str, Any]],
+    show_reasoning: bool = False,
+    model_name: str = "gpt-4.1",
+    model_provider: str = "OpenAI",
+) -> Dict[str, Any]:
+    """
+    Run risk management and the portfolio manager over precomputed analyst signals.
+
+    Returns the same shape as run_hedge_fund; the risk manager's output is
+    added to a copy of analyst_signals, so the stored signals stay untouched.
+    """
+    agent = _compiled_decisions()
+    final_state = agent.invoke(_initial_state(tickers, start_date, end_date, portfolio, dict(analyst_signals), show_reasoning, model_name, model_provider))
+    return {
+        "decisions": parse_hedge_fund_response(final_state["messages"][-1].content),
+        "analyst_signals": final_state["data"]["analyst_signals"],
+    }
+
+
 def run_hedge_fund(
     tickers: List[str],
     start_date: str,
@@ -99,23 +203,11 @@ def run_hedge_fund(
     try:
         trading_workflow = create_workflow(selected_analysts)
         agent = trading_workflow.compile()
-        final_state = agent.invoke(
-            {
-                "messages": [HumanMessage(content="Make trading decisions based on the provided data.")],
-                "data": {
-                    "tickers": tickers,
-                    "portfolio": portfolio,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "analyst_signals": {},
-                },
-                "metadata": {
-                    "show_reasoning": show_reasoning,
-                    "model_name": model_name,
-                    "model_provider": model_provider,
-                },
-            }
-        )
+        # One union line-item fetch per period instead of one per agent per ticker
+        analyst_keys = [key for key, (node_name, _) in get_analyst_nodes().items() if node_name in trading_workflow.nodes]
+        prefetch_line_items(tickers, end_date, analyst_keys)
+        prefetch_market_caps(tickers, end_date)
+        final_state = agent.invoke(_initial_state(tickers, start_date, end_date, portfolio, {}, show_reasoning, model_name, model_provider))
         return {
             "decisions": parse_hedge_fund_response(final_state["messages"][-1].content),
             "analyst_signals": final_state["data"]["analyst_signals"],
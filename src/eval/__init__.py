@@ -1 +1,2 @@
 from .splitters import PurgedKFold
+from .metrics import StreamingMetrics
@@ -0,0 +1,80 @@
+import math
+
+import pandas as pd
+
+
+class _Moments:
+    """Welford running mean and sample variance (ddof=1, like pandas .std())."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x: float):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else math.nan
+
+
+class StreamingMetrics:
+    """
+    Sharpe, Sortino and max drawdown of a portfolio value series, updated in O(1) per day.
+
+    Feed it every portfolio value in order; snapshot() matches recomputing
+    pct_change, mean/std of excess returns, the std of the negative excess
+    returns and the cummax drawdown over the whole series with pandas.
+    """
+
+    def __init__(self, annual_risk_free_rate: float = 0.0434, periods_per_year: int = 252):
+        self.daily_risk_free_rate = annual_risk_free_rate / periods_per_year
+        self.annualization = math.sqrt(periods_per_year)
+        self.excess = _Moments()
+        self.downside = _Moments()
+        self.previous_value: float | None = None
+        self.peak = -math.inf
+        self.max_drawdown = math.inf
+        self.max_drawdown_date = None
+
+    def update(self, date, value: float):
+        value = float(value)
+        if math.isnan(value):
+            return
+        if self.previous_value:
+            excess_return = value / self.previous_value - 1 - self.daily_risk_free_rate
+            self.excess.add(excess_return)
+            if excess_return < 0:
+                self.downside.add(excess_return)
+        self.previous_value = value
+
+        self.peak = max(self.peak, value)
+        drawdown = (value - self.peak) / self.peak
+        # Strictly lower only, so ties keep the earliest date like idxmin()
+        if drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+            self.max_drawdown_date = date
+
+    def snapshot(self) -> dict[str, float | str | None]:
+        """Current metrics, or {} until there are at least two returns."""
+        if self.excess.n < 2:
+            return {}
+        mean, std = self.excess.mean, self.excess.std
+        sharpe = self.annualization * (mean / std) if std > 1e-12 else 0.0
+        downside_std = self.downside.std
+        if downside_std > 1e-12:
+            sortino = self.annualization * (mean / downside_std)
+        else:
+            sortino = math.inf if mean > 0 else 0
+        return {
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "max_drawdown": self.max_drawdown * 100,
+            "max_drawdown_date": pd.Timestamp(self.max_drawdown_date).strftime("%Y-%m-%d") if self.max_drawdown < 0 else None,
+        }
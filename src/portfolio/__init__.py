@@ -0,0 +1 @@
+from .ledger import PortfolioLedger
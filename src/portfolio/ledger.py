@@ -0,0 +1,183 @@
+import numpy as np
+
+HOLD, BUY, SELL, SHORT, COVER = range(5)
+ACTIONS = {"hold": HOLD, "buy": BUY, "sell": SELL, "short": SHORT, "cover": COVER}
+
+
+class PortfolioLedger:
+    """
+    Long/short portfolio accounting shared by the CLI and backend backtesters.
+
+    Positions, cost bases, per-ticker short margin and realized gains are
+    NumPy arrays indexed like `tickers`; cash and total margin are scalars.
+    A day's orders are applied as one batch and valuations are dot products,
+    so the per-day cost stays flat as the universe grows.
+
+    Trades fill in ticker order against the cash left by the trades before
+    them, exactly as executing them one at a time would: buys and shorts
+    that cannot be afforded in full are cut to the largest affordable whole
+    number of shares, sells and covers are capped at the open position.
+    """
+
+    def __init__(self, tickers: list[str], cash: float, margin_requirement: float = 0.0):
+        n = len(tickers)
+        self.tickers = list(tickers)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.cash = float(cash)
+        self.margin_requirement = float(margin_requirement)
+        self.margin_used = 0.0
+        self.long = np.zeros(n, dtype=np.int64)
+        self.short = np.zeros(n, dtype=np.int64)
+        self.long_cost_basis = np.zeros(n)
+        self.short_cost_basis = np.zeros(n)
+        self.short_margin_used = np.zeros(n)
+        self.realized_long = np.zeros(n)
+        self.realized_short = np.zeros(n)
+
+    @classmethod
+    def from_portfolio(cls, portfolio: dict, tickers: list[str] | None = None) -> "PortfolioLedger":
+        """Build a ledger from the nested portfolio dict the agents and API use."""
+        tickers = list(tickers if tickers is not None else portfolio["positions"])
+        ledger = cls(tickers, portfolio["cash"], portfolio.get("margin_requirement", 0.0))
+        ledger.margin_used = float(portfolio.get("margin_used", 0.0))
+        for i, ticker in enumerate(tickers):
+            position = portfolio.get("positions", {}).get(ticker, {})
+            ledger.long[i] = position.get("long", 0)
+            ledger.short[i] = position.get("short", 0)
+            ledger.long_cost_basis[i] = position.get("long_cost_basis", 0.0)
+            ledger.short_cost_basis[i] = position.get("short_cost_basis", 0.0)
+            ledger.short_margin_used[i] = position.get("short_margin_used", 0.0)
+            gains = portfolio.get("realized_gains", {}).get(ticker, {})
+            ledger.realized_long[i] = gains.get("long", 0.0)
+            ledger.realized_short[i] = gains.get("short", 0.0)
+        return ledger
+
+    def to_portfolio(self) -> dict:
+        """A fresh nested portfolio dict (what the agents are handed each day)."""
+        columns = zip(self.tickers, self.long.tolist(), self.short.tolist(), self.long_cost_basis.tolist(), self.short_cost_basis.tolist(), self.short_margin_used.tolist())
+        return {
+            "cash": self.cash,
+            "margin_requirement": self.margin_requirement,
+            "margin_used": self.margin_used,
+            "positions": {
+                ticker: {"long": long, "short": short, "long_cost_basis": long_basis, "short_cost_basis": short_basis, "short_margin_used": margin}
+                for ticker, long, short, long_basis, short_basis, margin in columns
+            },
+            "realized_gains": {
+                ticker: {"long": long, "short": short}
+                for ticker, long, short in zip(self.tickers, self.realized_long.tolist(), self.realized_short.tolist())
+            },
+        }
+
+    def prices(self, prices: dict[str, float]) -> np.ndarray:
+        """A {ticker: price} mapping as a vector in ledger order."""
+        return np.array([prices[ticker] for ticker in self.tickers], dtype=np.float64)
+
+    def orders(self, decisions: dict[str, dict]) -> tuple[np.ndarray, np.ndarray]:
+        """Action codes and whole-share quantities from the portfolio manager's decisions."""
+        actions = np.zeros(len(self.tickers), dtype=np.int8)
+        quantities = np.zeros(len(self.tickers), dtype=np.int64)
+        for ticker, decision in decisions.items():
+            i = self.index.get(ticker)
+            if i is None:
+                continue
+            quantity = decision.get("quantity", 0)
+            if quantity > 0:
+                actions[i] = ACTIONS.get(decision.get("action", "hold"), HOLD)
+                quantities[i] = int(quantity)
+        return actions, quantities
+
+    def execute(self, decisions: dict[str, dict], prices: np.ndarray) -> dict[str, int]:
+        """Apply a day's decisions; returns the shares actually traded per ticker."""
+        executed = self.apply(*self.orders(decisions), prices)
+        return dict(zip(self.tickers, executed.tolist()))
+
+    def apply(self, actions: np.ndarray, quantities: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Apply one order per ticker in a single batch; returns the executed quantities."""
+        prices = np.asarray(prices, dtype=np.float64)
+        m = self.margin_requirement
+        # Sells and covers never depend on cash, only on the open position
+        qty = np.where(actions == SELL, np.minimum(quantities, self.long), quantities)
+        qty = np.where(actions == COVER, np.minimum(qty, self.short), qty)
+        qty = np.where(actions == HOLD, 0, np.maximum(qty, 0))
+
+        covered = (actions == COVER) & (qty > 0)
+        released = np.zeros_like(prices)
+        released[covered] = qty[covered] / self.short[covered] * self.short_margin_used[covered]
+
+        # Fill in ticker order: accept every order up to the first one the
+        # running cash can't cover, shrink that one, and carry on from there
+        funded = ((actions == BUY) | (actions == SHORT)) & (qty > 0)
+        start = 0
+        while True:
+            delta = self._cash_delta(actions, qty, prices, released)
+            cash_before = self.cash + np.concatenate(([0.0], np.cumsum(delta)[:-1]))
+            required = np.where(actions == BUY, qty * prices, qty * prices * m)
+            short_of_cash = np.flatnonzero(funded[start:] & (required[start:] > cash_before[start:]))
+            if len(short_of_cash) == 0:
+                break
+            k = start + short_of_cash[0]
+            if actions[k] == BUY:
+                qty[k] = max(int(cash_before[k] / prices[k]), 0)
+            else:
+                qty[k] = max(int(cash_before[k] / (prices[k] * m)), 0) if m > 0 else 0
+            start = k + 1
+
+        self.cash += float(delta.sum())
+        self._book(actions, qty, prices, released)
+        return qty
+
+    def _cash_delta(self, actions: np.ndarray, qty: np.ndarray, prices: np.ndarray, released: np.ndarray) -> np.ndarray:
+        """Cash change per order if it fills: shorts credit the proceeds net of the margin they lock up."""
+        notional = qty * prices
+        return np.select(
+            [actions == BUY, actions == SELL, actions == SHORT, actions == COVER],
+            [-notional, notional, notional - notional * self.margin_requirement, released - notional],
+            0.0,
+        )
+
+    def _book(self, actions: np.ndarray, qty: np.ndarray, prices: np.ndarray, released: np.ndarray):
+        """Update positions, cost bases, margin and realized gains for filled orders."""
+        filled = qty > 0
+        bought, sold = filled & (actions == BUY), filled & (actions == SELL)
+        shorted, covered = filled & (actions == SHORT), filled & (actions == COVER)
+
+        new_long = self.long[bought] + qty[bought]
+        self.long_cost_basis[bought] = (self.long_cost_basis[bought] * self.long[bought] + qty[bought] * prices[bought]) / new_long
+        self.long[bought] = new_long
+
+        self.realized_long[sold] += (prices[sold] - self.long_cost_basis[sold]) * qty[sold]
+        self.long[sold] -= qty[sold]
+        self.long_cost_basis[sold & (self.long == 0)] = 0.0
+
+        margin = qty[shorted] * prices[shorted] * self.margin_requirement
+        new_short = self.short[shorted] + qty[shorted]
+        self.short_cost_basis[shorted] = (self.short_cost_basis[shorted] * self.short[shorted] + qty[shorted] * prices[shorted]) / new_short
+        self.short[shorted] = new_short
+        self.short_margin_used[shorted] += margin
+        self.margin_used += float(margin.sum())
+
+        self.realized_short[covered] += (self.short_cost_basis[covered] - prices[covered]) * qty[covered]
+        self.short[covered] -= qty[covered]
+        self.short_margin_used[covered] -= released[covered]
+        self.margin_used -= float(released[covered].sum())
+        closed = covered & (self.short == 0)
+        self.short_cost_basis[closed] = 0.0
+        self.short_margin_used[closed] = 0.0
+
+    def long_exposure(self, prices: np.ndarray) -> float:
+        return float(self.long @ prices)
+
+    def short_exposure(self, prices: np.ndarray) -> float:
+        return float(self.short @ prices)
+
+    def value(self, prices: np.ndarray) -> float:
+        """Cash plus long market value minus short market value."""
+        return self.cash + float((self.long - self.short) @ prices)
+
+    def position_values(self, prices: np.ndarray) -> np.ndarray:
+        """Net (long - short) market value per ticker."""
+        return (self.long - self.short) * prices
+
+    def realized_gains(self) -> float:
+        return float(self.realized_long.sum() + self.realized_short.sum())
@@ -1,10 +1,18 @@
 import datetime
 import os
+import time
+from collections.abc import Generator
+from typing import NamedTuple
 import pandas as pd
 import requests
-import time
+from pydantic import BaseModel
 
 from src.data.cache import get_cache
+from src.data.price_series import PRICE_COLUMNS, PriceSeries
+from src.tools.http_archive import is_replaying
+from src.tools.http_session import get_session
+from src.tools.rate_limit import get_rate_limiter
+from src.tools.single_flight import get_single_flight
 from src.data.models import (
     CompanyNews,
     CompanyNewsResponse,
@@ -16,16 +24,134 @@ from src.data.models import (
     LineItemResponse,
     InsiderTrade,
     InsiderTradeResponse,
+    CompanyFacts,
     CompanyFactsResponse,
 )
 
 # Global cache instance
 _cache = get_cache()
 
+BASE_URL = "https://api.financialdatasets.ai"
+
+
+def _auth_headers(api_key: str = None) -> dict:
+    """Build request headers, falling back to FINANCIAL_DATASETS_API_KEY from the environment."""
+    headers = {}
+    financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
+    if financial_api_key:
+        headers["X-API-KEY"] = financial_api_key
+    return headers
+
+
+class APIError(Exception):
+    """The API answered with a non-200 status."""
+
+
+def _check_response(response, ticker: str):
+    """Raise on any non-200 response (shared by the sync and async clients)."""
+    if response.status_code != 200:
+        raise APIError(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+
+def _from_cache(model: type[BaseModel], records: list[dict]) -> list:
+    """
+    Rebuild models from cached dicts without re-running validation.
+
+    Everything in the cache was validated by the response model before it was
+    stored (and written back with model_dump), so hits go through
+    model_construct, pydantic's supported way to skip validation. Records
+    missing a declared field (e.g. written before the model gained one) still
+    go through validation.
+    """
+    fields = model.model_fields.keys()
+    # model_construct copies the record into the instance, so mutating a model never writes through to the cache
+    return [model.model_construct(**record) if fields <= record.keys() else model(**record) for record in records]
+
+
+def _prices_url(ticker: str, start_date: str, end_date: str) -> str:
+    return f"{BASE_URL}/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
+
+
+def _financial_metrics_url(ticker: str, end_date: str, period: str, limit: int) -> str:
+    return f"{BASE_URL}/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
+
+
+def _line_items_body(tickers: list[str], line_items: list[str], end_date: str, period: str, limit: int) -> dict:
+    return {
+        "tickers": tickers,
+        "line_items": line_items,
+        "end_date": end_date,
+        "period": period,
+        "limit": limit,
+    }
+
+
+def _line_items_key(ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> str:
+    """Negative-cache key for a line-item query the API answered with nothing."""
+    return f"{ticker}_{period}_{end_date}_{limit}_{','.join(sorted(line_items))}"
+
+
+def _insider_trades_url(ticker: str, end_date: str, start_date: str | None, limit: int) -> str:
+    url = f"{BASE_URL}/insider-trades/?ticker={ticker}&filing_date_lte={end_date}"
+    if start_date:
+        url += f"&filing_date_gte={start_date}"
+    return url + f"&limit={limit}"
+
+
+def _company_news_url(ticker: str, end_date: str, start_date: str | None, limit: int) -> str:
+    url = f"{BASE_URL}/news/?ticker={ticker}&end_date={end_date}"
+    if start_date:
+        url += f"&start_date={start_date}"
+    return url + f"&limit={limit}"
+
+
+def _report_periods_between(start_date: str, end_date: str, period: str = "ttm") -> int:
+    """Upper bound on how many reports of `period` can fall inside [start_date, end_date]."""
+    days = (datetime.date.fromisoformat(end_date) - datetime.date.fromisoformat(start_date)).days
+    period_days = 365 if period == "annual" else 91
+    return max(0, days) // period_days + 1
+
+
+def _next_page_end_date(page_dates: list[str], start_date: str | None, limit: int) -> str | None:
+    """
+    Return the end date for the next page of a date-paginated endpoint, or None when done.
+
+    Pagination only continues if we have a start_date and got a full page; the
+    next page ends at the oldest date of the current one.
+    """
+    if not page_dates or not start_date or len(page_dates) < limit:
+        return None
+    next_end_date = min(page_dates).split("T")[0]
+    # If we've reached or passed the start_date, we can stop
+    if next_end_date <= start_date:
+        return None
+    return next_end_date
+
+
+# URL path prefix -> cache namespace, for upstream latency metrics
+ENDPOINT_NAMESPACES = {
+    "/prices/": "prices",
+    "/financial-metrics/": "financial_metrics",
+    "/financials/search/line-items": "line_items",
+    "/insider-trades/": "insider_trades",
+    "/news/": "company_news",
+    "/company/facts/": "company_facts",
+}
+
+
+def _endpoint_namespace(url: str) -> str:
+    path = url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+    return next((namespace for prefix, namespace in ENDPOINT_NAMESPACES.items() if path.startswith(prefix)), "other")
+
 
 def _make_api_request(url: str, headers: dict, method: str = "GET", json_data: dict = None, max_retries: int = 3) -> requests.Response:
     """
-    Make an API request with rate limiting handling and moderate backoff.
+    Make an API request paced by the shared token-bucket rate limiter.
+
+    Requests go through the shared pooled session, so repeated calls reuse
+    keep-alive connections instead of paying a TCP+TLS handshake each time.
+    A 429 pauses the shared bucket for the server's Retry-After (or a jittered
+    exponential backoff), and the retry waits that out in acquire().
     
     Args:
         url: The URL to request
@@ -40,53 +166,107 @@ def _make_api_request(url: str, headers: dict, method: str = "GET", json_data: d
     Raises:
         Exception: If the request fails with a non-429 error
     """
+    session = get_session()
+    limiter = get_rate_limiter()
+    # Replayed responses never reach the API, so they aren't paced
+    paced = not is_replaying()
     for attempt in range(max_retries + 1):  # +1 for initial attempt
+        if paced:
+            limiter.acquire()
+        # Latency is measured after the rate limiter so it reflects the upstream only
+        started = time.perf_counter()
         if method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=json_data)
+            response = session.post(url, headers=headers, json=json_data)
         else:
-            response = requests.get(url, headers=headers)
-        
+            response = session.get(url, headers=headers)
+        _cache.metrics.observe_latency(_endpoint_namespace(url), time.perf_counter() - started)
+
+        delay = limiter.observe(response, attempt)
         if response.status_code == 429 and attempt < max_retries:
-            # Linear backoff: 60s, 90s, 120s, 150s...
-            delay = 60 + (30 * attempt)
-            print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Waiting {delay}s before retrying...")
-            time.sleep(delay)
+            print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Backing off {delay:.1f}s before retrying...")
             continue
         
         # Return the response (whether success, other errors, or final 429)
         return response
 
 
-def get_prices(ticker: str, start_date: str, end_date: str, api_key: str = None) -> list[Price]:
-    """Fetch price data from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date}_{end_date}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_prices(cache_key):
-        return [Price(**price) for price in cached_data]
+class _Request(NamedTuple):
+    """One HTTP call a fetch plan needs; the driver performs it and sends back the response."""
 
-    # If not in cache, fetch from API
-    headers = {}
-    financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
-    if financial_api_key:
-        headers["X-API-KEY"] = financial_api_key
+    url: str
+    method: str = "GET"
+    json_data: dict | None = None
 
-    url = f"https://api.financialdatasets.ai/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-    response = _make_api_request(url, headers)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+class _Flight(NamedTuple):
+    """A sub-plan that concurrent callers with the same key run only once (see single_flight)."""
+
+    key: tuple
+    plan: Generator
+
+
+def _run_plan(plan: Generator, api_key: str = None):
+    """
+    Drive a fetch plan with blocking requests and return its result.
+
+    Plans are generators holding an endpoint's cache lookups, URL building,
+    pagination and error handling; they yield a _Request for each call they
+    need and are sent its response. AsyncDataClient.run_plan drives the same
+    plans with non-blocking requests, so the two front ends cannot drift.
+    """
+    headers = _auth_headers(api_key)
+    reply = None
+    while True:
+        try:
+            step = plan.send(reply)
+        except StopIteration as done:
+            return done.value
+        if isinstance(step, _Flight):
+            reply = get_single_flight().do(step.key, lambda: _run_plan(step.plan, api_key))
+        else:
+            reply = _make_api_request(step.url, headers, method=step.method, json_data=step.json_data)
+
+
+def _fill_price_gap(ticker: str, start_date: str, end_date: str) -> Generator:
+    """Fetch one price window from the API into the per-ticker store."""
+    # The leader of an earlier flight may have filled it between our lookup and this one
+    if not _cache.get_missing_price_windows(ticker, start_date, end_date, record=False):
+        return
+    response = yield _Request(_prices_url(ticker, start_date, end_date))
+    _check_response(response, ticker)
 
     # Parse response with Pydantic model
     price_response = PriceResponse(**response.json())
-    prices = price_response.prices
+    _cache.merge_prices(ticker, [p.model_dump() for p in price_response.prices], start_date, end_date)
+
+
+def _prices_plan(ticker: str, start_date: str, end_date: str) -> Generator:
+    # The per-ticker store answers any window it already covers; only the
+    # uncovered edges (e.g. days after a one-year prefetch) go to the network
+    for gap_start, gap_end in _cache.get_missing_price_windows(ticker, start_date, end_date):
+        # Concurrent callers missing the same window share one request
+        yield _Flight(("prices", ticker, gap_start, gap_end), _fill_price_gap(ticker, gap_start, gap_end))
+
+    return _cache.get_price_window(ticker, start_date, end_date)
+
+
+def get_prices(ticker: str, start_date: str, end_date: str, api_key: str = None) -> PriceSeries:
+    """Fetch price data from cache or API as a columnar PriceSeries (a lazy Sequence[Price])."""
+    return _run_plan(_prices_plan(ticker, start_date, end_date), api_key)
+
 
-    if not prices:
+def _financial_metrics_plan(ticker: str, end_date: str, period: str, limit: int) -> Generator:
+    # Any end_date / limit inside a window already fetched is a slice, so a
+    # backtest walking day by day doesn't call the API again
+    if cached_data := _cache.get_fundamentals(ticker, period, end_date, limit):
+        return _from_cache(FinancialMetrics, cached_data)
+    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
+    # The API recently had nothing for this query; skip it until the negative entry expires
+    if _cache.is_known_empty("financial_metrics", cache_key):
         return []
 
-    # Cache the results using the comprehensive cache key
-    _cache.set_prices(cache_key, [p.model_dump() for p in prices])
-    return prices
+    # If not in cache, fetch from API; concurrent callers for the same key share one request
+    return (yield _Flight(("financial_metrics", cache_key), _fetch_financial_metrics(ticker, end_date, period, limit, cache_key)))
 
 
 def get_financial_metrics(
@@ -96,37 +276,49 @@ def get_financial_metrics(
     limit: int = 10,
     api_key: str = None,
 ) -> list[FinancialMetrics]:
-    """Fetch financial metrics from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_financial_metrics(cache_key):
-        return [FinancialMetrics(**metric) for metric in cached_data]
+    """Fetch financial metrics from the point-in-time store or API."""
+    return _run_plan(_financial_metrics_plan(ticker, end_date, period, limit), api_key)
 
-    # If not in cache, fetch from API
-    headers = {}
-    financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
-    if financial_api_key:
-        headers["X-API-KEY"] = financial_api_key
 
-    url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-    response = _make_api_request(url, headers)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+def _fetch_financial_metrics(ticker: str, end_date: str, period: str, limit: int, cache_key: str) -> Generator:
+    """Fetch one as-of page of financial metrics; empty answers go to the negative cache."""
+    # Re-check as the leader: a flight that just finished may have stored the answer
+    if cached_data := _cache.get_fundamentals(ticker, period, end_date, limit, record=False):
+        return _from_cache(FinancialMetrics, cached_data)
+    if _cache.is_known_empty("financial_metrics", cache_key):
+        return []
+    response = yield _Request(_financial_metrics_url(ticker, end_date, period, limit))
+    _check_response(response, ticker)
 
     # Parse response with Pydantic model
     metrics_response = FinancialMetricsResponse(**response.json())
     financial_metrics = metrics_response.financial_metrics
 
     if not financial_metrics:
+        _cache.set_empty("financial_metrics", cache_key)
         return []
 
-    # Cache the results as dicts using the comprehensive cache key
-    _cache.set_financial_metrics(cache_key, [m.model_dump() for m in financial_metrics])
+    # Merge into the point-in-time store; the window it covers serves later as-of queries
+    _cache.merge_fundamentals(ticker, period, end_date, limit, [m.model_dump() for m in financial_metrics])
     return financial_metrics
 
 
+def _line_items_plan(ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> Generator:
+    cached_data, _ = _cache.get_line_items(ticker, period, end_date, limit, line_items)
+    if cached_data is not None:
+        return [LineItem(**item) for item in cached_data]
+    if _cache.is_known_empty("line_items", _line_items_key(ticker, line_items, end_date, period, limit)):
+        return []
+
+    # If not in cache or only some fields are, fetch the missing fields from API
+    key = ("line_items", ticker, period, end_date, limit, tuple(line_items))
+    if not (yield _Flight(key, _fetch_line_items(ticker, line_items, end_date, period, limit))):
+        return []
+
+    cached_data, _ = _cache.get_line_items(ticker, period, end_date, limit, line_items)
+    return [LineItem(**item) for item in cached_data]
+
+
 def search_line_items(
     ticker: str,
     line_items: list[str],
@@ -135,157 +327,179 @@ def search_line_items(
     limit: int = 10,
     api_key: str = None,
 ) -> list[LineItem]:
-    """Fetch line items from API."""
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
-    if financial_api_key:
-        headers["X-API-KEY"] = financial_api_key
-
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
-
-    body = {
-        "tickers": [ticker],
-        "line_items": line_items,
-        "end_date": end_date,
-        "period": period,
-        "limit": limit,
-    }
-    response = _make_api_request(url, headers, method="POST", json_data=body)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+    """Fetch line items from cache or API, fetching only fields not cached yet."""
+    return _run_plan(_line_items_plan(ticker, line_items, end_date, period, limit), api_key)
+
+
+def _fetch_line_items(ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> Generator:
+    """Fetch the fields of line_items not cached yet; False when the API has nothing for this query."""
+    # Re-check as the leader: a flight that just finished may have fetched some or all of them
+    cached_data, missing_line_items = _cache.get_line_items(ticker, period, end_date, limit, line_items, record=False)
+    if cached_data is not None:
+        return True
+    if _cache.is_known_empty("line_items", _line_items_key(ticker, line_items, end_date, period, limit)):
+        return False
+    body = _line_items_body([ticker], missing_line_items, end_date, period, limit)
+    response = yield _Request(f"{BASE_URL}/financials/search/line-items", method="POST", json_data=body)
+    _check_response(response, ticker)
     data = response.json()
     response_model = LineItemResponse(**data)
-    search_results = response_model.search_results
-    if not search_results:
-        return []
+    search_results = response_model.search_results[:limit]
+    if not search_results and len(missing_line_items) == len(line_items):
+        _cache.set_empty("line_items", _line_items_key(ticker, line_items, end_date, period, limit))
+        return False
 
-    # Cache the results
-    return search_results[:limit]
+    # Cache the results, merged field-by-field into what we already had
+    _cache.set_line_items(ticker, period, end_date, limit, missing_line_items, [item.model_dump() for item in search_results])
+    return True
 
 
-def get_insider_trades(
-    ticker: str,
+def search_line_items_bulk(
+    tickers: list[str],
+    line_items: list[str],
     end_date: str,
-    start_date: str | None = None,
-    limit: int = 1000,
+    period: str = "ttm",
+    limit: int = 10,
     api_key: str = None,
-) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_insider_trades(cache_key):
-        return [InsiderTrade(**trade) for trade in cached_data]
+) -> dict[str, list[LineItem]]:
+    """
+    Fetch the same line items for many tickers in one request and cache them per ticker.
 
-    # If not in cache, fetch from API
-    headers = {}
-    financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
-    if financial_api_key:
-        headers["X-API-KEY"] = financial_api_key
+    Tickers whose fields are already cached are skipped; the rest share a single
+    POST using the endpoint's multi-ticker body, asking only for the union of
+    their missing fields. The endpoint applies limit per ticker, as it does for
+    a single-ticker body. Later search_line_items calls for any subset of
+    line_items (and any limit up to this one) are then served from the cache.
+    """
+    missing_by_ticker = {}
+    for ticker in tickers:
+        cached_data, missing_line_items = _cache.get_line_items(ticker, period, end_date, limit, line_items)
+        if cached_data is None and not _cache.is_known_empty("line_items", _line_items_key(ticker, line_items, end_date, period, limit)):
+            missing_by_ticker[ticker] = missing_line_items
+
+    if missing_by_ticker:
+        fields = [item for item in line_items if any(item in missing for missing in missing_by_ticker.values())]
+        body = _line_items_body(list(missing_by_ticker), fields, end_date, period, limit)
+        response = _make_api_request(f"{BASE_URL}/financials/search/line-items", _auth_headers(api_key), method="POST", json_data=body)
+        _check_response(response, ",".join(missing_by_ticker))
+        search_results = LineItemResponse(**response.json()).search_results
+
+        results_by_ticker = {ticker: [] for ticker in missing_by_ticker}
+        for item in search_results:
+            if item.ticker in results_by_ticker:
+                results_by_ticker[item.ticker].append(item.model_dump())
+        for ticker, results in results_by_ticker.items():
+            # Same rule as _fetch_line_items: nothing at all is a negative entry, not a stored answer
+            if not results and len(missing_by_ticker[ticker]) == len(line_items):
+                _cache.set_empty("line_items", _line_items_key(ticker, line_items, end_date, period, limit))
+                continue
+            results = sorted(results, key=lambda item: item["report_period"], reverse=True)[:limit]
+            _cache.set_line_items(ticker, period, end_date, limit, fields, results)
+
+    results = {}
+    for ticker in tickers:
+        cached_data, _ = _cache.get_line_items(ticker, period, end_date, limit, line_items)
+        results[ticker] = [LineItem(**item) for item in cached_data or []]
+    return results
+
+
+def _fill_events(namespace: str, fetch_pages, ticker: str, end_date: str, start_date: str | None, limit: int) -> Generator:
+    """
+    Bring the per-ticker event store up to date for one query and return its answer.
 
+    When the store already covers the history, only the delta after its
+    high-water mark is fetched (one small request when the end date rolls
+    forward a day); otherwise the query is fetched in full and merged.
+    """
+    # Re-check as the leader: a flight that just finished may have covered the query
+    if (cached_data := _cache.get_events(namespace, ticker, start_date, end_date, limit, record=False)) is not None:
+        return cached_data
+    if delta_start := _cache.get_event_delta_start(namespace, ticker, start_date, end_date):
+        _cache.merge_events(namespace, ticker, (yield from fetch_pages(ticker, end_date, delta_start, limit)), delta_start, end_date, limit)
+        # Answer from what was just fetched even where coverage stops short of end_date (today)
+        if (cached_data := _cache.get_events(namespace, ticker, start_date, end_date, limit, fetched_through=end_date)) is not None:
+            return cached_data
+
+    data = yield from fetch_pages(ticker, end_date, start_date, limit)
+    _cache.merge_events(namespace, ticker, data, start_date, end_date, limit)
+    cached_data = _cache.get_events(namespace, ticker, start_date, end_date, limit, fetched_through=end_date)
+    # An old window disjoint from the covered one is returned as fetched
+    return data if cached_data is None else cached_data
+
+
+def _events_plan(namespace: str, model: type[BaseModel], fetch_pages, ticker: str, end_date: str, start_date: str | None, limit: int) -> Generator:
+    cached_data = _cache.get_events(namespace, ticker, start_date, end_date, limit)
+    if cached_data is None:
+        # Concurrent callers for the same query share one fetch
+        cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
+        cached_data = yield _Flight((namespace, cache_key), _fill_events(namespace, fetch_pages, ticker, end_date, start_date, limit))
+    return _from_cache(model, cached_data)
+
+
+def _fetch_insider_trades_page(ticker: str, end_date: str, start_date: str | None, limit: int) -> Generator:
+    """Fetch one page of insider trades (the latest `limit` filed on or before end_date)."""
+    response = yield _Request(_insider_trades_url(ticker, end_date, start_date, limit))
+    _check_response(response, ticker)
+    return InsiderTradeResponse(**response.json()).insider_trades
+
+
+def _fetch_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int) -> Generator:
+    """Fetch every page of insider trades for one query."""
     all_trades = []
     current_end_date = end_date
 
-    while True:
-        url = f"https://api.financialdatasets.ai/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
-        if start_date:
-            url += f"&filing_date_gte={start_date}"
-        url += f"&limit={limit}"
-
-        response = _make_api_request(url, headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-
-        data = response.json()
-        response_model = InsiderTradeResponse(**data)
-        insider_trades = response_model.insider_trades
-
-        if not insider_trades:
-            break
-
+    while current_end_date:
+        insider_trades = yield from _fetch_insider_trades_page(ticker, current_end_date, start_date, limit)
         all_trades.extend(insider_trades)
 
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(insider_trades) < limit:
-            break
-
-        # Update end_date to the oldest filing date from current batch for next iteration
-        current_end_date = min(trade.filing_date for trade in insider_trades).split("T")[0]
-
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
+        # Continue from the oldest filing date of this page, if pagination applies
+        current_end_date = _next_page_end_date([trade.filing_date for trade in insider_trades], start_date, limit)
 
-    if not all_trades:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_insider_trades(cache_key, [trade.model_dump() for trade in all_trades])
-    return all_trades
+    return [trade.model_dump() for trade in all_trades]
 
 
-def get_company_news(
+def get_insider_trades(
     ticker: str,
     end_date: str,
     start_date: str | None = None,
     limit: int = 1000,
     api_key: str = None,
-) -> list[CompanyNews]:
-    """Fetch company news from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_company_news(cache_key):
-        return [CompanyNews(**news) for news in cached_data]
-
-    # If not in cache, fetch from API
-    headers = {}
-    financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
-    if financial_api_key:
-        headers["X-API-KEY"] = financial_api_key
-
-    all_news = []
-    current_end_date = end_date
+) -> list[InsiderTrade]:
+    """Fetch insider trades from the per-ticker event store, fetching only what it doesn't cover."""
+    return _run_plan(_events_plan("insider_trades", InsiderTrade, _fetch_insider_trades, ticker, end_date, start_date, limit), api_key)
 
-    while True:
-        url = f"https://api.financialdatasets.ai/news/?ticker={ticker}&end_date={current_end_date}"
-        if start_date:
-            url += f"&start_date={start_date}"
-        url += f"&limit={limit}"
 
-        response = _make_api_request(url, headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+def _fetch_company_news_page(ticker: str, end_date: str, start_date: str | None, limit: int) -> Generator:
+    """Fetch one page of company news (the latest `limit` published on or before end_date)."""
+    response = yield _Request(_company_news_url(ticker, end_date, start_date, limit))
+    _check_response(response, ticker)
+    return CompanyNewsResponse(**response.json()).news
 
-        data = response.json()
-        response_model = CompanyNewsResponse(**data)
-        company_news = response_model.news
 
-        if not company_news:
-            break
+def _fetch_company_news(ticker: str, end_date: str, start_date: str | None, limit: int) -> Generator:
+    """Fetch every page of company news for one query."""
+    all_news = []
+    current_end_date = end_date
 
+    while current_end_date:
+        company_news = yield from _fetch_company_news_page(ticker, current_end_date, start_date, limit)
         all_news.extend(company_news)
 
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(company_news) < limit:
-            break
+        # Continue from the oldest date of this page, if pagination applies
+        current_end_date = _next_page_end_date([news.date for news in company_news], start_date, limit)
 
-        # Update end_date to the oldest date from current batch for next iteration
-        current_end_date = min(news.date for news in company_news).split("T")[0]
+    return [news.model_dump() for news in all_news]
 
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
 
-    if not all_news:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_company_news(cache_key, [news.model_dump() for news in all_news])
-    return all_news
+def get_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+    api_key: str = None,
+) -> list[CompanyNews]:
+    """Fetch company news from the per-ticker event store, fetching only what it doesn't cover."""
+    return _run_plan(_events_plan("company_news", CompanyNews, _fetch_company_news, ticker, end_date, start_date, limit), api_key)
 
 
 def get_market_cap(
@@ -294,23 +508,11 @@ def get_market_cap(
     api_key: str = None,
 ) -> float | None:
     """Fetch market cap from the API."""
-    # Check if end_date is today
-    if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
+    # Check if end_date is today (the recording day when replaying an HTTP archive)
+    if end_date == _cache.today().isoformat():
         # Get the market cap from company facts API
-        headers = {}
-        financial_api_key = api_key or os.environ.get("FINANCIAL_DATASETS_API_KEY")
-        if financial_api_key:
-            headers["X-API-KEY"] = financial_api_key
-
-        url = f"https://api.financialdatasets.ai/company/facts/?ticker={ticker}"
-        response = _make_api_request(url, headers)
-        if response.status_code != 200:
-            print(f"Error fetching company facts: {ticker} - {response.status_code}")
-            return None
-
-        data = response.json()
-        response_model = CompanyFactsResponse(**data)
-        return response_model.company_facts.market_cap
+        company_facts = get_company_facts(ticker, api_key=api_key)
+        return company_facts.market_cap if company_facts else None
 
     financial_metrics = get_financial_metrics(ticker, end_date, api_key=api_key)
     if not financial_metrics:
@@ -324,8 +526,47 @@ def get_market_cap(
     return market_cap
 
 
-def prices_to_df(prices: list[Price]) -> pd.DataFrame:
+def _company_facts_url(ticker: str) -> str:
+    return f"{BASE_URL}/company/facts/?ticker={ticker}"
+
+
+def _company_facts_plan(ticker: str) -> Generator:
+    if cached_data := _cache.get_company_facts(ticker):
+        return _from_cache(CompanyFacts, [cached_data])[0]
+
+    # Concurrent callers for the same ticker share one request
+    return (yield _Flight(("company_facts", ticker), _fetch_company_facts(ticker)))
+
+
+def get_company_facts(ticker: str, api_key: str = None) -> CompanyFacts | None:
+    """Fetch company facts, cached for data.company_facts_ttl seconds."""
+    return _run_plan(_company_facts_plan(ticker), api_key)
+
+
+def _fetch_company_facts(ticker: str) -> Generator:
+    # Re-check as the leader: a flight that just finished may have stored fresh facts
+    if cached_data := _cache.get_company_facts(ticker, record=False):
+        return _from_cache(CompanyFacts, [cached_data])[0]
+    response = yield _Request(_company_facts_url(ticker))
+    if response.status_code != 200:
+        print(f"Error fetching company facts: {ticker} - {response.status_code}")
+        return None
+
+    data = response.json()
+    response_model = CompanyFactsResponse(**data)
+    _cache.set_company_facts(ticker, response_model.company_facts.model_dump())
+    return response_model.company_facts
+
+
+def prices_to_df(prices: PriceSeries | list[Price]) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
+    if isinstance(prices, PriceSeries):
+        # Built from the columns without a per-bar round trip, in the same shape as the
+        # list path; the columns are copies, so callers may edit them in place
+        df = pd.DataFrame({name: getattr(prices, name) for name in PRICE_COLUMNS}, copy=True)
+        df["time"] = prices.time_strings().astype(object)
+        df.index = pd.to_datetime(prices.time, utc=True).rename("Date")
+        return df
     df = pd.DataFrame([p.model_dump() for p in prices])
     df["Date"] = pd.to_datetime(df["time"])
     df.set_index("Date", inplace=True)
@@ -0,0 +1,193 @@
+"""
+Asyncio client for the financialdatasets.ai endpoints in src/tools/api.py.
+
+The coroutines drive the same fetch plans as the synchronous fetchers (cache
+lookups, URL building, pagination, error handling and single-flight keys all
+live in api.py), so data prefetched here is served to the agents' sync calls
+without another round trip. A semaphore bounds the number of in-flight
+requests so large universes fan out within rate limits.
+"""
+
+import asyncio
+import time
+from collections.abc import Generator
+
+import httpx
+
+from src.data.models import CompanyFacts, CompanyNews, FinancialMetrics, InsiderTrade, LineItem
+from src.data.price_series import PriceSeries
+from src.tools.api import (
+    _Flight,
+    _auth_headers,
+    _cache,
+    _company_facts_plan,
+    _endpoint_namespace,
+    _events_plan,
+    _fetch_company_news,
+    _fetch_insider_trades,
+    _financial_metrics_plan,
+    _line_items_plan,
+    _prices_plan,
+    _report_periods_between,
+)
+from src.tools.http_archive import RecordReplayTransport, get_http_archive, is_replaying
+from src.tools.rate_limit import get_rate_limiter
+from src.tools.single_flight import get_single_flight
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def _default_max_concurrency() -> int:
+    from src.utils.config import load_config
+
+    try:
+        return int(load_config().get("api.max_concurrency", DEFAULT_MAX_CONCURRENCY))
+    except FileNotFoundError:
+        return DEFAULT_MAX_CONCURRENCY
+
+
+class AsyncDataClient:
+    """
+    Bounded-concurrency async client for the financial data API.
+
+    Usage:
+      async with AsyncDataClient(max_concurrency=16) as client:
+          await client.prefetch(tickers, start_date, end_date)
+    """
+
+    def __init__(self, max_concurrency: int | None = None, api_key: str = None, client: httpx.AsyncClient | None = None):
+        self.max_concurrency = max_concurrency or _default_max_concurrency()
+        self.api_key = api_key
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = client
+        self._owns_client = client is None
+
+    async def __aenter__(self) -> "AsyncDataClient":
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            transport = httpx.AsyncHTTPTransport(limits=limits)
+            if (archive := get_http_archive()) is not None:
+                transport = RecordReplayTransport(archive, transport)
+            self._client = httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(60.0, connect=5.0))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, url: str, headers: dict, method: str = "GET", json_data: dict = None, max_retries: int = 3) -> httpx.Response:
+        """Async counterpart of _make_api_request; holds a semaphore slot only while a request is in flight."""
+        limiter = get_rate_limiter()
+        paced = not is_replaying()
+        for attempt in range(max_retries + 1):
+            # Pace against the same token bucket as the sync client, without blocking other tasks
+            if paced:
+                await limiter.acquire_async()
+            async with self._semaphore:
+                started = time.perf_counter()
+                if method.upper() == "POST":
+                    response = await self._client.post(url, headers=headers, json=json_data)
+                else:
+                    response = await self._client.get(url, headers=headers)
+                _cache.metrics.observe_latency(_endpoint_namespace(url), time.perf_counter() - started)
+
+            delay = limiter.observe(response, attempt)
+            if response.status_code == 429 and attempt < max_retries:
+                print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Backing off {delay:.1f}s before retrying...")
+                continue
+
+            return response
+
+    def _headers(self, api_key: str = None) -> dict:
+        return _auth_headers(api_key or self.api_key)
+
+    async def run_plan(self, plan: Generator, api_key: str = None):
+        """Async counterpart of api._run_plan: drive a fetch plan, awaiting its requests and shared flights."""
+        headers = self._headers(api_key)
+        reply = None
+        while True:
+            try:
+                step = plan.send(reply)
+            except StopIteration as done:
+                return done.value
+            if isinstance(step, _Flight):
+                reply = await get_single_flight().do_async(step.key, lambda: self.run_plan(step.plan, api_key))
+            else:
+                reply = await self.request(step.url, headers, method=step.method, json_data=step.json_data)
+
+    async def get_prices(self, ticker: str, start_date: str, end_date: str, api_key: str = None) -> PriceSeries:
+        """Async get_prices: fetch only the uncovered edges of the window, then slice from the cache."""
+        return await self.run_plan(_prices_plan(ticker, start_date, end_date), api_key)
+
+    async def get_financial_metrics(self, ticker: str, end_date: str, period: str = "ttm", limit: int = 10, api_key: str = None) -> list[FinancialMetrics]:
+        """Async get_financial_metrics sharing the point-in-time store."""
+        return await self.run_plan(_financial_metrics_plan(ticker, end_date, period, limit), api_key)
+
+    async def search_line_items(self, ticker: str, line_items: list[str], end_date: str, period: str = "ttm", limit: int = 10, api_key: str = None) -> list[LineItem]:
+        """Async search_line_items sharing the field-level line-item cache."""
+        return await self.run_plan(_line_items_plan(ticker, line_items, end_date, period, limit), api_key)
+
+    async def get_insider_trades(self, ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000, api_key: str = None) -> list[InsiderTrade]:
+        """Async get_insider_trades sharing the per-ticker event store and pagination rule."""
+        return await self.run_plan(_events_plan("insider_trades", InsiderTrade, _fetch_insider_trades, ticker, end_date, start_date, limit), api_key)
+
+    async def get_company_news(self, ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000, api_key: str = None) -> list[CompanyNews]:
+        """Async get_company_news sharing the per-ticker event store and pagination rule."""
+        return await self.run_plan(_events_plan("company_news", CompanyNews, _fetch_company_news, ticker, end_date, start_date, limit), api_key)
+
+    async def get_company_facts(self, ticker: str, api_key: str = None) -> CompanyFacts | None:
+        """Async get_company_facts sharing the TTL'd facts cache; None when the API has no facts."""
+        return await self.run_plan(_company_facts_plan(ticker), api_key)
+
+    async def prefetch_company_facts(self, tickers: list[str], api_key: str = None) -> dict[str, Exception]:
+        """Warm the company-facts cache for every ticker concurrently; returns a ticker -> exception map."""
+        results = await asyncio.gather(*(self.get_company_facts(ticker, api_key=api_key) for ticker in tickers), return_exceptions=True)
+        return {ticker: result for ticker, result in zip(tickers, results) if isinstance(result, Exception)}
+
+    async def prefetch(self, tickers: list[str], price_start_date: str, end_date: str, start_date: str | None = None, api_key: str = None) -> dict[str, Exception]:
+        """
+        Warm the cache for every ticker concurrently with the same calls the backtesters make.
+
+        Returns a ticker -> exception map for fetches that failed, so one bad
+        ticker does not abort the whole universe.
+        """
+
+        async def _prefetch_ticker(ticker: str):
+            await asyncio.gather(
+                self.get_prices(ticker, price_start_date, end_date, api_key=api_key),
+                # Deep enough that every backtest day's "last 10 as of D" is a slice of one fetch per period
+                *(
+                    self.get_financial_metrics(ticker, end_date, period=period, limit=10 + _report_periods_between(start_date or price_start_date, end_date, period), api_key=api_key)
+                    for period in ("ttm", "annual")
+                ),
+                self.get_insider_trades(ticker, end_date, start_date=start_date, limit=1000, api_key=api_key),
+                self.get_company_news(ticker, end_date, start_date=start_date, limit=1000, api_key=api_key),
+            )
+
+        results = await asyncio.gather(*(_prefetch_ticker(ticker) for ticker in tickers), return_exceptions=True)
+        return {ticker: result for ticker, result in zip(tickers, results) if isinstance(result, Exception)}
+
+
+async def prefetch_async(tickers: list[str], price_start_date: str, end_date: str, start_date: str | None = None, api_key: str = None, max_concurrency: int | None = None) -> dict[str, Exception]:
+    """Prefetch a ticker universe from inside a running event loop."""
+    async with AsyncDataClient(max_concurrency=max_concurrency, api_key=api_key) as client:
+        return await client.prefetch(tickers, price_start_date, end_date, start_date=start_date)
+
+
+def prefetch_company_facts(tickers: list[str], api_key: str = None, max_concurrency: int | None = None) -> dict[str, Exception]:
+    """Blocking bulk facts prefetch, so a live run hits /company/facts/ at most once per ticker per TTL."""
+
+    async def _run():
+        async with AsyncDataClient(max_concurrency=max_concurrency, api_key=api_key) as client:
+            return await client.prefetch_company_facts(tickers)
+
+    return asyncio.run(_run())
+
+
+def prefetch(tickers: list[str], price_start_date: str, end_date: str, start_date: str | None = None, api_key: str = None, max_concurrency: int | None = None) -> dict[str, Exception]:
+    """Blocking entry point for synchronous callers such as the CLI backtester."""
+    return asyncio.run(prefetch_async(tickers, price_start_date, end_date, start_date=start_date, api_key=api_key, max_concurrency=max_concurrency))
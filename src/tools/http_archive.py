@@ -0,0 +1,233 @@
+"""
+Record/replay archive for the data API's HTTP traffic.
+
+In "record" mode every successful request made through the pooled requests
+session or the async httpx client is also written to an archive directory.
+In "replay" mode the same requests are answered from that archive without
+touching the network (or the rate limiter), so whole pipelines can run
+offline in CI with reproducible timings.
+
+Entries are keyed by method, URL (query parameters sorted) and JSON body;
+headers, and so API keys, are not part of the key and are never stored.
+Each entry is one gzipped JSON file named by the key's hash, written
+atomically, so several processes can record into one directory.
+
+Which requests a run makes also depends on the cache and the date, so while
+an archive is active the global cache is memory-only and dated to the day
+the archive was recorded (see HttpArchive.today). A replay then asks for
+exactly the recorded URLs on any machine and any day.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+MODES = ("record", "replay")
+
+# Archive-level metadata, next to the per-entry subdirectories
+MANIFEST = "manifest.json"
+
+# Response headers worth keeping; the body is stored decoded, so Content-Encoding must not be replayed
+_KEPT_HEADERS = ("content-type", "retry-after", "x-ratelimit-remaining", "x-ratelimit-reset")
+
+
+class ArchiveMiss(LookupError):
+    """Replay mode got a request that was never recorded."""
+
+
+def _canonical_url(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True))), ""))
+
+
+def _canonical_body(body: bytes | str | None) -> str:
+    if not body:
+        return ""
+    text = body.decode() if isinstance(body, bytes) else body
+    try:
+        return json.dumps(json.loads(text), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return text
+
+
+class HttpArchive:
+    """A directory of recorded request/response pairs."""
+
+    def __init__(self, path: str | os.PathLike, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP archive mode: {mode} (expected one of {MODES})")
+        self.path = Path(path)
+        self.mode = mode
+        self.recorded = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._today: date | None = None
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def today(self) -> date:
+        """
+        The day the archive was recorded on.
+
+        Recording stamps today's date into the manifest; replaying reads it
+        back (or falls back to today for an archive without one).
+        """
+        with self._lock:
+            if self._today is None:
+                self._today = self._replay_day() if self.replaying else self._stamp_day()
+            return self._today
+
+    def _replay_day(self) -> date:
+        try:
+            manifest = json.loads((self.path / MANIFEST).read_text())
+        except FileNotFoundError:
+            return date.today()
+        return date.fromisoformat(manifest["recorded_on"])
+
+    def _stamp_day(self) -> date:
+        today = date.today()
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path / f"{MANIFEST}.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps({"recorded_on": today.isoformat()}))
+        os.replace(tmp_path, self.path / MANIFEST)
+        return today
+
+    def _entry_path(self, method: str, url: str, body) -> tuple[Path, dict[str, str]]:
+        key = {"method": method.upper(), "url": _canonical_url(url), "body": _canonical_body(body)}
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+        return self.path / digest[:2] / f"{digest}.json.gz", key
+
+    def record(self, method: str, url: str, body, status_code: int, headers, content: bytes):
+        """Store a response; throttled (429) and server-error answers aren't worth replaying."""
+        if status_code == 429 or status_code >= 500:
+            return
+        entry_path, key = self._entry_path(method, url, body)
+        entry = {
+            **key,
+            "status_code": status_code,
+            "headers": {name: headers[name] for name in _KEPT_HEADERS if name in headers},
+            "content": content.decode("utf-8"),
+        }
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+        with self._lock:
+            self.recorded += 1
+
+    def lookup(self, method: str, url: str, body) -> dict[str, any]:
+        """The recorded entry for a request, or ArchiveMiss."""
+        entry_path, key = self._entry_path(method, url, body)
+        try:
+            with gzip.open(entry_path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            raise ArchiveMiss(f"No recorded response for {key['method']} {key['url']} in {self.path}") from None
+        with self._lock:
+            self.replayed += 1
+        return entry
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    """Wraps the session's adapter: replays from the archive, or sends and records."""
+
+    def __init__(self, archive: HttpArchive, adapter: HTTPAdapter):
+        super().__init__()
+        self.archive = archive
+        self.adapter = adapter
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.archive.replaying:
+            entry = self.archive.lookup(request.method, request.url, request.body)
+            response = requests.Response()
+            response.status_code = entry["status_code"]
+            response.headers = CaseInsensitiveDict(entry["headers"])
+            response._content = entry["content"].encode("utf-8")
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            return response
+        response = self.adapter.send(request, **kwargs)
+        self.archive.record(request.method, request.url, request.body, response.status_code, response.headers, response.content)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """httpx counterpart of RecordReplayAdapter for the async client."""
+
+    def __init__(self, archive: HttpArchive, transport: httpx.AsyncBaseTransport):
+        self.archive = archive
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.archive.replaying:
+            entry = self.archive.lookup(request.method, str(request.url), request.content)
+            return httpx.Response(entry["status_code"], headers=entry["headers"], content=entry["content"].encode("utf-8"), request=request)
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        # The body was decoded off the wire; hand it back without the original encoding headers
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        self.archive.record(request.method, str(request.url), request.content, response.status_code, response.headers, content)
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_archive: HttpArchive | None = None
+_archive_loaded = False
+_archive_lock = threading.Lock()
+
+
+def _load_archive() -> HttpArchive | None:
+    from src.utils.config import load_config
+
+    try:
+        cfg = load_config()
+    except FileNotFoundError:
+        cfg = None
+    mode = os.environ.get("HTTP_ARCHIVE") or (cfg.get("api.archive.mode") if cfg else None)
+    if not mode or mode == "off":
+        return None
+    path = os.environ.get("HTTP_ARCHIVE_DIR") or (cfg.get("api.archive.dir", "artifacts/http_archive") if cfg else "artifacts/http_archive")
+    return HttpArchive(path, mode)
+
+
+def get_http_archive() -> HttpArchive | None:
+    """The process-wide archive from HTTP_ARCHIVE / api.archive.mode, or None when recording is off."""
+    global _archive, _archive_loaded
+    if not _archive_loaded:
+        with _archive_lock:
+            if not _archive_loaded:
+                _archive = _load_archive()
+                _archive_loaded = True
+    return _archive
+
+
+def set_http_archive(archive: HttpArchive | None):
+    """Replace the process-wide archive (sessions built afterwards pick it up)."""
+    global _archive, _archive_loaded
+    with _archive_lock:
+        _archive = archive
+        _archive_loaded = True
+
+
+def is_replaying() -> bool:
+    archive = get_http_archive()
+    return archive is not None and archive.replaying
@@ -0,0 +1,87 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.tools.http_archive import HttpArchive, RecordReplayAdapter, get_http_archive
+
+# Defaults used when config/config.yaml has no `api:` section
+_DEFAULTS = {
+    "pool_connections": 10,
+    "pool_maxsize": 32,
+    "connect_timeout": 5.0,
+    "read_timeout": 60.0,
+}
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default (connect, read) timeout to every request."""
+
+    def __init__(self, *args, timeout: tuple[float, float] | None = None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _load_settings() -> dict[str, float]:
+    from src.utils.config import load_config
+
+    try:
+        cfg = load_config()
+    except FileNotFoundError:
+        return dict(_DEFAULTS)
+    return {name: cfg.get(f"api.{name}", default) for name, default in _DEFAULTS.items()}
+
+
+def create_session(
+    pool_connections: int = _DEFAULTS["pool_connections"],
+    pool_maxsize: int = _DEFAULTS["pool_maxsize"],
+    connect_timeout: float = _DEFAULTS["connect_timeout"],
+    read_timeout: float = _DEFAULTS["read_timeout"],
+    archive: HttpArchive | None = None,
+) -> requests.Session:
+    """
+    Build a keep-alive session whose connection pool is shared by every thread.
+
+    pool_maxsize bounds the number of sockets kept open per host, so it should be
+    at least the number of agents/threads fetching concurrently. With an
+    archive, responses are recorded to it or replayed from it.
+    """
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=int(pool_connections),
+        pool_maxsize=int(pool_maxsize),
+        timeout=(float(connect_timeout), float(read_timeout)),
+    )
+    if archive is not None:
+        adapter = RecordReplayAdapter(archive, adapter)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide pooled session, creating it from config on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session(**_load_settings(), archive=get_http_archive())
+    return _session
+
+
+def reset_session():
+    """Close the pooled session so the next get_session() rebuilds it (e.g. after a config change or fork)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from src.tools.api import get_prices
+
+
+class PricePanel:
+    """
+    Closing prices for every backtest day × ticker, loaded once before the loop.
+
+    close[i, j] is the price the backtest trades tickers[j] at on dates[i]:
+    the latest close within [dates[i] - 1 day, dates[i]], the same window the
+    per-day get_price_data calls used to read. NaN marks a day without a
+    price, which the backtest skips.
+    """
+
+    def __init__(self, dates: pd.DatetimeIndex, tickers: list[str], close: np.ndarray):
+        self.dates = dates
+        self.tickers = tickers
+        self.close = close
+
+    @classmethod
+    def load(cls, tickers: list[str], dates: pd.DatetimeIndex, api_key: str = None) -> "PricePanel":
+        """One get_prices call per ticker for the whole range (served from the prefetched cache)."""
+        close = np.full((len(dates), len(tickers)), np.nan)
+        if len(dates) == 0:
+            return cls(dates, tickers, close)
+        days = dates.values.astype("datetime64[D]")
+        start, end = str(days[0] - 1), str(days[-1])
+        for j, ticker in enumerate(tickers):
+            try:
+                series = get_prices(ticker, start, end, api_key=api_key)
+            except Exception as e:
+                print(f"Error fetching prices for {ticker} between {start} and {end}: {e}")
+                continue
+            close[:, j] = _align(series.time.view("datetime64[ns]").astype("datetime64[D]"), series.close, days)
+        return cls(dates, tickers, close)
+
+    @classmethod
+    def synthetic(cls, tickers: list[str], dates: pd.DatetimeIndex, start_date: str, end_date: str, seed: int = 42) -> "PricePanel":
+        """Random-walk prices for headless/CI runs; each day trades at the previous calendar day's price."""
+        rng = np.random.default_rng(seed)
+        index = pd.date_range(start_date, end_date, freq="B")
+        walks = np.column_stack([(100.0 + 5.0 * i) * (1 + rng.normal(0, 0.01, size=len(index))).cumprod() for i in range(len(tickers))])
+        previous_days = (dates - pd.Timedelta(days=1)).values.astype("datetime64[D]")
+        rows = index.values.astype("datetime64[D]").searchsorted(previous_days)
+        close = np.full((len(dates), len(tickers)), np.nan)
+        found = rows < len(index)
+        found[found] &= index.values.astype("datetime64[D]")[rows[found]] == previous_days[found]
+        close[found] = walks[rows[found]]
+        return cls(dates, tickers, close)
+
+    def prices_on(self, i: int) -> dict[str, float] | None:
+        """{ticker: price} for dates[i], or None if any ticker has no price that day."""
+        row = self.close[i]
+        if np.isnan(row).any():
+            return None
+        return dict(zip(self.tickers, row.tolist()))
+
+    def missing_tickers(self, i: int) -> list[str]:
+        return [ticker for ticker, price in zip(self.tickers, self.close[i]) if np.isnan(price)]
+
+
+def _align(bar_days: np.ndarray, closes: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """For each day, the close of the latest bar dated day - 1 or day (NaN if none)."""
+    aligned = np.full(len(days), np.nan)
+    latest = np.searchsorted(bar_days, days, side="right") - 1
+    valid = latest >= 0
+    valid[valid] &= bar_days[latest[valid]] >= days[valid] - 1
+    aligned[valid] = closes[latest[valid]]
+    return aligned
@@ -0,0 +1,254 @@
+"""
+Token-bucket pacing for financialdatasets.ai requests.
+
+Every request takes a token before it is sent, so bursts from parallel agents
+are smoothed out before the API starts answering 429. When it does, the
+Retry-After / X-RateLimit-Reset headers (or a jittered exponential backoff when
+neither is present) pause the whole bucket, so every thread and coroutine
+sharing it backs off together instead of each retrying on its own schedule.
+
+The bucket is process-wide by default. Setting api.rate_limit.shared_state_file
+keeps the bucket state in a locked file so several processes on one host share
+the same budget.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms fall back to a process-local bucket
+    fcntl = None
+
+_DEFAULTS = {
+    "requests_per_minute": 600,
+    "burst": 20,
+    "backoff_base": 2.0,
+    "backoff_max": 120.0,
+    "shared_state_file": None,
+}
+
+
+@dataclass
+class RateLimitStats:
+    """Counters for tuning concurrency against the API's limits."""
+
+    requests: int = 0
+    throttled_responses: int = 0
+    paced_requests: int = 0
+    paced_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+
+    @property
+    def throttled_seconds(self) -> float:
+        return self.paced_seconds + self.backoff_seconds
+
+    def as_dict(self) -> dict[str, float]:
+        return {**asdict(self), "throttled_seconds": self.throttled_seconds}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that also supports a hard pause (blocked_until)."""
+
+    def __init__(self, rate: float, capacity: float, clock=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._state = {"tokens": self.capacity, "updated": None, "blocked_until": 0.0}
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock:
+            yield self._state
+
+    def _refill(self, state: dict, now: float):
+        if state["updated"] is not None:
+            state["tokens"] = min(self.capacity, state["tokens"] + (now - state["updated"]) * self.rate)
+        state["updated"] = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before sending."""
+        with self._locked_state() as state:
+            now = self._clock()
+            self._refill(state, now)
+            state["tokens"] -= 1
+            token_wait = -state["tokens"] / self.rate if state["tokens"] < 0 else 0.0
+            return max(0.0, token_wait, state["blocked_until"] - now)
+
+    def block_for(self, seconds: float):
+        """Pause the bucket for everyone sharing it."""
+        with self._locked_state() as state:
+            state["blocked_until"] = max(state["blocked_until"], self._clock() + seconds)
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state lives in an flock-protected file shared across processes."""
+
+    def __init__(self, rate: float, capacity: float, path: str | os.PathLike):
+        super().__init__(rate, capacity, clock=time.time)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock, open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw else {"tokens": self.capacity, "updated": None, "blocked_until": 0.0}
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """X-RateLimit-Reset is commonly either an epoch timestamp or seconds until reset."""
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    # Anything that looks like an epoch timestamp is converted to a delay
+    return max(0.0, reset - time.time()) if reset > 1e9 else max(0.0, reset)
+
+
+class RateLimiter:
+    """Paces requests through a TokenBucket and turns 429 responses into shared backoff."""
+
+    def __init__(self, bucket: TokenBucket, backoff_base: float = 2.0, backoff_max: float = 120.0, sleep=None, rng: random.Random | None = None):
+        self.bucket = bucket
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = RateLimitStats()
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._stats_lock = threading.Lock()
+
+    def _record_wait(self, wait: float):
+        with self._stats_lock:
+            self.stats.requests += 1
+            if wait > 0:
+                self.stats.paced_requests += 1
+                self.stats.paced_seconds += wait
+
+    def acquire(self):
+        """Block until a token (and any active backoff) allows the next request."""
+        wait = self.bucket.reserve()
+        self._record_wait(wait)
+        if wait > 0:
+            (self._sleep or time.sleep)(wait)
+
+    async def acquire_async(self):
+        """Coroutine version of acquire() that yields to the event loop while waiting."""
+        wait = self.bucket.reserve()
+        self._record_wait(wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def backoff_delay(self, headers, attempt: int) -> float:
+        """
+        Delay before retrying a 429: server hints first, else jittered exponential backoff.
+
+        A server hint is followed as given, since retrying before it elapses only
+        draws more 429s; backoff_max caps the exponential fallback alone.
+        """
+        delay = _parse_retry_after(headers.get("Retry-After")) if headers else None
+        if delay is None and headers:
+            delay = _parse_reset(headers.get("X-RateLimit-Reset"))
+        if delay is None:
+            # "Equal jitter": half the exponential step is fixed, half is random
+            step = min(self.backoff_max, self.backoff_base * (2**attempt))
+            delay = step / 2 + self._rng.uniform(0, step / 2)
+        return delay
+
+    def observe(self, response, attempt: int = 0) -> float | None:
+        """
+        Feed a response back into the limiter.
+
+        Returns the backoff delay for a 429 (already applied to the shared bucket,
+        so the next acquire() waits it out), otherwise None.
+        """
+        headers = getattr(response, "headers", None) or {}
+        if response.status_code == 429:
+            delay = self.backoff_delay(headers, attempt)
+            self.bucket.block_for(delay)
+            with self._stats_lock:
+                self.stats.throttled_responses += 1
+                self.stats.backoff_seconds += delay
+            return delay
+
+        # Stop early if the server says the window is exhausted
+        if headers.get("X-RateLimit-Remaining") == "0":
+            reset = _parse_reset(headers.get("X-RateLimit-Reset"))
+            if reset:
+                self.bucket.block_for(reset)
+        return None
+
+
+def _load_settings() -> dict:
+    from src.utils.config import load_config
+
+    try:
+        cfg = load_config()
+    except FileNotFoundError:
+        return dict(_DEFAULTS)
+    return {name: cfg.get(f"api.rate_limit.{name}", default) for name, default in _DEFAULTS.items()}
+
+
+def create_rate_limiter(requests_per_minute: float = 600, burst: float = 20, backoff_base: float = 2.0, backoff_max: float = 120.0, shared_state_file: str | None = None) -> RateLimiter:
+    rate = float(requests_per_minute) / 60.0
+    if shared_state_file and fcntl is not None:
+        bucket = FileTokenBucket(rate, burst, shared_state_file)
+    else:
+        bucket = TokenBucket(rate, burst)
+    return RateLimiter(bucket, backoff_base=float(backoff_base), backoff_max=float(backoff_max))
+
+
+_rate_limiter: RateLimiter | None = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter, creating it from config on first use."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = create_rate_limiter(**_load_settings())
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: RateLimiter | None):
+    """Replace the process-wide limiter (None rebuilds it from config on next use)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
@@ -0,0 +1,62 @@
+"""
+Plan the data requests of a whole analyst team before the graph runs.
+
+Each fundamental analyst declares its needs as a LineItemRequest in
+ANALYST_CONFIG. Instead of every agent POSTing its own slightly different
+field list per ticker, the planner unions the fields per period, fetches them
+once for all tickers, and leaves the field-level cache to hand each agent its
+own projection when it calls search_line_items. Live runs also warm the
+company-facts cache that every agent's get_market_cap reads.
+"""
+
+import requests
+
+from src.data.cache import get_cache
+from src.data.models import LineItemRequest
+from src.tools.async_api import prefetch_company_facts
+from src.tools.api import APIError, search_line_items_bulk
+from src.utils.analysts import ANALYST_CONFIG
+
+
+def plan_line_item_requests(analyst_keys: list[str]) -> list[LineItemRequest]:
+    """
+    Merge the selected analysts' line-item needs into one request per period.
+
+    The union request uses the largest limit of its group: a cached answer for
+    N periods also serves any request for fewer, so one fetch covers them all.
+    """
+    plans: dict[str, LineItemRequest] = {}
+    for key in analyst_keys:
+        request = ANALYST_CONFIG.get(key, {}).get("line_item_request")
+        if request is None:
+            continue
+        plan = plans.get(request.period)
+        if plan is None:
+            plans[request.period] = request.model_copy(update={"line_items": list(request.line_items)})
+            continue
+        plan.line_items.extend(item for item in request.line_items if item not in plan.line_items)
+        plan.limit = max(plan.limit, request.limit)
+    return list(plans.values())
+
+
+def prefetch_line_items(tickers: list[str], end_date: str, analyst_keys: list[str], api_key: str = None):
+    """
+    Warm the line-item cache for the selected analysts.
+
+    Agents fall back to their own fetch when the API or the network fails;
+    anything else is a bug in the union request and propagates.
+    """
+    for plan in plan_line_item_requests(analyst_keys):
+        try:
+            search_line_items_bulk(tickers, plan.line_items, end_date, period=plan.period, limit=plan.limit, api_key=api_key)
+        except (APIError, requests.RequestException) as e:
+            print(f"Warning: line-item prefetch failed for {plan.period} ({e}); agents will fetch individually")
+
+
+def prefetch_market_caps(tickers: list[str], end_date: str, api_key: str = None):
+    """For live runs (end_date is today, as get_market_cap sees it) fetch every ticker's company facts in one concurrent batch."""
+    if end_date != get_cache().today().isoformat():
+        return
+    errors = prefetch_company_facts(tickers, api_key=api_key)
+    for ticker, error in errors.items():
+        print(f"Warning: company facts prefetch failed for {ticker} ({error}); agents will fetch individually")
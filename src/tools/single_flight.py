@@ -0,0 +1,137 @@
+"""
+Single-flight deduplication of identical in-flight API requests.
+
+When analyst nodes run in parallel they often miss the cache for the same key
+at the same moment. The first caller (the leader) performs the fetch; callers
+arriving with the same key while it is in flight block until it finishes and
+share its result (or its exception) instead of issuing their own request.
+"""
+
+import asyncio
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for how much duplicate network work was avoided."""
+
+    executed: int = 0
+    suppressed: int = 0
+    suppressed_by_kind: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, any]:
+        return asdict(self)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one execution."""
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._futures: dict[tuple, asyncio.Future] = {}
+
+    def _suppress(self, key: tuple):
+        self.stats.suppressed += 1
+        kind = str(key[0])
+        self.stats.suppressed_by_kind[kind] = self.stats.suppressed_by_kind.get(kind, 0) + 1
+
+    def do(self, key: tuple, fn: Callable[[], T]) -> T:
+        """
+        Run fn() once per key at a time and hand its result to every concurrent caller.
+
+        key[0] names the kind of request (e.g. "financial_metrics") for the
+        per-kind suppression counters.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats.executed += 1
+            else:
+                self._suppress(key)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Later callers start a fresh flight (and will normally hit the cache instead)
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: tuple, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Coroutine counterpart of do() for tasks sharing an event loop.
+
+        Followers await the leader's future instead of blocking a thread, so
+        the loop keeps running other fetches meanwhile. Flights are scoped to
+        the running loop because a future cannot be awaited from another one.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._futures.get((loop, key))
+            leader = future is None
+            if leader:
+                future = self._futures[(loop, key)] = loop.create_future()
+                self.stats.executed += 1
+            else:
+                self._suppress(key)
+
+        if not leader:
+            # A cancelled follower must not cancel the flight the others are waiting on
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved so a flight without followers doesn't log "never retrieved"
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._futures[(loop, key)]
+
+
+_single_flight: SingleFlight | None = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group shared by the API fetchers."""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
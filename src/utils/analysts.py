@@ -1,21 +1,21 @@
 """Constants and utilities related to analysts configuration."""
 
 from src.agents import portfolio_manager
-from src.agents.aswath_damodaran import aswath_damodaran_agent
-from src.agents.ben_graham import ben_graham_agent
-from src.agents.bill_ackman import bill_ackman_agent
-from src.agents.cathie_wood import cathie_wood_agent
-from src.agents.charlie_munger import charlie_munger_agent
+from src.agents.aswath_damodaran import LINE_ITEM_REQUEST as ASWATH_DAMODARAN_LINE_ITEMS, aswath_damodaran_agent
+from src.agents.ben_graham import LINE_ITEM_REQUEST as BEN_GRAHAM_LINE_ITEMS, ben_graham_agent
+from src.agents.bill_ackman import LINE_ITEM_REQUEST as BILL_ACKMAN_LINE_ITEMS, bill_ackman_agent
+from src.agents.cathie_wood import LINE_ITEM_REQUEST as CATHIE_WOOD_LINE_ITEMS, cathie_wood_agent
+from src.agents.charlie_munger import LINE_ITEM_REQUEST as CHARLIE_MUNGER_LINE_ITEMS, charlie_munger_agent
 from src.agents.fundamentals import fundamentals_analyst_agent
-from src.agents.michael_burry import michael_burry_agent
-from src.agents.phil_fisher import phil_fisher_agent
-from src.agents.peter_lynch import peter_lynch_agent
+from src.agents.michael_burry import LINE_ITEM_REQUEST as MICHAEL_BURRY_LINE_ITEMS, michael_burry_agent
+from src.agents.phil_fisher import LINE_ITEM_REQUEST as PHIL_FISHER_LINE_ITEMS, phil_fisher_agent
+from src.agents.peter_lynch import LINE_ITEM_REQUEST as PETER_LYNCH_LINE_ITEMS, peter_lynch_agent
 from src.agents.sentiment import sentiment_analyst_agent
-from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent
+from src.agents.stanley_druckenmiller import LINE_ITEM_REQUEST as STANLEY_DRUCKENMILLER_LINE_ITEMS, stanley_druckenmiller_agent
 from src.agents.technicals import technical_analyst_agent
-from src.agents.valuation import valuation_analyst_agent
-from src.agents.warren_buffett import warren_buffett_agent
-from src.agents.rakesh_jhunjhunwala import rakesh_jhunjhunwala_agent
+from src.agents.valuation import LINE_ITEM_REQUEST as VALUATION_LINE_ITEMS, valuation_analyst_agent
+from src.agents.warren_buffett import LINE_ITEM_REQUEST as WARREN_BUFFETT_LINE_ITEMS, warren_buffett_agent
+from src.agents.rakesh_jhunjhunwala import LINE_ITEM_REQUEST as RAKESH_JHUNJHUNWALA_LINE_ITEMS, rakesh_jhunjhunwala_agent
 
 # Define analyst configuration - single source of truth
 ANALYST_CONFIG = {
@@ -24,6 +24,7 @@ ANALYST_CONFIG = {
         "description": "The Dean of Valuation",
         "investing_style": "Focuses on intrinsic value and financial metrics to assess investment opportunities through rigorous valuation analysis.",
         "agent_func": aswath_damodaran_agent,
+        "line_item_request": ASWATH_DAMODARAN_LINE_ITEMS,
         "type": "analyst",
         "order": 0,
     },
@@ -32,6 +33,7 @@ ANALYST_CONFIG = {
         "description": "The Father of Value Investing",
         "investing_style": "Emphasizes a margin of safety and invests in undervalued companies with strong fundamentals through systematic value analysis.",
         "agent_func": ben_graham_agent,
+        "line_item_request": BEN_GRAHAM_LINE_ITEMS,
         "type": "analyst",
         "order": 1,
     },
@@ -40,6 +42,7 @@ ANALYST_CONFIG = {
         "description": "The Activist Investor",
         "investing_style": "Seeks to influence management and unlock value through strategic activism and contrarian investment positions.",
         "agent_func": bill_ackman_agent,
+        "line_item_request": BILL_ACKMAN_LINE_ITEMS,
         "type": "analyst",
         "order": 2,
     },
@@ -48,6 +51,7 @@ ANALYST_CONFIG = {
         "description": "The Queen of Growth Investing",
         "investing_style": "Focuses on disruptive innovation and growth, investing in companies that are leading technological advancements and market disruption.",
         "agent_func": cathie_wood_agent,
+        "line_item_request": CATHIE_WOOD_LINE_ITEMS,
         "type": "analyst",
         "order": 3,
     },
@@ -56,6 +60,7 @@ ANALYST_CONFIG = {
         "description": "The Rational Thinker",
         "investing_style": "Advocates for value investing with a focus on quality businesses and long-term growth through rational decision-making.",
         "agent_func": charlie_munger_agent,
+        "line_item_request": CHARLIE_MUNGER_LINE_ITEMS,
         "type": "analyst",
         "order": 4,
     },
@@ -64,6 +69,7 @@ ANALYST_CONFIG = {
         "description": "The Big Short Contrarian",
         "investing_style": "Makes contrarian bets, often shorting overvalued markets and investing in undervalued assets through deep fundamental analysis.",
         "agent_func": michael_burry_agent,
+        "line_item_request": MICHAEL_BURRY_LINE_ITEMS,
         "type": "analyst",
         "order": 5,
     },
@@ -72,6 +78,7 @@ ANALYST_CONFIG = {
         "description": "The 10-Bagger Investor",
         "investing_style": "Invests in companies with understandable business models and strong growth potential using the 'buy what you know' strategy.",
         "agent_func": peter_lynch_agent,
+        "line_item_request": PETER_LYNCH_LINE_ITEMS,
         "type": "analyst",
         "order": 6,
     },
@@ -80,6 +87,7 @@ ANALYST_CONFIG = {
         "description": "The Scuttlebutt Investor",
         "investing_style": "Emphasizes investing in companies with strong management and innovative products, focusing on long-term growth through scuttlebutt research.",
         "agent_func": phil_fisher_agent,
+        "line_item_request": PHIL_FISHER_LINE_ITEMS,
         "type": "analyst",
         "order": 7,
     },
@@ -88,6 +96,7 @@ ANALYST_CONFIG = {
         "description": "The Big Bull Of India",
         "investing_style": "Leverages macroeconomic insights to invest in high-growth sectors, particularly within emerging markets and domestic opportunities.",
         "agent_func": rakesh_jhunjhunwala_agent,
+        "line_item_request": RAKESH_JHUNJHUNWALA_LINE_ITEMS,
         "type": "analyst",
         "order": 8,
     },
@@ -96,6 +105,7 @@ ANALYST_CONFIG = {
         "description": "The Macro Investor",
         "investing_style": "Focuses on macroeconomic trends, making large bets on currencies, commodities, and interest rates through top-down analysis.",
         "agent_func": stanley_druckenmiller_agent,
+        "line_item_request": STANLEY_DRUCKENMILLER_LINE_ITEMS,
         "type": "analyst",
         "order": 9,
     },
@@ -104,6 +114,7 @@ ANALYST_CONFIG = {
         "description": "The Oracle of Omaha",
         "investing_style": "Seeks companies with strong fundamentals and competitive advantages through value investing and long-term ownership.",
         "agent_func": warren_buffett_agent,
+        "line_item_request": WARREN_BUFFETT_LINE_ITEMS,
         "type": "analyst",
         "order": 10,
     },
@@ -136,6 +147,7 @@ ANALYST_CONFIG = {
         "description": "Company Valuation Specialist",
         "investing_style": "Specializes in determining the fair value of companies, using various valuation models and financial metrics for investment decisions.",
         "agent_func": valuation_analyst_agent,
+        "line_item_request": VALUATION_LINE_ITEMS,
         "type": "analyst",
         "order": 14,
     },
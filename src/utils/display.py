@@ -304,6 +304,41 @@ def print_backtest_results(table_rows: list) -> None:
     print("\n" * 4)
 
 
+def print_cache_stats(stats: dict) -> None:
+    """Print per-namespace cache effectiveness (see Cache.get_stats)"""
+
+    def fmt(value, spec=""):
+        return "-" if value is None else format(value, spec)
+
+    rows = []
+    for namespace, entry in stats["namespaces"].items():
+        latency = entry["upstream_latency"] or {}
+        rows.append([
+            namespace,
+            entry["hits"],
+            entry["misses"],
+            fmt(None if entry["hit_rate"] is None else entry["hit_rate"] * 100, ".1f"),
+            entry["negative_hits"],
+            f"{entry['bytes'] / 1024:,.1f}",
+            entry["evictions"],
+            latency.get("count", 0),
+            fmt(latency.get("p50_ms")),
+            fmt(latency.get("p95_ms")),
+        ])
+
+    memory = stats["memory"]
+    budget = "unbounded" if memory["max_bytes"] is None else f"{memory['max_bytes'] / 1024 ** 2:,.0f} MB"
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}CACHE STATS:{Style.RESET_ALL} {memory['entries']} entries, {memory['bytes'] / 1024 ** 2:,.1f} MB in memory (budget {budget})")
+    print(
+        tabulate(
+            rows,
+            headers=["Namespace", "Hits", "Misses", "Hit %", "Negative", "KB", "Evictions", "API Calls", "p50 ms", "p95 ms"],
+            tablefmt="grid",
+            colalign=("left", *["right"] * 9),
+        )
+    )
+
+
 def format_backtest_row(
     date: str,
     ticker: str,
@@ -1,186 +1,211 @@
 import os
+import random
 import pytest
 from unittest.mock import Mock, patch, call
 
+from src.data.cache import Cache
 from src.tools.api import _make_api_request, get_prices
+from src.tools.rate_limit import FileTokenBucket, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only advances when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, requests_per_minute: float = 6000, burst: float = 100) -> RateLimiter:
+    bucket = TokenBucket(requests_per_minute / 60.0, burst, clock=clock)
+    return RateLimiter(bucket, backoff_base=2.0, backoff_max=120.0, sleep=clock.sleep, rng=random.Random(0))
+
+
+def _response(status_code: int, text: str = "", headers: dict | None = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    return response
+
 
 class TestRateLimiting:
     """Test suite for API rate limiting functionality."""
 
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_handles_single_rate_limit(self, mock_get, mock_sleep):
-        """Test that API retries once after a 429 and succeeds."""
+    @patch('src.tools.api.get_rate_limiter')
+    @patch('src.tools.api.get_session')
+    def test_handles_single_rate_limit(self, mock_get_session, mock_get_rate_limiter):
+        """Test that API retries once after a 429 and waits out Retry-After."""
+        mock_get = mock_get_session.return_value.get
+        clock = FakeClock()
+        mock_get_rate_limiter.return_value = _limiter(clock)
+
         # Setup mock responses: first 429, then 200
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
-        mock_get.side_effect = [mock_429_response, mock_200_response]
-        
+        mock_get.side_effect = [_response(429, headers={"Retry-After": "7"}), _response(200, "Success")]
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.get was called twice
+
+        # Verify the session was called twice
         assert mock_get.call_count == 2
         mock_get.assert_has_calls([
             call(url, headers=headers),
             call(url, headers=headers)
         ])
-        
-        # Verify sleep was called once with 60 seconds (first retry)
-        mock_sleep.assert_called_once_with(60)
-
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_handles_multiple_rate_limits(self, mock_get, mock_sleep):
-        """Test that API retries multiple times after 429s."""
+
+        # Verify the retry waited exactly the server's Retry-After, not a fixed 60s
+        assert clock.sleeps == [7.0]
+
+    @patch('src.tools.api.get_rate_limiter')
+    @patch('src.tools.api.get_session')
+    def test_handles_multiple_rate_limits(self, mock_get_session, mock_get_rate_limiter):
+        """Test that API retries with jittered exponential backoff when no Retry-After is sent."""
+        mock_get = mock_get_session.return_value.get
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        mock_get_rate_limiter.return_value = limiter
+
         # Setup mock responses: three 429s, then 200
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
+        mock_429_response = _response(429)
         mock_get.side_effect = [
-            mock_429_response, 
-            mock_429_response, 
-            mock_429_response, 
-            mock_200_response
+            mock_429_response,
+            mock_429_response,
+            mock_429_response,
+            _response(200, "Success")
         ]
-        
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.get was called 4 times
+
+        # Verify the session was called 4 times
         assert mock_get.call_count == 4
-        
-        # Verify sleep was called 3 times with linear backoff: 60s, 90s, 120s
-        assert mock_sleep.call_count == 3
-        expected_calls = [call(60), call(90), call(120)]
-        mock_sleep.assert_has_calls(expected_calls)
-
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.post')
-    def test_handles_post_rate_limiting(self, mock_post, mock_sleep):
+
+        # Equal-jitter exponential backoff: each wait is in [step/2, step] for steps 2s, 4s, 8s
+        assert len(clock.sleeps) == 3
+        for wait, step in zip(clock.sleeps, [2.0, 4.0, 8.0]):
+            assert step / 2 <= wait <= step
+
+        # Throttled time is accounted for
+        assert limiter.stats.throttled_responses == 3
+        assert limiter.stats.backoff_seconds == pytest.approx(sum(clock.sleeps))
+
+    @patch('src.tools.api.get_rate_limiter')
+    @patch('src.tools.api.get_session')
+    def test_handles_post_rate_limiting(self, mock_get_session, mock_get_rate_limiter):
         """Test that POST requests handle rate limiting."""
+        mock_post = mock_get_session.return_value.post
+        clock = FakeClock()
+        mock_get_rate_limiter.return_value = _limiter(clock)
+
         # Setup mock responses: first 429, then 200
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
-        mock_post.side_effect = [mock_429_response, mock_200_response]
-        
+        mock_post.side_effect = [_response(429, headers={"Retry-After": "3"}), _response(200, "Success")]
+
         # Call the function with POST method
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
         json_data = {"test": "data"}
-        
+
         result = _make_api_request(url, headers, method="POST", json_data=json_data)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.post was called twice
+
+        # Verify the session was called twice
         assert mock_post.call_count == 2
         mock_post.assert_has_calls([
             call(url, headers=headers, json=json_data),
             call(url, headers=headers, json=json_data)
         ])
-        
-        # Verify sleep was called once with 60 seconds (first retry)
-        mock_sleep.assert_called_once_with(60)
 
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_ignores_other_errors(self, mock_get, mock_sleep):
+        assert clock.sleeps == [3.0]
+
+    @patch('src.tools.api.get_rate_limiter')
+    @patch('src.tools.api.get_session')
+    def test_ignores_other_errors(self, mock_get_session, mock_get_rate_limiter):
         """Test that non-429 errors are returned without retrying."""
+        mock_get = mock_get_session.return_value.get
+        clock = FakeClock()
+        mock_get_rate_limiter.return_value = _limiter(clock)
+
         # Setup mock response: 500 error
-        mock_500_response = Mock()
-        mock_500_response.status_code = 500
-        mock_500_response.text = "Internal Server Error"
-        
-        mock_get.return_value = mock_500_response
-        
+        mock_get.return_value = _response(500, "Internal Server Error")
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 500
         assert result.text == "Internal Server Error"
-        
-        # Verify requests.get was called only once
+
+        # Verify the session was called only once
         assert mock_get.call_count == 1
-        
+
         # Verify sleep was never called
-        mock_sleep.assert_not_called()
+        assert clock.sleeps == []
 
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_normal_success_requests(self, mock_get, mock_sleep):
+    @patch('src.tools.api.get_rate_limiter')
+    @patch('src.tools.api.get_session')
+    def test_normal_success_requests(self, mock_get_session, mock_get_rate_limiter):
         """Test that successful requests return immediately without retry."""
+        mock_get = mock_get_session.return_value.get
+        clock = FakeClock()
+        mock_get_rate_limiter.return_value = _limiter(clock)
+
         # Setup mock response: 200 success
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
-        mock_get.return_value = mock_200_response
-        
+        mock_get.return_value = _response(200, "Success")
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.get was called only once
+
+        # Verify the session was called only once
         assert mock_get.call_count == 1
-        
+
         # Verify sleep was never called
-        mock_sleep.assert_not_called()
+        assert clock.sleeps == []
 
-    @patch('src.tools.api._cache')
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_full_integration(self, mock_get, mock_sleep, mock_cache):
+    @patch('src.tools.api._cache', new_callable=Cache)
+    @patch('src.tools.api.get_rate_limiter')
+    @patch('src.tools.api.get_session')
+    def test_full_integration(self, mock_get_session, mock_get_rate_limiter, mock_cache):
         """Test that get_prices function properly handles rate limiting."""
-        # Mock cache to return None (cache miss)
-        mock_cache.get_prices.return_value = None
-        
+        mock_get = mock_get_session.return_value.get
+        clock = FakeClock()
+        mock_get_rate_limiter.return_value = _limiter(clock)
+
         # Setup mock responses: first 429, then 200 with valid data
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
+        mock_200_response = _response(200)
         mock_200_response.json.return_value = {
             "ticker": "AAPL",
             "prices": [
@@ -194,56 +219,111 @@ class TestRateLimiting:
                 }
             ]
         }
-        
-        mock_get.side_effect = [mock_429_response, mock_200_response]
-        
+
+        mock_get.side_effect = [_response(429, headers={"Retry-After": "5"}), mock_200_response]
+
         # Set environment variable for API key
         with patch.dict(os.environ, {"FINANCIAL_DATASETS_API_KEY": "test-key"}):
             # Call get_prices
             result = get_prices("AAPL", "2024-01-01", "2024-01-02")
-        
+
         # Verify the function succeeded and returned data
         assert len(result) == 1
         assert result[0].open == 100.0
         assert result[0].close == 101.0
-        
+
         # Verify rate limiting behavior
         assert mock_get.call_count == 2
-        mock_sleep.assert_called_once_with(60)
-        
-        # Verify cache operations
-        mock_cache.get_prices.assert_called_once()
-        mock_cache.set_prices.assert_called_once()
-
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_max_retries_exceeded(self, mock_get, mock_sleep):
+        assert clock.sleeps == [5.0]
+
+        # Verify the fetched window was merged into the cache
+        assert mock_cache.get_missing_price_windows("AAPL", "2024-01-01", "2024-01-01") == []
+        assert len(mock_cache.get_price_window("AAPL", "2024-01-01", "2024-01-02")) == 1
+
+    @patch('src.tools.api.get_rate_limiter')
+    @patch('src.tools.api.get_session')
+    def test_max_retries_exceeded(self, mock_get_session, mock_get_rate_limiter):
         """Test that function stops retrying after max_retries and returns final 429."""
+        mock_get = mock_get_session.return_value.get
+        clock = FakeClock()
+        mock_get_rate_limiter.return_value = _limiter(clock)
+
         # Setup mock responses: all 429s (exceeds max retries)
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        mock_429_response.text = "Too Many Requests"
-        
-        mock_get.return_value = mock_429_response
-        
+        mock_get.return_value = _response(429, "Too Many Requests", headers={"Retry-After": "1"})
+
         # Call the function with max_retries=2
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers, max_retries=2)
-        
+
         # Verify final 429 is returned
         assert result.status_code == 429
         assert result.text == "Too Many Requests"
-        
-        # Verify requests.get was called 3 times (1 initial + 2 retries)
+
+        # Verify the session was called 3 times (1 initial + 2 retries)
         assert mock_get.call_count == 3
-        
-        # Verify sleep was called 2 times with linear backoff: 60s, 90s
-        assert mock_sleep.call_count == 2
-        expected_calls = [call(60), call(90)]
-        mock_sleep.assert_has_calls(expected_calls)
+
+        # Only the two retries wait; the final 429 is returned immediately
+        assert clock.sleeps == [1.0, 1.0]
+
+
+class TestTokenBucket:
+    """Pacing behaviour of the shared token bucket."""
+
+    def test_paces_requests_beyond_burst(self):
+        clock = FakeClock()
+        limiter = _limiter(clock, requests_per_minute=60, burst=2)
+
+        for _ in range(4):
+            limiter.acquire()
+
+        # Two tokens of burst, then one request per second
+        assert clock.sleeps == [1.0, 1.0]
+        assert limiter.stats.paced_requests == 2
+        assert limiter.stats.throttled_seconds == pytest.approx(2.0)
+
+    def test_backoff_pauses_every_caller_sharing_the_bucket(self):
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        other_worker = RateLimiter(limiter.bucket, sleep=clock.sleep)
+
+        limiter.observe(_response(429, headers={"Retry-After": "10"}))
+        other_worker.acquire()
+
+        assert clock.sleeps == [10.0]
+
+    def test_server_retry_after_is_followed_beyond_the_backoff_cap(self):
+        clock = FakeClock()
+        limiter = _limiter(clock)
+
+        # backoff_max only caps the exponential fallback; a longer server hint is waited out in full
+        assert limiter.observe(_response(429, headers={"Retry-After": "300"})) == 300.0
+        assert limiter.observe(_response(429, headers={"X-RateLimit-Reset": "240"})) == 240.0
+        assert limiter.observe(_response(429), attempt=10) <= 120.0
+        limiter.acquire()
+
+        assert clock.sleeps == [300.0]
+
+    def test_exhausted_window_header_pauses_before_429(self):
+        clock = FakeClock()
+        limiter = _limiter(clock)
+
+        assert limiter.observe(_response(200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4"})) is None
+        limiter.acquire()
+
+        assert clock.sleeps == [4.0]
+
+    def test_file_bucket_is_shared_between_instances(self, tmp_path):
+        # Two processes would each build their own FileTokenBucket on the same path
+        first = FileTokenBucket(rate=1.0, capacity=2, path=tmp_path / "rate_limit.json")
+        second = FileTokenBucket(rate=1.0, capacity=2, path=tmp_path / "rate_limit.json")
+
+        assert first.reserve() == 0.0
+        assert second.reserve() == 0.0
+        # The shared budget is spent, so the next caller in either process must wait
+        assert first.reserve() > 0.5
 
 
 if __name__ == "__main__":
-    pytest.main([__file__]) 
\ No newline at end of file
+    pytest.main([__file__])
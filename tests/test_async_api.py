@@ -0,0 +1,143 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from src.data.cache import Cache
+from src.tools import api, async_api
+from src.tools.async_api import AsyncDataClient
+from src.tools.rate_limit import RateLimiter, TokenBucket
+
+
+def _unthrottled() -> RateLimiter:
+    return RateLimiter(TokenBucket(rate=1e6, capacity=1e6))
+
+
+def _payload(request: httpx.Request) -> dict:
+    path = request.url.path
+    ticker = request.url.params.get("ticker", "AAPL")
+    if path.startswith("/prices"):
+        return {"ticker": ticker, "prices": [{"time": "2024-01-02T00:00:00Z", "open": 1.0, "close": 2.0, "high": 2.0, "low": 1.0, "volume": 10}]}
+    if path.startswith("/financial-metrics"):
+        return {"financial_metrics": []}
+    if path.startswith("/insider-trades"):
+        return {"insider_trades": []}
+    return {"news": []}
+
+
+def _transport(stats: dict) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        stats["in_flight"] += 1
+        stats["peak"] = max(stats["peak"], stats["in_flight"])
+        stats["requests"] += 1
+        await asyncio.sleep(0.01)
+        stats["in_flight"] -= 1
+        return httpx.Response(200, json=_payload(request))
+
+    return httpx.MockTransport(handler)
+
+
+def test_prefetch_is_concurrent_but_bounded():
+    stats = {"in_flight": 0, "peak": 0, "requests": 0}
+    tickers = [f"T{i}" for i in range(20)]
+
+    async def run():
+        async with httpx.AsyncClient(transport=_transport(stats)) as http:
+            client = AsyncDataClient(max_concurrency=5, client=http)
+            return await client.prefetch(tickers, "2024-01-01", "2024-01-31", start_date="2024-01-01")
+
+    cache = Cache()
+    with patch.object(api, "_cache", cache), patch.object(async_api, "_cache", cache), patch.object(async_api, "get_rate_limiter", _unthrottled):
+        errors = asyncio.run(run())
+        # The sync fetcher is now served from the shared cache with no network
+        with patch.object(api, "_make_api_request", side_effect=AssertionError("network")):
+            assert api.get_prices("T3", "2024-01-02", "2024-01-05")[0].close == 2.0
+
+    assert errors == {}
+    # prices, ttm and annual metrics, insider trades and news
+    assert stats["requests"] == 5 * len(tickers)
+    assert 1 < stats["peak"] <= 5
+
+
+def test_prefetch_reports_failed_tickers():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("ticker") == "BAD":
+            return httpx.Response(500, text="boom")
+        return httpx.Response(200, json=_payload(request))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await AsyncDataClient(max_concurrency=2, client=http).prefetch(["AAPL", "BAD"], "2024-01-01", "2024-01-31")
+
+    cache = Cache()
+    with patch.object(api, "_cache", cache), patch.object(async_api, "_cache", cache), patch.object(async_api, "get_rate_limiter", _unthrottled):
+        errors = asyncio.run(run())
+
+    assert list(errors) == ["BAD"]
+
+
+def test_company_facts_prefetch_serves_market_cap_until_ttl_expires():
+    import datetime
+    from unittest.mock import Mock
+
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        ticker = request.url.params["ticker"]
+        requested.append(ticker)
+        return httpx.Response(200, json={"company_facts": {"ticker": ticker, "name": ticker, "market_cap": 1e9}})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await AsyncDataClient(max_concurrency=4, client=http).prefetch_company_facts(["AAPL", "MSFT", "NVDA"])
+
+    now = [0.0]
+    cache = Cache(company_facts_ttl=900, clock=lambda: now[0])
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    fallback = Mock(status_code=200)
+    fallback.json.return_value = {"company_facts": {"ticker": "AAPL", "name": "AAPL", "market_cap": 2e9}}
+
+    with patch.object(api, "_cache", cache), patch.object(async_api, "_cache", cache), patch.object(async_api, "get_rate_limiter", _unthrottled):
+        assert asyncio.run(run()) == {}
+        with patch.object(api, "_make_api_request", return_value=fallback) as network:
+            # Ten agents asking for a live market cap inside the TTL never hit the network
+            assert all(api.get_market_cap("AAPL", today) == 1e9 for _ in range(10))
+            assert network.call_count == 0
+
+            now[0] += 901
+            assert api.get_market_cap("AAPL", today) == 2e9
+            assert network.call_count == 1
+
+    assert sorted(requested) == ["AAPL", "MSFT", "NVDA"]
+
+
+def test_concurrent_async_callers_share_one_request():
+    stats = {"in_flight": 0, "peak": 0, "requests": 0}
+
+    async def run():
+        async with httpx.AsyncClient(transport=_transport(stats)) as http:
+            client = AsyncDataClient(max_concurrency=8, client=http)
+            return await asyncio.gather(*(client.get_financial_metrics("AAPL", "2024-12-31") for _ in range(8)))
+
+    cache = Cache()
+    with patch.object(api, "_cache", cache), patch.object(async_api, "_cache", cache), patch.object(async_api, "get_rate_limiter", _unthrottled):
+        assert asyncio.run(run()) == [[]] * 8
+
+    assert stats["requests"] == 1
+
+
+def test_company_facts_errors_match_the_sync_fetcher():
+    from unittest.mock import Mock
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, text="unknown ticker")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await AsyncDataClient(client=http).get_company_facts("NOPE")
+
+    cache = Cache()
+    with patch.object(api, "_cache", cache), patch.object(async_api, "_cache", cache), patch.object(async_api, "get_rate_limiter", _unthrottled):
+        with patch.object(api, "_make_api_request", return_value=Mock(status_code=404, text="unknown ticker")):
+            assert api.get_company_facts("NOPE") is None
+        assert asyncio.run(run()) is None
@@ -0,0 +1,423 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.data.cache import Cache
+from src.data.persistent_cache import SQLiteCacheStore
+from src.data.price_store import TickerPriceStore
+
+
+def _bar(day: str, close: float) -> dict:
+    return {"time": f"{day}T00:00:00Z", "open": close, "close": close, "high": close, "low": close, "volume": 100}
+
+
+def test_memory_only_cache_round_trip():
+    cache = Cache()
+    assert cache.get_prices("AAPL_2024-01-01_2024-01-02") is None
+    cache.set_prices("AAPL_2024-01-01_2024-01-02", [_bar("2024-01-02", 1.0)])
+    assert cache.get_prices("AAPL_2024-01-01_2024-01-02")[0]["close"] == 1.0
+
+
+def test_disk_tier_survives_new_cache_instance(tmp_path):
+    path = tmp_path / "api_cache.sqlite3"
+    first = Cache(store=SQLiteCacheStore(path))
+    first.set_prices("AAPL", [_bar("2024-01-02", 1.0)])
+    first.set_prices("AAPL", [_bar("2024-01-02", 1.0), _bar("2024-01-03", 2.0)])
+
+    # A fresh process starts with empty dicts but reads through to disk
+    second = Cache(store=SQLiteCacheStore(path))
+    assert second._prices_cache == {}
+    cached = second.get_prices("AAPL")
+    assert [bar["close"] for bar in cached] == [1.0, 2.0]
+    # The hit is promoted into the in-memory tier
+    assert "AAPL" in second._prices_cache
+
+
+def test_disk_tier_namespaces_are_independent(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "api_cache.sqlite3")
+    cache = Cache(store=store)
+    cache.set_company_news("AAPL", [{"date": "2024-01-02", "title": "x"}])
+    assert cache.get_insider_trades("AAPL") is None
+    store.clear("company_news")
+    assert Cache(store=store).get_company_news("AAPL") is None
+
+
+def test_price_store_serves_sub_windows_and_reports_edges():
+    store = TickerPriceStore()
+    store.merge([_bar("2024-01-02", 1.0), _bar("2024-01-03", 2.0), _bar("2024-01-05", 3.0)], "2024-01-01", "2024-01-07")
+
+    assert store.slice("2024-01-03", "2024-01-05").close.tolist() == [2.0, 3.0]
+    assert store.missing("2024-01-02", "2024-01-06") == []
+    assert store.missing("2023-12-28", "2024-01-10") == [("2023-12-28", "2023-12-31"), ("2024-01-08", "2024-01-10")]
+
+    # Filling one edge leaves only the other missing; adjacent windows coalesce
+    store.merge([_bar("2024-01-08", 4.0)], "2024-01-08", "2024-01-10")
+    assert store.coverage == [["2024-01-01", "2024-01-10"]]
+    assert store.missing("2023-12-28", "2024-01-10") == [("2023-12-28", "2023-12-31")]
+
+
+def test_cache_price_ranges_persist(tmp_path):
+    path = tmp_path / "api_cache.sqlite3"
+    Cache(store=SQLiteCacheStore(path)).merge_prices("AAPL", [_bar("2024-01-02", 1.0)], "2024-01-01", "2024-01-31")
+
+    cache = Cache(store=SQLiteCacheStore(path))
+    assert cache.get_missing_price_windows("AAPL", "2024-01-02", "2024-01-02") == []
+    assert cache.get_price_window("AAPL", "2024-01-01", "2024-01-03")[0].close == 1.0
+
+
+def test_get_prices_fetches_only_missing_edges():
+    from urllib.parse import parse_qs, urlparse
+
+    from src.tools import api
+
+    calls = []
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        params = parse_qs(urlparse(url).query)
+        calls.append((params["start_date"][0], params["end_date"][0]))
+        response = Mock(status_code=200)
+        response.json.return_value = {"ticker": "AAPL", "prices": [_bar("2024-01-02", 1.0), _bar("2024-03-01", 2.0)]}
+        return response
+
+    with patch.object(api, "_cache", Cache()), patch.object(api, "_make_api_request", side_effect=fake_request):
+        api.get_prices("AAPL", "2024-01-01", "2024-03-31")
+        # A daily lookback inside the prefetched year never hits the network
+        assert [p.close for p in api.get_prices("AAPL", "2024-02-29", "2024-03-01")] == [2.0]
+        api.get_prices("AAPL", "2024-03-15", "2024-04-05")
+
+    assert calls == [("2024-01-01", "2024-03-31"), ("2024-04-01", "2024-04-05")]
+
+
+def _line_item_response(line_items: list[str], report_periods=("2024-09-30", "2024-06-30")) -> Mock:
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "search_results": [
+            {"ticker": "AAPL", "report_period": rp, "period": "ttm", "currency": "USD", **{item: float(i) for i, item in enumerate(line_items)}}
+            for rp in report_periods
+        ]
+    }
+    return response
+
+
+def test_search_line_items_fetches_only_missing_fields():
+    from src.tools import api
+
+    bodies = []
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        bodies.append(json_data)
+        return _line_item_response(json_data["line_items"])
+
+    with patch.object(api, "_cache", Cache()), patch.object(api, "_make_api_request", side_effect=fake_request):
+        first = api.search_line_items("AAPL", ["revenue", "net_income"], "2024-12-31", limit=2)
+        # A subset of already-fetched fields, or fewer periods, is answered locally
+        subset = api.search_line_items("AAPL", ["net_income"], "2024-12-31", limit=1)
+        # Extra fields only fetch the difference, merged onto the same records
+        wider = api.search_line_items("AAPL", ["revenue", "free_cash_flow"], "2024-12-31", limit=2)
+
+    assert [body["line_items"] for body in bodies] == [["revenue", "net_income"], ["free_cash_flow"]]
+    assert len(first) == 2 and first[0].revenue == 0.0
+    assert len(subset) == 1 and subset[0].net_income == 1.0 and not hasattr(subset[0], "revenue")
+    assert [item.report_period for item in wider] == ["2024-09-30", "2024-06-30"]
+    assert wider[0].revenue == 0.0 and wider[0].free_cash_flow == 0.0
+
+
+def test_line_items_persist_with_field_coverage(tmp_path):
+    path = tmp_path / "api_cache.sqlite3"
+    records = _line_item_response(["revenue"]).json()["search_results"]
+    Cache(store=SQLiteCacheStore(path)).set_line_items("AAPL", "ttm", "2024-12-31", 2, ["revenue"], records)
+
+    cache = Cache(store=SQLiteCacheStore(path))
+    cached, missing = cache.get_line_items("AAPL", "ttm", "2024-12-31", 2, ["revenue"])
+    assert missing == [] and len(cached) == 2
+    assert cache.get_line_items("AAPL", "ttm", "2024-12-31", 2, ["revenue", "net_income"]) == (None, ["net_income"])
+
+
+def test_negative_cache_skips_network_until_ttl_expires(tmp_path):
+    from src.tools import api
+
+    now = [1_000.0]
+    cache = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"), negative_ttl=60, clock=lambda: now[0])
+    calls = []
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        calls.append(url)
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"financial_metrics": []}
+        return response
+
+    with patch.object(api, "_cache", cache), patch.object(api, "_make_api_request", side_effect=fake_request):
+        for _ in range(3):
+            assert api.get_financial_metrics("NEWCO", "2024-12-31") == []
+        assert len(calls) == 1
+
+        now[0] += 61
+        api.get_financial_metrics("NEWCO", "2024-12-31")
+        assert len(calls) == 2
+
+    assert cache.get_negative_cache_stats()["network_calls_saved_by_namespace"] == {"financial_metrics": 2}
+    # Negative entries are kept apart from positive data and survive a restart
+    assert cache.get_financial_metrics("NEWCO_ttm_2024-12-31_10") is None
+    reopened = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"), negative_ttl=60, clock=lambda: now[0])
+    assert reopened.is_known_empty("financial_metrics", "NEWCO_ttm_2024-12-31_10")
+
+
+def _news_api(articles: list[dict], calls: list):
+    """Fake /news endpoint over a fixed article list, honouring start/end dates and limit."""
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        params = dict(part.split("=", 1) for part in url.split("?", 1)[1].split("&"))
+        calls.append(params)
+        matching = [a for a in articles if a["date"][:10] <= params["end_date"] and a["date"][:10] >= params.get("start_date", "")]
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"news": sorted(matching, key=lambda a: a["date"], reverse=True)[: int(params["limit"])]}
+        return response
+
+    return fake_request
+
+
+def _article(day: str, n: int = 0) -> dict:
+    return {"ticker": "AAPL", "title": f"{day}-{n}", "author": "a", "source": "s", "date": f"{day}T12:00:00Z", "url": f"https://x/{day}/{n}"}
+
+
+def test_rolling_end_date_fetches_only_the_delta(tmp_path):
+    from src.tools import api
+
+    articles = [_article(f"2024-03-{day:02d}") for day in range(1, 29)]
+    calls = []
+    cache = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"))
+
+    with patch.object(api, "_cache", cache), patch.object(api, "_make_api_request", side_effect=_news_api(articles, calls)):
+        first = api.get_company_news("AAPL", "2024-03-10", start_date="2024-03-01", limit=5)
+        assert len(first) == 10
+        history_calls = len(calls)  # full paginated history
+        for end_day in range(11, 15):
+            rolled = api.get_company_news("AAPL", f"2024-03-{end_day:02d}", start_date="2024-03-01", limit=5)
+            assert [a.date[:10] for a in rolled][0] == f"2024-03-{end_day:02d}"
+        # Sub-windows of what is covered never hit the network
+        assert len(api.get_company_news("AAPL", "2024-03-12", start_date="2024-03-05", limit=5)) == 8
+
+    # Each day forward is one small request starting at the previous high-water mark
+    assert [c.get("start_date") for c in calls[history_calls:]] == ["2024-03-10", "2024-03-11", "2024-03-12", "2024-03-13"]
+    assert len(cache.get_events("company_news", "AAPL", "2024-03-01", "2024-03-14", 5)) == 14
+
+    # The store, with its coverage, survives a restart
+    reopened = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"))
+    assert len(reopened.get_events("company_news", "AAPL", "2024-03-01", "2024-03-14", 5)) == 14
+
+
+def test_same_day_requery_refetches_todays_events(tmp_path):
+    from datetime import date, timedelta
+
+    from src.tools import api
+
+    today = date.today()
+    days = [(today - timedelta(days=n)).isoformat() for n in (3, 2, 1, 0)]
+    articles = [_article(day) for day in days]
+    calls = []
+    cache = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"))
+
+    with patch.object(api, "_cache", cache), patch.object(api, "_make_api_request", side_effect=_news_api(articles, calls)):
+        assert len(api.get_company_news("AAPL", days[-1], start_date=days[0])) == 4
+        # Published after the first query, later the same day
+        articles.append(_article(days[-1], 1))
+        assert len(api.get_company_news("AAPL", days[-1], start_date=days[0])) == 5
+        # Settled days are still served from the store
+        assert len(api.get_company_news("AAPL", days[-2], start_date=days[0])) == 3
+
+    # The second query only topped up from yesterday, the last covered day
+    assert [c.get("start_date") for c in calls] == [days[0], days[-2]]
+    reopened = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"))
+    assert reopened.get_events("company_news", "AAPL", days[0], days[-1], 1000) is None
+
+
+def test_startless_queries_top_up_latest_events():
+    from src.tools import api
+
+    articles = [_article(f"2024-03-{day:02d}", n) for day in range(1, 29) for n in range(2)]
+    calls = []
+
+    with patch.object(api, "_cache", Cache()), patch.object(api, "_make_api_request", side_effect=_news_api(articles, calls)):
+        latest = api.get_company_news("AAPL", "2024-03-20", limit=6)
+        rolled = api.get_company_news("AAPL", "2024-03-21", limit=6)
+        # Asking for more history than is covered falls back to a full fetch
+        deeper = api.get_company_news("AAPL", "2024-03-21", limit=20)
+
+    assert [a.date[:10] for a in latest] == ["2024-03-20"] * 2 + ["2024-03-19"] * 2 + ["2024-03-18"] * 2
+    assert [a.date[:10] for a in rolled][:2] == ["2024-03-21"] * 2 and len(rolled) == 6
+    assert len(deeper) == 20
+    assert [c.get("start_date") for c in calls] == [None, "2024-03-20", None]
+
+
+def _metrics(report_periods: list[str]) -> list[dict]:
+    from src.data.models import FinancialMetrics
+
+    empty = dict.fromkeys(FinancialMetrics.model_fields)
+    return [{**empty, "ticker": "AAPL", "report_period": rp, "period": "ttm", "currency": "USD", "market_cap": float(i)} for i, rp in enumerate(report_periods)]
+
+
+def test_point_in_time_fundamentals_are_slices_of_one_deep_fetch(tmp_path):
+    from src.data.fundamentals_store import FundamentalsStore
+
+    quarters = ["2024-12-31", "2024-09-30", "2024-06-30", "2024-03-31", "2023-12-31", "2023-09-30"]
+    store = FundamentalsStore()
+    store.merge("2025-01-31", 6, _metrics(quarters))
+
+    # Every as-of date inside the fetched window is answered locally, newest first
+    assert [r["report_period"] for r in store.query("2024-08-15", 2)] == ["2024-06-30", "2024-03-31"]
+    assert [r["report_period"] for r in store.query("2024-12-31", 3)] == quarters[:3]
+    # Not enough known history below the as-of date, or a date past the window
+    assert store.query("2024-01-15", 3) is None
+    assert store.query("2025-02-01", 1) is None
+
+    # A short answer means the whole history is known
+    store.merge("2023-06-30", 4, _metrics(["2023-03-31"]))
+    assert [r["report_period"] for r in store.query("2023-06-30", 5)] == ["2023-03-31"]
+    # ...but nothing is known about reports between the two windows
+    assert store.query("2023-08-01", 1) is None
+
+    path = tmp_path / "api_cache.sqlite3"
+    Cache(store=SQLiteCacheStore(path)).merge_fundamentals("AAPL", "ttm", "2025-01-31", 6, _metrics(quarters))
+    assert len(Cache(store=SQLiteCacheStore(path)).get_fundamentals("AAPL", "ttm", "2024-10-01", 4)) == 4
+
+
+def test_backtest_days_reuse_fundamentals_without_network():
+    from src.tools import api
+
+    quarters = ["2024-12-31", "2024-09-30", "2024-06-30", "2024-03-31", "2023-12-31", "2023-09-30", "2023-06-30"]
+    calls = []
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        calls.append(url)
+        as_of = url.split("report_period_lte=")[1].split("&")[0]
+        limit = int(url.split("limit=")[1].split("&")[0])
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"financial_metrics": [m for m in _metrics(quarters) if m["report_period"] <= as_of][:limit]}
+        return response
+
+    with patch.object(api, "_cache", Cache()), patch.object(api, "_make_api_request", side_effect=fake_request):
+        api.get_financial_metrics("AAPL", "2025-01-31", limit=6)
+        for day in ["2024-10-01", "2024-11-15", "2025-01-02"]:
+            assert len(api.get_financial_metrics("AAPL", day, limit=3)) == 3
+
+    assert len(calls) == 1
+
+
+def test_memory_tier_evicts_least_recently_used_within_budget(tmp_path):
+    bars = [_bar(f"2024-01-{day:02d}", float(day)) for day in range(2, 30)]
+    one_ticker = TickerPriceStore(bars=bars).nbytes()
+    cache = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"), max_bytes=int(one_ticker * 2.5))
+
+    cache.merge_prices("AAPL", bars, "2024-01-01", "2024-01-31")
+    cache.merge_prices("MSFT", bars, "2024-01-01", "2024-01-31")
+    cache.get_price_window("AAPL", "2024-01-02", "2024-01-05")  # AAPL is now the most recently used
+    cache.merge_prices("NVDA", bars, "2024-01-01", "2024-01-31")
+
+    assert set(cache._price_ranges) == {"AAPL", "NVDA"}
+    stats = cache.get_memory_stats()
+    assert stats["bytes"] <= stats["max_bytes"] and stats["evictions_by_namespace"] == {"price_ranges": 1}
+    # The evicted ticker is read back from the disk tier
+    assert cache.get_price_window("MSFT", "2024-01-02", "2024-01-05").close.tolist() == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_merges_resize_memory_entries_without_reserializing_stores():
+    import json
+
+    from src.data.event_store import TickerEventStore
+    from src.data.fundamentals_store import FundamentalsStore
+
+    cache = Cache()
+    articles = [_article(f"2024-03-{day:02d}", n) for day in range(1, 29) for n in range(3)]
+    quarters = [f"20{year}-{month:02d}-30" for year in range(15, 25) for month in (3, 6, 9, 12)]
+    with patch.object(TickerEventStore, "to_dict", side_effect=AssertionError("re-serialized")), patch.object(FundamentalsStore, "to_dict", side_effect=AssertionError("re-serialized")):
+        for day in range(1, 29):
+            cache.merge_events("company_news", "AAPL", [a for a in articles if a["date"].startswith(f"2024-03-{day:02d}")], f"2024-03-{day:02d}", f"2024-03-{day:02d}", 10)
+        for i in range(4, len(quarters) + 1, 4):
+            cache.merge_fundamentals("AAPL", "ttm", quarters[i - 1], 4, _metrics(quarters[i - 4:i]))
+
+    # The running estimates stay close to what serializing everything would measure
+    sizes = cache.get_memory_stats()["bytes_by_namespace"]
+    assert sizes["company_news_events"] == pytest.approx(len(json.dumps(articles)), rel=0.05)
+    assert sizes["fundamentals"] == pytest.approx(len(json.dumps(_metrics(quarters))), rel=0.05)
+
+
+def test_memory_ttls_are_per_kind():
+    now = [1_000.0]
+    cache = Cache(clock=lambda: now[0], memory_ttls={"company_news": 60, "prices": None})
+    cache.merge_events("company_news", "AAPL", [_article("2024-03-01")], "2024-03-01", "2024-03-01", 10)
+    cache.merge_prices("AAPL", [_bar("2024-01-02", 1.0)], "2024-01-01", "2024-01-31")
+
+    now[0] += 61
+    # Without a disk tier, expired news must be refetched; prices never expire
+    assert cache.get_events("company_news", "AAPL", "2024-03-01", "2024-03-01", 10) is None
+    assert cache.get_missing_price_windows("AAPL", "2024-01-01", "2024-01-31") == []
+    assert cache.get_memory_stats()["expirations_by_namespace"] == {"company_news_events": 1}
+
+
+def test_processes_sharing_the_disk_store_see_each_others_writes(tmp_path):
+    path = tmp_path / "api_cache.sqlite3"
+    # Separate connections behave like separate worker processes
+    worker_a = Cache(store=SQLiteCacheStore(path), sync_interval=0)
+    worker_b = Cache(store=SQLiteCacheStore(path), sync_interval=0)
+
+    worker_a.merge_prices("AAPL", [_bar("2024-01-02", 1.0)], "2024-01-01", "2024-01-15")
+    assert worker_b.get_missing_price_windows("AAPL", "2024-01-01", "2024-01-15") == []
+
+    # B extends the window; A drops its stale in-memory copy and reads B's version
+    worker_b.merge_prices("AAPL", [_bar("2024-01-16", 2.0)], "2024-01-16", "2024-01-31")
+    assert worker_a.get_price_window("AAPL", "2024-01-01", "2024-01-31").close.tolist() == [1.0, 2.0]
+    # ...while entries nobody else touched stay hot in memory
+    worker_a.merge_events("company_news", "AAPL", [_article("2024-03-01")], "2024-03-01", "2024-03-01", 10)
+    worker_b.set_empty("financial_metrics", "NEWCO_ttm_2024-12-31_10")
+    assert worker_a.is_known_empty("financial_metrics", "NEWCO_ttm_2024-12-31_10")
+    assert "AAPL" in worker_a._event_stores["company_news"]
+
+
+def test_writes_after_a_clear_are_still_seen_by_other_processes(tmp_path):
+    path = tmp_path / "api_cache.sqlite3"
+    worker_a = Cache(store=SQLiteCacheStore(path), sync_interval=0)
+    worker_b = Cache(store=SQLiteCacheStore(path), sync_interval=0)
+    for day in range(2, 6):
+        worker_a.merge_prices("AAPL", [_bar(f"2024-01-{day:02d}", 1.0)], f"2024-01-{day:02d}", f"2024-01-{day:02d}")
+    worker_a.get_price_window("AAPL", "2024-01-01", "2024-01-31")
+
+    # Deleting every row must not restart the change counter below what A has already seen
+    worker_b._store.clear()
+    worker_b.merge_prices("AAPL", [_bar("2024-01-02", 9.0)], "2024-01-01", "2024-01-31")
+    assert worker_a.get_price_window("AAPL", "2024-01-01", "2024-01-31").close.tolist() == [9.0]
+
+
+def test_a_clear_in_one_process_drops_the_others_memory(tmp_path):
+    path = tmp_path / "api_cache.sqlite3"
+    worker_a = Cache(store=SQLiteCacheStore(path), sync_interval=0)
+    worker_b = Cache(store=SQLiteCacheStore(path), sync_interval=0)
+    worker_a.merge_prices("AAPL", [_bar("2024-01-02", 1.0)], "2024-01-01", "2024-01-15")
+    worker_a.merge_events("company_news", "AAPL", [_article("2024-03-01")], "2024-03-01", "2024-03-01", 10)
+    worker_a.set_empty("financial_metrics", "NEWCO_ttm_2024-12-31_10")
+
+    # Clearing one namespace drops only that namespace from A's memory, with no later write needed
+    worker_b._store.clear("price_ranges")
+    assert worker_a.get_missing_price_windows("AAPL", "2024-01-01", "2024-01-15") == [("2024-01-01", "2024-01-15")]
+    assert "AAPL" in worker_a._event_stores["company_news"]
+
+    # ...and clearing everything drops everything, negative entries included
+    worker_b._store.clear()
+    assert worker_a.get_events("company_news", "AAPL", "2024-03-01", "2024-03-01", 10) is None
+    assert not worker_a.is_known_empty("financial_metrics", "NEWCO_ttm_2024-12-31_10")
+
+
+def test_memory_hits_check_the_disk_store_at_most_once_per_interval(tmp_path):
+    cache = Cache(store=SQLiteCacheStore(tmp_path / "api_cache.sqlite3"), sync_interval=60)
+    cache.merge_prices("AAPL", [_bar("2024-01-02", 1.0)], "2024-01-01", "2024-01-15")
+
+    with patch.object(cache._store, "data_version", wraps=cache._store.data_version) as data_version:
+        for _ in range(100):
+            cache.get_missing_price_windows("AAPL", "2024-01-01", "2024-01-15")
+        assert data_version.call_count == 0
+        cache._synced_at -= 60
+        cache.get_missing_price_windows("AAPL", "2024-01-01", "2024-01-15")
+        assert data_version.call_count == 1
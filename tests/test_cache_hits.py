@@ -0,0 +1,44 @@
+"""Cache hits rebuild models from cached dicts without re-validating them."""
+
+from unittest.mock import patch
+
+from src.data.cache import Cache
+from src.data.models import CompanyNews, FinancialMetrics, InsiderTrade
+from src.tools import api
+
+
+def _metric(report_period: str) -> dict:
+    record = {name: 1.5 for name in FinancialMetrics.model_fields}
+    record.update(ticker="AAPL", report_period=report_period, period="ttm", currency="USD", peg_ratio=None)
+    return FinancialMetrics(**record).model_dump()
+
+
+def test_trusted_cache_hits_match_validation_without_running_it():
+    cache = Cache()
+    cached = [_metric(f"2024-{month:02d}-28") for month in range(10, 0, -1)]
+    cache.merge_fundamentals("AAPL", "ttm", "2024-12-31", 10, cached)
+    validated = [FinancialMetrics(**metric) for metric in cached]
+
+    with patch.object(api, "_cache", cache), patch.object(FinancialMetrics, "__pydantic_validator__", wraps=FinancialMetrics.__pydantic_validator__) as validator:
+        trusted = api.get_financial_metrics("AAPL", "2024-12-31")
+        assert validator.validate_python.call_count == 0
+
+    assert trusted == validated
+    assert [m.model_dump() for m in trusted] == cached
+
+
+def test_trusted_models_are_independent_of_the_cache():
+    news = CompanyNews(ticker="AAPL", title="t", author="a", source="s", date="2024-01-02", url="u").model_dump()
+    trade = InsiderTrade(
+        ticker="AAPL", issuer=None, name="n", title=None, is_board_director=None, transaction_date=None, transaction_shares=1.0,
+        transaction_price_per_share=None, transaction_value=None, shares_owned_before_transaction=None,
+        shares_owned_after_transaction=None, security_title=None, filing_date="2024-01-02",
+    ).model_dump()
+
+    [model] = api._from_cache(CompanyNews, [news])
+    model.title = "changed"
+    assert news["title"] == "t"
+    assert api._from_cache(InsiderTrade, [trade])[0].model_dump() == trade
+    # Records missing a declared field fall back to validation and its defaults
+    legacy = {k: v for k, v in news.items() if k != "sentiment"}
+    assert api._from_cache(CompanyNews, [legacy])[0].sentiment is None
@@ -0,0 +1,51 @@
+from unittest.mock import Mock, patch
+
+from src.data.cache import Cache
+from src.data.cache_metrics import LatencyHistogram
+from src.tools import api
+
+
+def _metrics_response(report_periods: list[str]) -> Mock:
+    from src.data.models import FinancialMetrics
+
+    metrics = []
+    for report_period in report_periods:
+        record = {name: None for name in FinancialMetrics.model_fields}
+        record.update(ticker="AAPL", report_period=report_period, period="ttm", currency="USD", market_cap=1.0)
+        metrics.append(record)
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"financial_metrics": metrics}
+    return response
+
+
+def test_latency_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram(buckets=(10, 100, 1000))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 3.0):
+        histogram.observe(seconds)
+
+    summary = histogram.as_dict()
+    assert summary["buckets_ms"] == {"le_10": 1, "le_100": 2, "le_1000": 1, "inf": 1}
+    assert summary["p50_ms"] == 100.0 and summary["max_ms"] == 3000.0
+    assert summary["p95_ms"] == 3000.0  # beyond the last bound, the max is the best estimate
+
+
+def test_cache_stats_count_hits_misses_and_upstream_latency():
+    cache = Cache()
+    session = Mock()
+    session.get.return_value = _metrics_response(["2024-09-28", "2024-06-29"])
+    limiter = Mock()
+    limiter.observe.return_value = 0.0
+
+    with patch.object(api, "_cache", cache), patch.object(api, "get_session", return_value=session), patch.object(api, "get_rate_limiter", return_value=limiter):
+        api.get_financial_metrics("AAPL", "2024-12-31", limit=2)
+        api.get_financial_metrics("AAPL", "2024-12-31", limit=2)
+        api.get_financial_metrics("AAPL", "2024-11-30", limit=1)
+
+    stats = cache.get_stats()
+    metrics = stats["namespaces"]["financial_metrics"]
+    assert (metrics["hits"], metrics["misses"]) == (2, 1)
+    assert metrics["upstream_latency"]["count"] == 1 and metrics["bytes"] > 0
+    # Kinds that saw no traffic are still listed so dashboards have stable keys
+    assert stats["namespaces"]["company_news"]["hit_rate"] is None
+    assert stats["memory"]["bytes"] == metrics["bytes"]
@@ -0,0 +1,136 @@
+import asyncio
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.data.cache import Cache
+from src.tools import api, async_api
+from src.tools.http_archive import ArchiveMiss, HttpArchive, RecordReplayTransport
+from src.tools.http_session import create_session
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Stand-in /financial-metrics/ endpoint that counts the requests it serves."""
+
+    requests_served = 0
+
+    def do_GET(self):
+        type(self).requests_served += 1
+        body = json.dumps({"financial_metrics": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_sync_session_records_then_replays_without_network(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/financial-metrics/?ticker=AAPL&limit=10"
+
+    recorder = create_session(archive=HttpArchive(tmp_path, "record"))
+    recorded = recorder.get(url, headers={"X-API-KEY": "secret"})
+    server.shutdown()
+    server.server_close()
+
+    replayer = create_session(archive=HttpArchive(tmp_path, "replay"))
+    # Query parameter order and headers don't change which entry is replayed
+    replayed = replayer.get(url.replace("ticker=AAPL&limit=10", "limit=10&ticker=AAPL"))
+    assert replayed.status_code == 200 and replayed.json() == recorded.json()
+    assert _MetricsHandler.requests_served == 1
+
+    [entry_file] = tmp_path.rglob("*.json.gz")
+    assert "secret" not in gzip.open(entry_file, "rt").read()
+    with pytest.raises(ArchiveMiss):
+        replayer.get(url.replace("AAPL", "MSFT"))
+
+
+def test_async_transport_records_then_replays(tmp_path):
+    calls = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"search_results": [{"ticker": "AAPL", "report_period": "2024-09-28", "period": "ttm", "currency": "USD"}]})
+
+    async def post(mode: str) -> dict:
+        transport = RecordReplayTransport(HttpArchive(tmp_path, mode), httpx.MockTransport(upstream))
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.post("https://api.financialdatasets.ai/financials/search/line-items", json={"tickers": ["AAPL"], "line_items": ["revenue"]})
+            return response.json()
+
+    recorded = asyncio.run(post("record"))
+    assert asyncio.run(post("replay")) == recorded
+    assert len(calls) == 1
+
+
+def test_replay_mode_skips_the_rate_limiter(tmp_path):
+    archive = HttpArchive(tmp_path, "replay")
+    url = api._financial_metrics_url("AAPL", "2024-12-31", "ttm", 10)
+    HttpArchive(tmp_path, "record").record("GET", url, None, 200, {"content-type": "application/json"}, b'{"financial_metrics": []}')
+    limiter = async_api.get_rate_limiter()
+
+    with patch.object(api, "_cache", Cache()), patch.object(api, "get_session", return_value=create_session(archive=archive)), patch("src.tools.api.is_replaying", return_value=True), patch.object(limiter, "acquire") as acquire:
+        assert api.get_financial_metrics("AAPL", "2024-12-31") == []
+    acquire.assert_not_called()
+    assert archive.replayed == 1
+
+
+def test_recorded_run_replays_from_an_empty_cache_on_a_later_day(tmp_path, monkeypatch):
+    import shutil
+    from datetime import date, timedelta
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    from src.data import cache as cache_module
+    from src.tools import http_archive
+    from src.tools.http_archive import RecordReplayAdapter
+
+    recorded_on = date.today()
+    upstream = []
+
+    class Upstream(HTTPAdapter):
+        def send(self, request, **kwargs):
+            upstream.append(request.url)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps({"ticker": "AAPL", "prices": [{"time": f"{recorded_on.isoformat()}T00:00:00Z", "open": 1.0, "close": 2.0, "high": 2.0, "low": 1.0, "volume": 10}]}).encode()
+            return response
+
+    class LaterDate(date):
+        @classmethod
+        def today(cls):
+            return recorded_on + timedelta(days=1)
+
+    def run(mode: str) -> list[list[float]]:
+        archive = HttpArchive(tmp_path / "archive", mode)
+        session = requests.Session()
+        session.mount("https://", RecordReplayAdapter(archive, Upstream()))
+        with patch.object(http_archive, "get_http_archive", return_value=archive):
+            cache = cache_module._default_cache()
+        with patch.object(api, "_cache", cache), patch.object(api, "get_session", return_value=session), patch("src.tools.api.is_replaying", return_value=archive.replaying):
+            # The second window's gap depends on what the first one left covered as of "today"
+            start = (recorded_on - timedelta(days=10)).isoformat()
+            windows = [api.get_prices("AAPL", start, end.isoformat()) for end in (recorded_on, recorded_on + timedelta(days=1))]
+        return [[bar.close for bar in window] for window in windows], archive
+
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path / "cache"))
+    recorded, recorder = run("record")
+    assert recorder.recorded == 2
+    shutil.rmtree(tmp_path / "cache", ignore_errors=True)
+
+    # Replaying a day later, on a clean machine, asks for exactly the recorded URLs
+    with patch.object(cache_module, "date", LaterDate):
+        replayed, replayer = run("replay")
+    assert replayed == recorded
+    assert replayer.replayed == 2 and len(upstream) == 2
+    assert not (tmp_path / "cache").exists()
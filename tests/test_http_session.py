@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.tools.http_session import create_session
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for api.financialdatasets.ai that keeps connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        body = b'{"ticker": "AAPL", "prices": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    handler = type("Handler", (_StandInHandler,), {"connections": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, handler, f"http://127.0.0.1:{server.server_address[1]}/prices/"
+
+
+def _get_many(get, url: str, n: int):
+    for _ in range(n):
+        assert get(url).status_code == 200
+
+
+def test_pooled_session_reuses_one_connection():
+    server, handler, url = _serve()
+    try:
+        _get_many(requests.get, url, 20)
+        # Without a session every request pays for a new connection
+        assert handler.connections == 20
+    finally:
+        server.shutdown()
+
+    server, handler, url = _serve()
+    session = create_session(pool_maxsize=4)
+    try:
+        _get_many(session.get, url, 20)
+        assert handler.connections == 1
+    finally:
+        session.close()
+        server.shutdown()
+
+
+def test_concurrent_fetchers_share_at_most_pool_maxsize_connections():
+    server, handler, url = _serve()
+    session = create_session(pool_maxsize=4)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: _get_many(session.get, url, 10), range(4)))
+        assert 1 <= handler.connections <= 4
+    finally:
+        session.close()
+        server.shutdown()
+
+
+def test_session_applies_default_timeout():
+    session = create_session(connect_timeout=1.5, read_timeout=7.0)
+    assert session.get_adapter("https://api.financialdatasets.ai").timeout == (1.5, 7.0)
+    assert "gzip" in session.headers["Accept-Encoding"]
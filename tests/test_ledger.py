@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.portfolio import PortfolioLedger
+
+
+def test_batch_fills_in_ticker_order_against_remaining_cash():
+    ledger = PortfolioLedger(["AAPL", "MSFT", "NVDA"], 1_000.0)
+    prices = np.array([100.0, 300.0, 50.0])
+
+    # AAPL takes 600, MSFT can then only afford one share, NVDA gets the last 100
+    executed = ledger.execute({"AAPL": {"action": "buy", "quantity": 6}, "MSFT": {"action": "buy", "quantity": 5}, "NVDA": {"action": "buy", "quantity": 2.9}}, prices)
+    assert executed == {"AAPL": 6, "MSFT": 1, "NVDA": 2}
+    assert ledger.cash == pytest.approx(0.0)
+    assert ledger.value(prices) == pytest.approx(1_000.0)
+
+    # Selling first frees cash for a later buy in the same batch
+    executed = ledger.execute({"AAPL": {"action": "sell", "quantity": 10}, "MSFT": {"action": "buy", "quantity": 2}, "NVDA": {"action": "hold", "quantity": 2}}, np.array([110.0, 300.0, 50.0]))
+    assert executed == {"AAPL": 6, "MSFT": 2, "NVDA": 0}
+    assert ledger.realized_long[0] == pytest.approx(60.0)
+    assert ledger.long_cost_basis.tolist() == [0.0, 300.0, 50.0]
+    assert ledger.cash == pytest.approx(60.0)
+
+
+def test_shorts_lock_margin_and_covers_release_it():
+    ledger = PortfolioLedger(["AAPL", "MSFT"], 1_000.0, margin_requirement=0.5)
+
+    executed = ledger.execute({"AAPL": {"action": "short", "quantity": 10}, "MSFT": {"action": "short", "quantity": 10}}, np.array([100.0, 50.0]))
+    # AAPL locks 500 of margin and credits 500 net; MSFT's 250 of margin still fits
+    assert executed == {"AAPL": 10, "MSFT": 10}
+    assert ledger.margin_used == pytest.approx(750.0)
+    assert ledger.cash == pytest.approx(1_750.0)
+
+    ledger.execute({"AAPL": {"action": "cover", "quantity": 4}}, np.array([90.0, 50.0]))
+    assert ledger.short.tolist() == [6, 10]
+    assert ledger.short_margin_used[0] == pytest.approx(300.0)
+    assert ledger.realized_short[0] == pytest.approx(40.0)
+    assert ledger.cash == pytest.approx(1_750.0 + 200.0 - 360.0)
+    assert ledger.short_exposure(np.array([90.0, 50.0])) == pytest.approx(1_040.0)
+
+    ledger.execute({"AAPL": {"action": "cover", "quantity": 6}}, np.array([90.0, 50.0]))
+    assert ledger.short[0] == 0 and ledger.short_cost_basis[0] == 0.0 and ledger.short_margin_used[0] == 0.0
+    assert ledger.margin_used == pytest.approx(250.0)
+
+
+def test_portfolio_dict_round_trip():
+    portfolio = {
+        "cash": 500.0, "margin_requirement": 0.25, "margin_used": 25.0,
+        "positions": {"AAPL": {"long": 3, "short": 0, "long_cost_basis": 90.0, "short_cost_basis": 0.0, "short_margin_used": 0.0},
+                      "MSFT": {"long": 0, "short": 1, "long_cost_basis": 0.0, "short_cost_basis": 100.0, "short_margin_used": 25.0}},
+        "realized_gains": {"AAPL": {"long": 5.0, "short": 0.0}, "MSFT": {"long": 0.0, "short": -2.0}},
+    }
+    ledger = PortfolioLedger.from_portfolio(portfolio)
+    assert ledger.to_portfolio() == portfolio
+    assert ledger.value(ledger.prices({"AAPL": 100.0, "MSFT": 110.0})) == pytest.approx(500.0 + 300.0 - 110.0)
+    assert ledger.realized_gains() == pytest.approx(3.0)
+
+
+def test_cover_that_overdraws_cash_does_not_block_later_sells():
+    ledger = PortfolioLedger(["AAPL", "MSFT"], 0.0)
+    ledger.short[0], ledger.long[1], ledger.long_cost_basis[1] = 10, 5, 20.0
+    executed = ledger.execute({"AAPL": {"action": "cover", "quantity": 10}, "MSFT": {"action": "sell", "quantity": 5}}, np.array([100.0, 30.0]))
+    assert executed == {"AAPL": 10, "MSFT": 5}
+    assert ledger.cash == pytest.approx(-850.0)
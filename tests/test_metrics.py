@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.eval.metrics import StreamingMetrics
+
+
+def _batch_metrics(values: pd.Series) -> dict:
+    """The per-day DataFrame computation the backtesters used to run."""
+    excess = values.pct_change().dropna() - 0.0434 / 252
+    mean, std = excess.mean(), excess.std()
+    downside_std = excess[excess < 0].std()
+    drawdown = (values - values.cummax()) / values.cummax()
+    return {
+        "sharpe_ratio": np.sqrt(252) * mean / std if std > 1e-12 else 0.0,
+        "sortino_ratio": np.sqrt(252) * mean / downside_std if downside_std > 1e-12 else (math.inf if mean > 0 else 0),
+        "max_drawdown": drawdown.min() * 100,
+        "max_drawdown_date": drawdown.idxmin().strftime("%Y-%m-%d") if drawdown.min() < 0 else None,
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_streaming_metrics_match_batch_every_day(seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2023-01-02", periods=300, freq="B")
+    values = pd.Series(100_000 * np.cumprod(1 + rng.normal(0.0005, 0.01, len(dates))), index=dates)
+    metrics = StreamingMetrics()
+
+    for day, (date, value) in enumerate(values.items()):
+        metrics.update(date, value)
+        if day < 2:
+            assert metrics.snapshot() == {}
+            continue
+        streamed, batch = metrics.snapshot(), _batch_metrics(values.iloc[: day + 1])
+        assert streamed["max_drawdown_date"] == batch["max_drawdown_date"]
+        for name in ("sharpe_ratio", "sortino_ratio", "max_drawdown"):
+            assert streamed[name] == pytest.approx(batch[name], rel=1e-9, abs=1e-12)
+
+
+def test_steadily_rising_series_has_no_downside():
+    metrics = StreamingMetrics()
+    for i, date in enumerate(pd.date_range("2024-01-01", periods=10, freq="B")):
+        metrics.update(date, 100 * 1.01**i)
+    snapshot = metrics.snapshot()
+    assert snapshot["sortino_ratio"] == math.inf
+    assert snapshot["max_drawdown"] == 0 and snapshot["max_drawdown_date"] is None
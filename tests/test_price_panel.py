@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.data.cache import Cache
+from src.tools import api
+from src.tools.price_panel import PricePanel
+
+
+def _bar(day: str, close: float) -> dict:
+    return {"time": f"{day}T05:00:00Z", "open": close, "close": close, "high": close, "low": close, "volume": 100}
+
+
+def test_panel_matches_per_day_price_lookups_without_refetching():
+    cache = Cache()
+    days = [day.strftime("%Y-%m-%d") for day in pd.date_range("2024-01-02", "2024-02-29", freq="B")]
+    # MSFT has no bars for a week, so those days have no price
+    cache.merge_prices("AAPL", [_bar(day, 100.0 + i) for i, day in enumerate(days)], "2023-12-01", "2024-02-29")
+    cache.merge_prices("MSFT", [_bar(day, 300.0 - i) for i, day in enumerate(days) if not "2024-01-15" <= day <= "2024-01-19"], "2023-12-01", "2024-02-29")
+    dates = pd.date_range("2024-01-03", "2024-02-29", freq="B")
+
+    with patch.object(api, "_cache", cache), patch.object(api, "_make_api_request") as request:
+        panel = PricePanel.load(["AAPL", "MSFT"], dates)
+        for i, current_date in enumerate(dates):
+            expected = {}
+            for ticker in panel.tickers:
+                df = api.get_price_data(ticker, (current_date - pd.Timedelta(days=1)).strftime("%Y-%m-%d"), current_date.strftime("%Y-%m-%d"))
+                if df.empty:
+                    expected = None
+                    break
+                expected[ticker] = df.iloc[-1]["close"]
+            assert panel.prices_on(i) == expected, current_date
+    request.assert_not_called()
+
+    gap = dates.get_loc(pd.Timestamp("2024-01-17"))
+    assert panel.prices_on(gap) is None and panel.missing_tickers(gap) == ["MSFT"]
+
+
+def test_synthetic_panel_trades_at_previous_business_day():
+    dates = pd.date_range("2024-01-01", "2024-01-31", freq="B")
+    panel = PricePanel.synthetic(["AAPL", "MSFT"], dates, "2024-01-01", "2024-01-31")
+    # Mondays have no previous business day in the range, so they are skipped
+    assert all((panel.prices_on(i) is None) == (day.weekday() == 0) for i, day in enumerate(dates))
+    assert panel.prices_on(1)["MSFT"] > panel.prices_on(1)["AAPL"]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.models import Price
+from src.data.price_series import PriceSeries
+from src.data.price_store import TickerPriceStore
+from src.tools.api import prices_to_df
+
+
+def _bar(day: str, close: float, volume: int = 100) -> dict:
+    return {"time": f"{day}T05:00:00Z", "open": close - 1, "close": close, "high": close + 1, "low": close - 2, "volume": volume}
+
+
+def test_lazy_view_matches_price_models():
+    bars = [_bar("2024-01-02", 10.0), _bar("2024-01-03", 11.0, volume=250)]
+    series = PriceSeries.from_records(bars)
+
+    assert len(series) == 2 and bool(series)
+    assert list(series) == [Price(**bar) for bar in bars]
+    assert series[-1].volume == 250 and isinstance(series[-1].time, str)
+    assert sorted(series, key=lambda p: p.time)[0].close == 10.0
+    assert not PriceSeries.empty()
+
+
+def test_to_df_shares_memory_with_the_cache():
+    store = TickerPriceStore()
+    store.merge([_bar(f"2024-01-{day:02d}", float(day)) for day in range(2, 12)], "2024-01-01", "2024-01-31")
+
+    window = store.slice("2024-01-04", "2024-01-08")
+    df = window.to_df()
+
+    assert df["close"].tolist() == [4.0, 5.0, 6.0, 7.0, 8.0]
+    assert df.index.name == "Date" and df.index.is_monotonic_increasing
+    # Slices are views of the store and the frame wraps them without copying
+    assert np.shares_memory(df["close"].to_numpy(), store.series.close)
+    assert np.shares_memory(df.index.asi8, store.series.time)
+    # ...and the cached arrays can't be modified through them
+    with pytest.raises(ValueError):
+        window.close[0] = 0.0
+
+
+def test_prices_to_df_keeps_the_list_contract_and_is_writable():
+    bars = [_bar(f"2024-01-{day:02d}", float(day)) for day in range(2, 6)]
+    store = TickerPriceStore()
+    store.merge(bars, "2024-01-01", "2024-01-31")
+
+    df = prices_to_df(store.slice("2024-01-01", "2024-01-31"))
+
+    # Same frame as the list path: a time column and a tz-aware UTC "Date" index
+    pd.testing.assert_frame_equal(df, prices_to_df([Price(**bar) for bar in bars]))
+    assert str(df.index.tz) == "UTC"
+    # Callers may edit it in place without touching the cache
+    df["close"] *= 2
+    df.fillna(0, inplace=True)
+    assert df["close"].tolist() == [4.0, 6.0, 8.0, 10.0]
+    assert store.series.close.tolist() == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_store_merges_columnar_bars_and_round_trips():
+    store = TickerPriceStore(bars=[_bar("2024-01-03", 3.0), _bar("2024-01-02", 2.0)], coverage=[["2024-01-01", "2024-01-03"]])
+    # A refetched day replaces the cached bar
+    store.merge([_bar("2024-01-03", 30.0), _bar("2024-01-04", 4.0)], "2024-01-03", "2024-01-04")
+
+    restored = TickerPriceStore.from_dict(store.to_dict())
+    assert restored.slice("2024-01-01", "2024-01-31").close.tolist() == [2.0, 30.0, 4.0]
+    assert restored.coverage == [["2024-01-01", "2024-01-04"]]
+    # Row-wise payloads from before the columnar layout still load
+    legacy = TickerPriceStore.from_dict({"bars": [_bar("2024-01-02", 2.0)], "coverage": [["2024-01-02", "2024-01-02"]]})
+    assert legacy.slice("2024-01-02", "2024-01-02")[0].close == 2.0
@@ -0,0 +1,111 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.data.cache import Cache
+
+
+def _bulk_response(tickers: list[str], line_items: list[str], report_periods=("2024-09-30", "2024-06-30", "2024-03-31")) -> Mock:
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "search_results": [
+            {"ticker": ticker, "report_period": rp, "period": "annual", "currency": "USD", **{item: float(i) for i, item in enumerate(line_items)}}
+            for ticker in tickers
+            for rp in report_periods
+        ]
+    }
+    return response
+
+
+def test_bulk_fetch_serves_every_agent_projection_from_one_request():
+    from src.tools import api
+
+    bodies = []
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        bodies.append(json_data)
+        return _bulk_response(json_data["tickers"], json_data["line_items"])
+
+    with patch.object(api, "_cache", Cache()), patch.object(api, "_make_api_request", side_effect=fake_request):
+        results = api.search_line_items_bulk(["AAPL", "MSFT"], ["revenue", "net_income", "free_cash_flow"], "2024-12-31", period="annual", limit=3)
+        # Agents asking for a subset of fields or fewer periods are answered from the union fetch
+        lynch = api.search_line_items("MSFT", ["revenue", "free_cash_flow"], "2024-12-31", period="annual", limit=2)
+        graham = api.search_line_items("AAPL", ["net_income"], "2024-12-31", period="annual", limit=3)
+        # A second planning pass over a warm cache sends nothing
+        api.search_line_items_bulk(["AAPL", "MSFT"], ["revenue", "net_income"], "2024-12-31", period="annual", limit=3)
+
+    assert len(bodies) == 1
+    assert bodies[0]["tickers"] == ["AAPL", "MSFT"]
+    # The endpoint's limit is per ticker, so the bulk body asks for exactly what one ticker needs
+    assert bodies[0]["limit"] == 3
+    assert [len(results[ticker]) for ticker in ("AAPL", "MSFT")] == [3, 3]
+    assert all(item.ticker == "MSFT" for item in lynch) and len(lynch) == 2
+    assert lynch[0].free_cash_flow == 2.0 and not hasattr(lynch[0], "net_income")
+    assert [item.net_income for item in graham] == [1.0, 1.0, 1.0]
+
+
+def test_bulk_fetch_sends_tickers_without_data_to_the_negative_cache():
+    from src.tools import api
+
+    cache = Cache()
+    calls = []
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        calls.append(json_data["tickers"])
+        return _bulk_response(["AAPL"], json_data["line_items"])
+
+    with patch.object(api, "_cache", cache), patch.object(api, "_make_api_request", side_effect=fake_request):
+        results = api.search_line_items_bulk(["AAPL", "XYZ"], ["revenue"], "2024-12-31", period="annual", limit=3)
+        # XYZ's empty answer is a TTL-bound negative entry, so neither path asks again while it lives
+        api.search_line_items_bulk(["AAPL", "XYZ"], ["revenue"], "2024-12-31", period="annual", limit=3)
+        assert api.search_line_items("XYZ", ["revenue"], "2024-12-31", period="annual", limit=3) == []
+
+    assert calls == [["AAPL", "XYZ"]]
+    assert results["XYZ"] == []
+    assert cache.get_line_items("XYZ", "annual", "2024-12-31", 3, ["revenue"])[0] is None
+    assert cache.get_negative_cache_stats()["network_calls_saved_by_namespace"]["line_items"] == 2
+
+
+def test_prefetch_skips_api_failures_but_not_bugs():
+    pytest.importorskip("langchain_core")
+    from src.tools import request_planner
+    from src.tools.api import APIError
+
+    with patch.object(request_planner, "search_line_items_bulk", side_effect=APIError("Error fetching data: AAPL - 500 - boom")):
+        request_planner.prefetch_line_items(["AAPL"], "2024-12-31", ["ben_graham"])
+    with patch.object(request_planner, "search_line_items_bulk", side_effect=KeyError("search_results")):
+        with pytest.raises(KeyError):
+            request_planner.prefetch_line_items(["AAPL"], "2024-12-31", ["ben_graham"])
+
+
+def test_market_cap_prefetch_follows_the_cache_today():
+    pytest.importorskip("langchain_core")
+    import datetime
+
+    from src.tools import request_planner
+
+    # Replaying an archive recorded on 2024-03-08: that day is the live run, the real today is not
+    replay_cache = Cache(today=lambda: datetime.date(2024, 3, 8))
+    with patch.object(request_planner, "get_cache", return_value=replay_cache), \
+         patch.object(request_planner, "prefetch_company_facts", return_value={}) as prefetch:
+        request_planner.prefetch_market_caps(["AAPL"], "2024-03-08")
+        request_planner.prefetch_market_caps(["AAPL"], datetime.date.today().isoformat())
+
+    prefetch.assert_called_once_with(["AAPL"], api_key=None)
+
+
+def test_plan_unions_fields_per_period_with_largest_limit():
+    pytest.importorskip("langchain_core")
+    from src.tools.request_planner import plan_line_item_requests
+    from src.utils.analysts import ANALYST_CONFIG
+
+    plans = {plan.period: plan for plan in plan_line_item_requests(["ben_graham", "peter_lynch", "valuation_analyst", "technical_analyst"])}
+
+    assert set(plans) == {"annual", "ttm"}
+    graham, lynch = ANALYST_CONFIG["ben_graham"]["line_item_request"], ANALYST_CONFIG["peter_lynch"]["line_item_request"]
+    assert set(plans["annual"].line_items) == set(graham.line_items) | set(lynch.line_items)
+    assert plans["annual"].limit == max(graham.limit, lynch.limit)
+    # Merging never mutates the agents' own declarations
+    assert len(graham.line_items) < len(plans["annual"].line_items)
+    assert plans["ttm"].line_items == ANALYST_CONFIG["valuation_analyst"]["line_item_request"].line_items
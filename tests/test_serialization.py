@@ -0,0 +1,93 @@
+"""Round trips and size checks for the disk-cache payload codec."""
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.data.event_store import TickerEventStore
+from src.data.fundamentals_store import FundamentalsStore
+from src.data.models import CompanyNews, FinancialMetrics
+from src.data.persistent_cache import SQLiteCacheStore
+from src.data.price_store import TickerPriceStore
+from src.data.serialization import PayloadCodec
+
+CODECS = [("json", "none"), ("json", "zlib"), ("json", "zstd"), ("msgpack", "none"), ("msgpack", "zstd")]
+
+
+def _prices(days: int = 2500) -> TickerPriceStore:
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    dates = np.datetime64("2015-01-02") + np.arange(days)
+    bars = [
+        {"time": f"{day}T05:00:00Z", "open": float(c * 0.99), "close": float(c), "high": float(c * 1.01), "low": float(c * 0.98), "volume": int(v)}
+        for day, c, v in zip(dates.astype(str), close, rng.integers(1_000_000, 90_000_000, days))
+    ]
+    return TickerPriceStore(bars=bars, coverage=[[str(dates[0]), str(dates[-1])]])
+
+
+def _fundamentals(reports: int = 40) -> FundamentalsStore:
+    rng = np.random.default_rng(1)
+    records = []
+    for i in range(reports):
+        record = {name: float(rng.normal()) for name in FinancialMetrics.model_fields}
+        record.update(ticker="AAPL", report_period=str(np.datetime64("2015-03-31") + 91 * i), period="ttm", currency="USD", peg_ratio=None)
+        records.append(FinancialMetrics(**record).model_dump())
+    store = FundamentalsStore()
+    store.merge("2025-01-31", reports + 1, records)
+    return store
+
+
+def _news(articles: int = 1000) -> TickerEventStore:
+    events = [
+        CompanyNews(
+            ticker="AAPL", title=f"Apple headline number {i}", author="Staff", source="Newswire",
+            date=f"{np.datetime64('2022-01-01') + i // 3}T12:00:00Z", url=f"https://news.example.com/aapl/{i}", sentiment=["positive", "negative", "neutral", None][i % 4],
+        ).model_dump()
+        for i in range(articles)
+    ]
+    store = TickerEventStore("date", events)
+    store.merge([], "2022-01-01", "2022-12-31", articles)
+    return store
+
+
+PAYLOADS = {"prices": _prices, "fundamentals": _fundamentals, "news": _news}
+
+
+@pytest.mark.parametrize("format,compression", CODECS)
+def test_round_trips_every_store(format, compression):
+    codec = PayloadCodec(format=format, compression=compression)
+    prices, fundamentals, news = _prices(300), _fundamentals(), _news(50)
+
+    decoded_prices = TickerPriceStore.from_dict(codec.decode(codec.encode(prices.to_dict())))
+    assert decoded_prices.coverage == prices.coverage
+    assert np.array_equal(decoded_prices.days, prices.days)
+    assert decoded_prices.series.to_records() == prices.series.to_records()
+    # Records with nulls, strings and floats come back exactly, key order included
+    assert codec.decode(codec.encode(fundamentals.to_dict())) == fundamentals.to_dict()
+    assert list(codec.decode(codec.encode(fundamentals.to_dict()))["reports"][0]) == list(fundamentals.reports[0])
+    assert codec.decode(codec.encode(news.to_dict())) == news.to_dict()
+
+
+def test_store_reads_legacy_json_text_rows(tmp_path):
+    path = tmp_path / "api_cache.sqlite3"
+    store = SQLiteCacheStore(path)
+    store.set("financial_metrics", "AAPL", [{"report_period": "2024-09-28", "pe": 30.5}])
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE cache_entries SET payload = ? WHERE key = 'AAPL'", (json.dumps([{"report_period": "2024-06-29", "pe": 28.0}]),))
+    assert SQLiteCacheStore(path).get("financial_metrics", "AAPL") == [{"report_period": "2024-06-29", "pe": 28.0}]
+
+
+def test_codecs_shrink_payloads_and_round_trip():
+    for name, build in PAYLOADS.items():
+        payload = build().to_dict()
+        # What the store wrote before: JSON text, with the price columns as lists
+        baseline = json.dumps(payload, default=lambda a: (a.astype(str) if a.dtype.kind == "M" else a).tolist()).encode()
+        for format, compression in CODECS:
+            codec = PayloadCodec(format=format, compression=compression)
+            blob = codec.encode(payload)
+            assert codec.compression == compression
+            assert json.dumps(codec.decode(blob), default=lambda a: (a.astype(str) if a.dtype.kind == "M" else a).tolist()).encode() == baseline
+            if compression != "none" or name != "news":
+                assert len(blob) < len(baseline), (name, format, compression)
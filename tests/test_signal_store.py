@@ -0,0 +1,89 @@
+import pandas as pd
+
+from src.data.signal_store import SignalStore, model_key
+from src.engine.replay import ConsensusRule, SignalReplay
+
+MODEL = model_key("gpt-4.1", "OpenAI")
+
+
+def _signals(signal: str, confidence: float, tickers=("AAPL", "MSFT")) -> dict:
+    return {
+        "warren_buffett_agent": {ticker: {"signal": signal, "confidence": confidence, "reasoning": {"moat": f"{ticker} moat"}} for ticker in tickers},
+        "technical_analyst_agent": {ticker: {"signal": signal, "confidence": confidence, "reasoning": "trend"} for ticker in tickers},
+        "risk_management_agent": {ticker: {"remaining_position_limit": 1.0, "current_price": 1.0} for ticker in tickers},
+    }
+
+
+def test_store_round_trips_days_and_loads_columns(tmp_path):
+    store = SignalStore(tmp_path / "signals.sqlite3")
+    store.put(MODEL, "2024-03-01", _signals("bullish", 80))
+    store.put(MODEL, "2024-03-04", _signals("bearish", 60.5))
+    store.put(model_key("llama3", "Ollama"), "2024-03-01", _signals("neutral", 10))
+
+    # A second handle on the same file sees the first one's writes
+    reopened = SignalStore(tmp_path / "signals.sqlite3")
+    day = reopened.get_day(MODEL, "2024-03-01")
+    assert set(day) == {"technical_analyst_agent", "warren_buffett_agent"}
+    assert day["warren_buffett_agent"]["AAPL"] == {"signal": "bullish", "confidence": 80, "reasoning": {"moat": "AAPL moat"}}
+    assert reopened.get_day(MODEL, "2024-03-04", tickers=["MSFT"], agents=["technical_analyst_agent"]) == {"technical_analyst_agent": {"MSFT": {"signal": "bearish", "confidence": 60.5, "reasoning": "trend"}}}
+
+    frame = reopened.load(MODEL, "2024-03-01", "2024-03-31", tickers=["AAPL"])
+    assert frame.to_dict("list") == {
+        "date": ["2024-03-01", "2024-03-01", "2024-03-04", "2024-03-04"],
+        "agent": ["technical_analyst_agent", "warren_buffett_agent"] * 2,
+        "ticker": ["AAPL"] * 4,
+        "signal": ["bullish", "bullish", "bearish", "bearish"],
+        "confidence": [80.0, 80.0, 60.5, 60.5],
+    }
+    assert reopened.dates(MODEL) == ["2024-03-01", "2024-03-04"]
+    assert reopened.models() == ["Ollama/llama3", MODEL]
+
+
+def test_consensus_rule_closes_before_flipping_sides():
+    rule = ConsensusRule(max_position_pct=0.2, min_score=0.1)
+    bullish = {"a": {"signal": "bullish", "confidence": 100}, "b": {"signal": "bullish", "confidence": 50}}
+    bearish = {"a": {"signal": "bearish", "confidence": 100}}
+
+    # score 0.75 -> 15% of 10k at $10 = 150 shares
+    assert rule(bullish, 10.0, 0, 0, 10_000) == ("buy", 150)
+    assert rule(bullish, 10.0, 200, 0, 10_000) == ("sell", 50)
+    assert rule(bullish, 10.0, 0, 30, 10_000) == ("cover", 30)
+    assert rule(bearish, 10.0, 150, 0, 10_000) == ("sell", 150)
+    assert rule(bearish, 10.0, 0, 50, 10_000) == ("short", 150)
+    assert rule({"a": {"signal": "bullish", "confidence": 5}}, 10.0, 40, 0, 10_000) == ("sell", 40)
+    assert rule(bullish, 10.0, 150, 0, 10_000) == ("hold", 0)
+
+
+def test_replay_decides_from_stored_signals_and_holds_without_them(tmp_path):
+    store = SignalStore(tmp_path / "signals.sqlite3")
+    store.put(MODEL, "2024-03-01", _signals("bullish", 100, tickers=("AAPL",)))
+    replay = SignalReplay(store, MODEL, agents=["warren_buffett_agent"])
+    portfolio = {"cash": 10_000.0, "positions": {t: {"long": 0, "short": 10} for t in ("AAPL", "MSFT")}}
+    prices = {"AAPL": 10.0, "MSFT": 20.0}
+
+    output = replay.decide(["AAPL", "MSFT"], "2024-03-01", portfolio, prices)
+    assert output["decisions"] == {"AAPL": {"action": "cover", "quantity": 10}, "MSFT": {"action": "hold", "quantity": 0}}
+    assert list(output["analyst_signals"]) == ["warren_buffett_agent"]
+
+    assert replay.decide(["AAPL", "MSFT"], "2024-03-04", portfolio, prices)["decisions"]["AAPL"] == {"action": "hold", "quantity": 0}
+    assert (replay.days_replayed, replay.days_missing) == (2, 1)
+
+
+def test_backtester_replays_stored_signals_without_llm_calls(tmp_path, monkeypatch):
+    from unittest.mock import Mock, patch
+
+    from src import backtester as backtester_module
+
+    monkeypatch.setenv("OFFLINE", "1")
+    store = SignalStore(tmp_path / "signals.sqlite3")
+    for day in pd.date_range("2024-03-01", "2024-03-29", freq="B"):
+        store.put(MODEL, day.strftime("%Y-%m-%d"), _signals("bullish", 90))
+    agent = Mock(side_effect=AssertionError("replay must not run the agents"))
+
+    backtester = backtester_module.Backtester(agent=agent, tickers=["AAPL", "MSFT"], start_date="2024-03-01", end_date="2024-03-29", initial_capital=100_000, replay=SignalReplay(store, MODEL))
+    with patch.object(backtester_module, "print_backtest_results"), patch.object(backtester_module, "print_cache_stats"), patch.object(backtester_module, "run_decisions") as run_decisions:
+        backtester.run_backtest()
+
+    agent.assert_not_called()
+    run_decisions.assert_not_called()
+    assert backtester.ledger.long.tolist() != [0, 0] and backtester.replay.days_missing == 0
@@ -0,0 +1,117 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.data.cache import Cache
+from src.tools.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["metrics"]
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(flight.do, ("financial_metrics", "AAPL_ttm_2024-12-31_10"), fetch)
+        started.wait(timeout=5)
+        followers = [pool.submit(flight.do, ("financial_metrics", "AAPL_ttm_2024-12-31_10"), fetch) for _ in range(4)]
+        # Followers are queued behind the leader before it finishes
+        while flight.stats.suppressed < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats.as_dict() == {"executed": 1, "suppressed": 4, "suppressed_by_kind": {"financial_metrics": 4}}
+
+
+def test_errors_propagate_to_waiters_and_do_not_stick():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_fetch():
+        started.set()
+        release.wait(timeout=5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, ("prices", "AAPL"), failing_fetch)
+        started.wait(timeout=5)
+        follower = pool.submit(flight.do, ("prices", "AAPL"), failing_fetch)
+        while flight.stats.suppressed < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
+
+    # The failed flight is gone, so the next caller retries
+    assert flight.do(("prices", "AAPL"), lambda: "ok") == "ok"
+
+
+def test_parallel_agents_fetch_financial_metrics_once():
+    from src.tools import api
+
+    flight = SingleFlight()
+    barrier = threading.Barrier(6)
+    calls = []
+
+    def fake_request(url, headers, method="GET", json_data=None):
+        calls.append(url)
+        time.sleep(0.05)
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {"financial_metrics": []}
+        return response
+
+    def agent():
+        barrier.wait(timeout=5)
+        return api.get_financial_metrics("AAPL", "2024-12-31")
+
+    with patch.object(api, "_cache", Cache()), patch.object(api, "_make_api_request", side_effect=fake_request), patch.object(api, "get_single_flight", return_value=flight):
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = [f.result() for f in [pool.submit(agent) for _ in range(6)]]
+
+    assert results == [[]] * 6
+    assert len(calls) == 1
+    assert flight.stats.suppressed == 5
+
+
+def test_late_leader_rechecks_the_cache_instead_of_fetching():
+    from src.tools import api
+
+    cache = Cache()
+    flight = SingleFlight()
+    from src.data.models import FinancialMetrics
+
+    metrics = [{**dict.fromkeys(FinancialMetrics.model_fields), "ticker": "AAPL", "report_period": "2024-09-28", "period": "ttm", "currency": "USD"}]
+    bars = [{"time": "2024-01-02T00:00:00Z", "open": 1.0, "close": 2.0, "high": 2.0, "low": 1.0, "volume": 10}]
+
+    def arrive_after_previous_leader(key, fn):
+        # This caller's lookup missed, but the previous flight stored its answer before this one started
+        if key[0] == "financial_metrics":
+            cache.merge_fundamentals("AAPL", "ttm", "2024-12-31", 1, metrics)
+        else:
+            cache.merge_prices("AAPL", bars, "2024-01-01", "2024-01-31")
+        return flight.do(key, fn)
+
+    late = Mock(do=arrive_after_previous_leader)
+    with patch.object(api, "_cache", cache), patch.object(api, "_make_api_request", side_effect=AssertionError("network")), patch.object(api, "get_single_flight", return_value=late):
+        assert [m.report_period for m in api.get_financial_metrics("AAPL", "2024-12-31", limit=1)] == ["2024-09-28"]
+        assert api.get_prices("AAPL", "2024-01-01", "2024-01-31")[0].close == 2.0
+
+    assert flight.stats.executed == 2
+    # The re-check isn't counted as a second lookup
+    assert cache.get_stats()["namespaces"]["financial_metrics"]["misses"] == 1
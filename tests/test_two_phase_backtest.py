@@ -0,0 +1,37 @@
+import threading
+from unittest.mock import patch
+
+from src import backtester as backtester_module
+from src.backtester import Backtester
+
+
+def test_two_phase_precomputes_signals_then_replays_decisions_in_order(monkeypatch):
+    monkeypatch.setenv("OFFLINE", "1")
+    tickers = ["AAPL", "MSFT"]
+    analyst_calls, analyst_threads, decision_calls = [], set(), []
+
+    def fake_run_analysts(tickers, start_date, end_date, selected_analysts, model_name, model_provider):
+        analyst_calls.append((end_date, tuple(tickers)))
+        analyst_threads.add(threading.get_ident())
+        return {"technical_analyst_agent": {tickers[0]: {"signal": "bullish", "confidence": 60}}}
+
+    def fake_run_decisions(tickers, start_date, end_date, portfolio, analyst_signals, model_name, model_provider):
+        decision_calls.append((end_date, portfolio["cash"], sorted(analyst_signals["technical_analyst_agent"])))
+        return {"decisions": {"AAPL": {"action": "buy", "quantity": 1}}, "analyst_signals": analyst_signals}
+
+    backtester = Backtester(agent=None, tickers=tickers, start_date="2024-03-01", end_date="2024-03-29", initial_capital=10_000, two_phase=True, signal_workers=4)
+    with patch.object(backtester_module, "run_analysts", side_effect=fake_run_analysts), \
+         patch.object(backtester_module, "run_decisions", side_effect=fake_run_decisions), \
+         patch.object(backtester_module, "prefetch_line_items"), patch.object(backtester_module, "prefetch_market_caps"), \
+         patch.object(backtester_module, "print_backtest_results"), patch.object(backtester_module, "print_cache_stats"):
+        backtester.run_backtest()
+
+    days = [end_date for end_date, _, _ in decision_calls]
+    # Every (day, ticker) pair was analysed once, off the main thread, before any decision ran
+    assert sorted(analyst_calls) == sorted((day, (ticker,)) for day in days for ticker in tickers)
+    assert threading.get_ident() not in analyst_threads
+    # Decisions replay day by day against the portfolio left by the previous day's trades
+    assert days == sorted(days)
+    cash = [cash for _, cash, _ in decision_calls]
+    assert all(later < earlier for earlier, later in zip(cash, cash[1:]))
+    assert all(signalled == tickers for _, _, signalled in decision_calls)